@@ -0,0 +1,128 @@
+/*
+ * Site search over the index generate_pages.py writes to search/.
+ *
+ * search/index.json lists the documents and the term-prefix shards; a
+ * query fetches only the shards its words can match, once each. Index
+ * terms are Russian stems, so a query word matches a term that is its
+ * prefix (the word with its ending) or that it is a prefix of (a word
+ * still being typed). Postings are delta-encoded [doc, weight] pairs.
+ */
+(function () {
+  var form = document.querySelector('.lp-search');
+  if (!form || !window.fetch || !window.TextEncoder) return;
+  var input = form.querySelector('input');
+  var list = form.querySelector('.lp-search__results');
+  var base = form.getAttribute('data-index');
+  var MAX_ENDING = 4, LIMIT = 8;
+  var meta = null, shards = {}, latest = 0, timer = 0;
+
+  function getJSON(url, options) {
+    return fetch(url, options).then(function (r) {
+      if (!r.ok) throw new Error(url + ': ' + r.status);
+      return r.json();
+    });
+  }
+
+  function hex(text) {
+    var bytes = new TextEncoder().encode(text), out = '';
+    for (var i = 0; i < bytes.length; i++) out += (bytes[i] < 16 ? '0' : '') + bytes[i].toString(16);
+    return out;
+  }
+
+  function decode(data) {
+    var terms = [], term = '';
+    for (var i = 0; i < data.t.length; i++) {
+      term = term.slice(0, data.s[i]) + data.t[i];
+      terms.push([term, data.p[i]]);
+    }
+    return terms;
+  }
+
+  function shard(key) {
+    return shards[key] || (shards[key] = getJSON(base + hex(key) + '.json?v=' + meta.shards[key]).then(decode));
+  }
+
+  function words(query) {
+    var found = query.toLowerCase().replace(/ё/g, 'е').match(/[0-9a-zа-я]+(?:-[0-9a-zа-я]+)*/g) || [];
+    return found.filter(function (w) { return w.length > 1; });
+  }
+
+  function match(word, term) {
+    if (word.indexOf(term) === 0 && word.length - term.length <= MAX_ENDING) return 1;
+    return term.indexOf(word) === 0 ? 0.5 : 0;
+  }
+
+  function score(word, terms, hits) {
+    var best = {};
+    terms.forEach(function (entry) {
+      var factor = match(word, entry[0]);
+      if (!factor) return;
+      var postings = entry[1], idf = Math.log(1 + meta.docs.length / (postings.length / 2)), doc = 0;
+      for (var i = 0; i < postings.length; i += 2) {
+        doc += postings[i];
+        best[doc] = Math.max(best[doc] || 0, postings[i + 1] * idf * factor);
+      }
+    });
+    Object.keys(best).forEach(function (doc) {
+      var hit = hits[doc] || (hits[doc] = {words: 0, score: 0});
+      hit.words += 1;
+      hit.score += best[doc];
+    });
+  }
+
+  function search(query) {
+    var ws = words(query);
+    if (!ws.length) return Promise.resolve([]);
+    return (meta ? Promise.resolve(meta) : getJSON(base + 'index.json', {cache: 'no-cache'})).then(function (m) {
+      meta = m;
+      var keys = Object.keys(m.shards);
+      return Promise.all(ws.map(function (w) {
+        var needed = keys.filter(function (k) { return w.indexOf(k) === 0 || k.indexOf(w) === 0; });
+        return Promise.all(needed.map(shard)).then(function (parts) { return [].concat.apply([], parts); });
+      }));
+    }).then(function (termLists) {
+      var hits = {};
+      ws.forEach(function (w, i) { score(w, termLists[i], hits); });
+      return Object.keys(hits).sort(function (a, b) {
+        return hits[b].words - hits[a].words || hits[b].score - hits[a].score || a - b;
+      }).slice(0, LIMIT).map(function (doc) { return meta.docs[doc]; });
+    });
+  }
+
+  function show(results, query) {
+    list.textContent = '';
+    results.forEach(function (doc) {
+      var item = document.createElement('li'), link = document.createElement('a');
+      link.href = doc[0] + '.html';
+      link.textContent = doc[1];
+      item.appendChild(link);
+      list.appendChild(item);
+    });
+    if (!results.length && query.trim()) {
+      var empty = document.createElement('li');
+      empty.className = 'lp-search__empty';
+      empty.textContent = 'Ничего не найдено';
+      list.appendChild(empty);
+    }
+  }
+
+  function run() {
+    var query = input.value, id = ++latest;
+    search(query).then(function (results) {
+      if (id === latest) show(results, query);
+    }, function () {
+      if (id === latest) show([], '');
+    });
+  }
+
+  input.addEventListener('input', function () {
+    clearTimeout(timer);
+    timer = setTimeout(run, 120);
+  });
+  form.addEventListener('submit', function (event) {
+    event.preventDefault();
+    var first = list.querySelector('a');
+    if (first) window.location.href = first.href;
+  });
+  form.hidden = false;
+})();
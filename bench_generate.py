@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for generate_pages.py.
+
+    python3 bench_generate.py templates [--against REV] [--repeat N]
+    python3 bench_generate.py stream [--sizes N,N,...]
+    python3 bench_generate.py matrix [--pages N] [--jobs N] [--min-rate R]
+    python3 bench_generate.py suite [--scales N,N,...] [--output FILE] [--compare FILE]
+    python3 bench_generate.py watch
+
+``templates`` times per-page rendering of the compiled layouts against the
+f-string templates they replaced, loaded straight from git history, and
+reports whether both still produce byte-identical HTML.
+
+``stream`` pads one article to increasingly many sections in a scratch
+copy of content/ and renders its build target the way build() does, in
+memory (render_target) and streamed to disk (stream_target, with the
+lastmod digest and date). It measures each one's peak allocation with
+tracemalloc, with the parsed article already loaded. It exits non-zero if
+streaming memory grows with article length.
+
+``matrix`` synthesizes a landing matrix of about ``--pages`` cells in a
+scratch copy of content/, builds it cold into a scratch site, in memory and
+streamed, and reports pages/second. It exits non-zero if the serial rate
+falls below ``--min-rate``.
+
+``suite`` synthesizes a content directory for each scale (10, 100, 1k and
+10k pages by default). It times the four renderers per call and full
+``main()`` runs, both cold and no-op, and records peak memory and output
+bytes. Results are written as JSON. ``--compare`` checks them against an
+earlier run and exits non-zero when any metric regresses by more than
+``--threshold``.
+
+``watch`` builds a scratch copy of the site, then edits one article the way
+``--watch`` sees it: it appends another article's body, so that article's
+related links should now point to the edited one. It times the rebuild and
+exits non-zero if the neighbour's related links did not change, or if a
+clean ``--force`` build would still write something the rebuild left stale.
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import itertools
+import json
+import math
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import timeit
+import tracemalloc
+import types
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+import generate_pages  # noqa: E402
+
+
+def git(*args):
+    """Run a git command in the repository and return its stdout."""
+    return subprocess.run(
+        ["git", *args], cwd=SCRIPT_DIR, check=True,
+        capture_output=True, text=True,
+    ).stdout
+
+
+def fstring_revision():
+    """Find the last revision whose generate_pages.py used f-string templates.
+
+    ``git log -S`` returns the most recent commit that changed the number of
+    ``html = f\"\"\"`` occurrences -- the switch to layouts -- so its parent
+    still has the old templates.
+    """
+    rev = git("log", "-1", "--format=%H", "-S", 'html = f"""', "--", "generate_pages.py").strip()
+    if not rev:
+        sys.exit("ERROR: no f-string revision of generate_pages.py found in git history")
+    return rev + "^"
+
+
+def load_revision(rev):
+    """Import generate_pages.py as it was at ``rev`` without touching the tree."""
+    source = git("show", f"{rev}:generate_pages.py")
+    module = types.ModuleType("generate_pages_" + rev.replace("^", "_parent"))
+    module.__file__ = os.path.join(SCRIPT_DIR, "generate_pages.py")
+    exec(compile(source, module.__file__, "exec"), module.__dict__)
+    return module
+
+
+def time_per_call(func, repeat):
+    """Best-of-5 wall time for one call of ``func``, in microseconds."""
+    runs = timeit.repeat(func, number=repeat, repeat=5)
+    return min(runs) / repeat * 1e6
+
+
+def bench_templates(args):
+    rev = args.against or fstring_revision()
+    old = load_revision(rev)
+    new = generate_pages
+    print(f"Compiled layouts vs f-string templates at {rev}\n")
+
+    cases = [
+        ("generate_page", [(p,) for p in new.PAGES], [(p,) for p in old.PAGES]),
+        ("generate_blog_article", [(a,) for a in new.BLOG_ARTICLES], [(a,) for a in old.BLOG_ARTICLES]),
+        ("generate_blog_index", [()], [()]),
+    ]
+
+    print(f"{'renderer':<24}{'f-string':>12}{'layout':>12}{'speedup':>10}")
+    identical = True
+    for name, new_args, old_args in cases:
+        new_fn, old_fn = getattr(new, name), getattr(old, name)
+        for n_args, o_args in zip(new_args, old_args):
+            if new_fn(*n_args) != old_fn(*o_args).encode("utf-8"):
+                identical = False
+
+        def run_new():
+            for a in new_args:
+                new_fn(*a)
+
+        def run_old():
+            # The f-string path paid for encoding the whole document on write.
+            for a in old_args:
+                old_fn(*a).encode("utf-8")
+
+        t_new = time_per_call(run_new, args.repeat) / len(new_args)
+        t_old = time_per_call(run_old, args.repeat) / len(old_args)
+        print(f"{name:<24}{t_old:>10.1f}us{t_new:>10.1f}us{t_old / t_new:>9.2f}x")
+
+    if identical:
+        print("\nOutputs are byte-identical; times are per page.")
+    else:
+        print(f"\nOutputs differ: the markup has changed since {rev}. Times are per page.")
+
+
+STREAM_GROWTH_LIMIT = 64 * 1024  # bytes the streamed peak may grow by
+
+
+def peak_allocation(func):
+    """Peak bytes allocated by ``func()`` above what was live before it."""
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        func()
+        return tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+
+
+def padded_article(text, sections):
+    """Article source ``text`` with its body repeated to ``sections`` sections."""
+    front, body = text.split("\n---\n", 1)
+    blocks = body.strip().split("\n\n## ")
+    blocks = [blocks[0]] + ["## " + b for b in blocks[1:]]
+    return f"{front}\n---\n" + "\n\n".join((blocks * (sections // len(blocks) + 1))[:sections]) + "\n"
+
+
+def bench_stream(args):
+    """Peak memory of the article targets build() renders, in memory and streamed."""
+    g = generate_pages
+    sizes = [int(n) for n in args.sizes.split(",")]
+    slug = g.ALL_BLOG_ARTICLES[0][0]
+    filename = f"{slug}.html"
+    with open(g.STORE.path("blog", slug), encoding="utf-8") as f:
+        source = f.read()
+
+    print(f"{'sections':>10}{'page size':>12}{'in memory':>12}{'streamed':>12}")
+    peaks = []
+    with tempfile.TemporaryDirectory() as tmp:
+        content = os.path.join(tmp, "content")
+        shutil.copytree(g.CONTENT_DIR, content)
+        g.use_lastmod(os.path.join(tmp, g.LASTMOD_FILE))
+        dest = os.path.join(tmp, filename)
+        for n in sizes:
+            with open(os.path.join(content, "blog", f"{slug}.md"), "w", encoding="utf-8") as f:
+                f.write(padded_article(source, n))
+            g.use_content(content)
+            target = next(t for t in g.collect_targets() if t["filename"] == filename)
+            g.warm_fragments()
+            staged = dict(target, dest=dest, tmp=dest + ".tmp")
+            # The parsed article grows with the page whatever the renderer
+            # does, so it is loaded up front and handed out while measuring.
+            article = g.load_article(slug)
+            load_article, g.load_article = g.load_article, lambda _: article
+            try:
+                g.stream_target(staged)  # warm the template and minify caches
+                whole = peak_allocation(lambda: g.render_target(target))
+                peak = peak_allocation(lambda: g.stream_target(staged))
+            finally:
+                g.load_article = load_article
+            size = os.path.getsize(staged["tmp"])
+            with open(staged["tmp"], "rb") as f:
+                if f.read() != g.render_target(target)[0]:
+                    sys.exit(f"ERROR: streamed output differs at {n} sections")
+            os.remove(staged["tmp"])
+            peaks.append(peak)
+            print(f"{n:>10}{size / 1024:>10.0f}KB{whole / 1024:>10.0f}KB{peak / 1024:>10.0f}KB")
+    g.use_content(g.CONTENT_DIR)
+    g.use_lastmod(os.path.join(SCRIPT_DIR, g.LASTMOD_FILE))
+
+    growth = max(peaks) - min(peaks)
+    print(f"\nStreamed peak varies by {growth / 1024:.1f} KB across sizes.")
+    if growth > STREAM_GROWTH_LIMIT:
+        sys.exit(f"FAIL: streamed peak grew by more than {STREAM_GROWTH_LIMIT // 1024} KB")
+
+
+MATRIX_MIN_RATE = 1000  # pages/second, serial cold build of the matrix
+
+
+def synth_matrix(content_dir, pages, products=None):
+    """Rewrite matrix.json to have exactly ``pages`` cells, cycling the real districts.
+
+    ``products`` replaces the matrix's product list when given.
+    """
+    with open(os.path.join(content_dir, "matrix.json"), encoding="utf-8") as f:
+        matrix = json.load(f)
+    if products is not None:
+        matrix["products"] = products
+    districts, intents = matrix["districts"], matrix["intents"]
+    per_district = len(matrix["products"]) * len(intents)
+    count = -(-pages // per_district)
+    matrix["districts"] = [
+        dict(districts[n % len(districts)], slug=f"{districts[n % len(districts)]['slug']}-{n}")
+        for n in range(count)
+    ]
+    # Drop the overshoot from the end of the last product's row.
+    last = matrix["products"][-1]["stem"]
+    excess = count * per_district - pages
+    tail = [
+        f"{last}-{d['slug']}-{i['slug']}" for d in matrix["districts"] for i in intents
+    ][len(matrix["districts"]) * len(intents) - excess:]
+    matrix["overrides"] = {slug: {"skip": True} for slug in tail}
+    with open(os.path.join(content_dir, "matrix.json"), "w", encoding="utf-8") as f:
+        json.dump(matrix, f, ensure_ascii=False)
+
+
+def bench_matrix(args):
+    g = generate_pages
+    jobs = args.jobs or os.cpu_count() or 1
+    max_urls = g.SITEMAP_MAX_URLS
+    if args.sitemap_max_urls:
+        g.SITEMAP_MAX_URLS = args.sitemap_max_urls
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            content = os.path.join(tmp, "content")
+            shutil.copytree(g.CONTENT_DIR, content)
+            synth_matrix(content, args.pages)
+            g.use_content(content)
+            g.use_lastmod(os.path.join(tmp, g.LASTMOD_FILE))
+
+            started = timeit.default_timer()
+            targets = g.collect_targets()
+            collect = timeit.default_timer() - started
+            cells = len(g.matrix_cells())
+            print(f"{cells} matrix cells, {len(targets)} outputs, "
+                  f"{len(g.sitemap_shards())} sitemap shard(s); "
+                  f"targets fingerprinted in {collect * 1000:.0f} ms\n")
+
+            print(f"{'mode':<10}{'jobs':>6}{'seconds':>10}{'pages/s':>10}")
+            rates = {}
+            for n in sorted({1, jobs}):
+                for stream in (False, True):
+                    site = os.path.join(tmp, "site")
+                    shutil.rmtree(site, ignore_errors=True)
+                    os.makedirs(site)
+                    g.FRAGMENTS.clear()
+                    started = timeit.default_timer()
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        g.build(targets, {}, site, n, stream)
+                    elapsed = timeit.default_timer() - started
+                    mode = "stream" if stream else "bytes"
+                    rates[mode, n] = len(targets) / elapsed
+                    print(f"{mode:<10}{n:>6}{elapsed:>10.2f}{rates[mode, n]:>10.0f}")
+    finally:
+        g.SITEMAP_MAX_URLS = max_urls
+        g.use_content(g.CONTENT_DIR)
+        g.use_lastmod(os.path.join(SCRIPT_DIR, g.LASTMOD_FILE))
+
+    rate = rates["bytes", 1]
+    if rate < args.min_rate:
+        sys.exit(f"\nFAIL: serial throughput {rate:.0f} pages/s is below {args.min_rate:.0f}")
+    print(f"\nSerial throughput {rate:.0f} pages/s meets the {args.min_rate:.0f} pages/s target.")
+
+
+SUITE_SCALES = "10,100,1000,10000"
+SUITE_THRESHOLD = 0.25  # relative growth of a metric reported as a regression
+SUITE_SAMPLE = 100  # pages timed per renderer
+
+
+def synth_content(dest, pages):
+    """Write a content directory with ``pages`` pages cloned from content/.
+
+    The hand-maintained tables grow as sqrt(pages): about sqrt(N)/2 landing
+    pages and sqrt(N) blog articles. Matrix cells make up the rest. This
+    mirrors how the site actually grows, and it stops the nav and footer
+    lists on every page from turning a 10k-page build into gigabytes.
+    """
+    source = generate_pages.CONTENT_DIR
+    shutil.copytree(source, dest, ignore=shutil.ignore_patterns("*.md"))
+    with open(os.path.join(source, "index.json"), encoding="utf-8") as f:
+        index = json.load(f)
+    with open(os.path.join(source, "matrix.json"), encoding="utf-8") as f:
+        products = {p["page"]: p for p in json.load(f)["products"]}
+
+    def clone(kind, table, count):
+        rows = []
+        for n in range(count):
+            slug, label = table[n % len(table)]
+            shutil.copyfile(
+                os.path.join(source, kind, f"{slug}.md"),
+                os.path.join(dest, kind, f"{slug}-{n}.md"),
+            )
+            rows.append([f"{slug}-{n}", f"{label} {n}"])
+        return rows
+
+    root = math.isqrt(pages)
+    landing = clone("pages", index["landing_pages"], max(1, root // 2))
+    blog = clone("blog", index["blog_articles"], max(1, min(root, pages - len(landing))))
+    # No pins: related links are computed, so the TF-IDF index is measured too.
+    index = {"landing_pages": landing, "blog_articles": blog, "blog_topics": index.get("blog_topics", [])}
+    with open(os.path.join(dest, "index.json"), "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False)
+
+    synth_matrix(dest, pages - len(landing) - len(blog), [
+        dict(products[slug.rsplit("-", 1)[0]], page=slug, stem=f"{slug}-m")
+        for slug, _ in landing
+    ])
+
+
+def best_time(func, runs=5):
+    """Best-of-``runs`` wall time of one ``func()`` call, in seconds."""
+    return min(timeit.repeat(func, number=1, repeat=runs))
+
+
+def run_main(argv):
+    with contextlib.redirect_stdout(io.StringIO()):
+        generate_pages.main(argv)
+
+
+def bench_scale(pages, tmp):
+    """Synthesize a ``pages``-page site under ``tmp`` and measure it."""
+    g = generate_pages
+    content = os.path.join(tmp, "content")
+    synth_content(content, pages)
+    g.use_content(content)
+    g.warm_fragments()
+
+    landing = list(itertools.islice(
+        itertools.chain(g.iter_pages(), g.iter_matrix_pages()), SUITE_SAMPLE,
+    ))
+    articles = list(itertools.islice(g.iter_articles(), SUITE_SAMPLE))
+    result = {
+        "landing_pages": len(g.ALL_LANDING_PAGES),
+        "matrix_pages": len(g.matrix_cells()),
+        "blog_articles": len(g.ALL_BLOG_ARTICLES),
+        "generate_page_us": best_time(lambda: [g.generate_page(p) for p in landing]) / len(landing) * 1e6,
+        "generate_blog_article_us": best_time(
+            lambda: [g.generate_blog_article(a) for a in articles]) / len(articles) * 1e6,
+        "generate_blog_index_us": best_time(g.generate_blog_index) * 1e6,
+        "generate_sitemap_us": best_time(
+            lambda: [g.generate_sitemap_shard(n) for n in range(1, len(g.sitemap_shards()) + 1)]) * 1e6,
+    }
+
+    site = os.path.join(tmp, "site")
+    os.makedirs(site)
+    argv = ["--content", content, "--out", site]
+    result["main_cold_s"] = best_time(lambda: run_main(argv), runs=1)
+    result["main_noop_s"] = best_time(lambda: run_main(argv))
+    files = [e for e in os.scandir(site) if e.name != g.MANIFEST_FILE]
+    result["output_files"] = len(files)
+    result["output_bytes"] = sum(e.stat().st_size for e in files)
+    result["pages_per_s"] = len(files) / result["main_cold_s"]
+
+    # Peak memory of a cold build, measured on its own: tracemalloc slows
+    # everything it traces.
+    result["peak_memory_bytes"] = peak_allocation(lambda: run_main(argv + ["--force"]))
+    return result
+
+
+def compare_results(old, new, threshold):
+    """Print per-metric changes against ``old``; return the regressed ones."""
+    regressions = []
+    print(f"\nAgainst {old['revision']} ({old['created']}):")
+    for scale, metrics in new["scales"].items():
+        before = old["scales"].get(scale)
+        if not before:
+            continue
+        for name, value in metrics.items():
+            if name.endswith(("_pages", "_articles", "_files")) or not before.get(name):
+                continue
+            change = value / before[name] - 1
+            # Throughput regresses downwards; every other metric upwards.
+            worse = -change if name == "pages_per_s" else change
+            flag = "  REGRESSION" if worse > threshold else ""
+            print(f"  {scale:>6} {name:<26}{before[name]:>14.6g} -> {value:>14.6g} ({change:+.0%}){flag}")
+            if flag:
+                regressions.append((scale, name))
+    return regressions
+
+
+def bench_suite(args):
+    g = generate_pages
+    rev = git("rev-parse", "--short", "HEAD").strip()
+    if git("status", "--porcelain", "--", "generate_pages.py").strip():
+        rev += "-dirty"
+    results = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "revision": rev,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "scales": {},
+    }
+    header = ("pages", "page us", "article us", "index us", "sitemap us",
+              "cold s", "no-op s", "pages/s", "peak MB", "out MB")
+    print("".join(f"{h:>11}" for h in header))
+    for pages in (int(n) for n in args.scales.split(",")):
+        with tempfile.TemporaryDirectory() as tmp:
+            r = bench_scale(pages, tmp)
+        results["scales"][str(pages)] = r
+        print("".join(f"{v:>11}" for v in (
+            pages,
+            f"{r['generate_page_us']:.1f}", f"{r['generate_blog_article_us']:.1f}",
+            f"{r['generate_blog_index_us']:.0f}", f"{r['generate_sitemap_us']:.0f}",
+            f"{r['main_cold_s']:.2f}", f"{r['main_noop_s']:.3f}", f"{r['pages_per_s']:.0f}",
+            f"{r['peak_memory_bytes'] / 2**20:.1f}", f"{r['output_bytes'] / 2**20:.1f}",
+        )))
+    g.use_content(g.CONTENT_DIR)
+
+    output = args.output or os.path.join(
+        SCRIPT_DIR, "bench-results", f"{results['created'][:10]}-{rev}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare_results(json.load(f), results, args.threshold)
+        if regressions:
+            sys.exit(f"\nFAIL: {len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+
+
+def bench_watch(args):
+    g = generate_pages
+    with tempfile.TemporaryDirectory() as tmp:
+        content = os.path.join(tmp, "content")
+        site = os.path.join(tmp, "site")
+        shutil.copytree(g.CONTENT_DIR, content)
+        os.makedirs(site)
+        g.use_content(content)
+        g.use_lastmod(os.path.join(site, g.LASTMOD_FILE))
+        with contextlib.redirect_stdout(io.StringIO()):
+            targets = g.collect_targets()
+            g.build(targets, {}, site)
+        outputs = {t["filename"]: t["fingerprint"] for t in targets}
+
+        # An article no other one links to yet, edited to repeat a neighbour.
+        slugs = [slug for slug, _ in g.ALL_BLOG_ARTICLES]
+        linked = {s for slug in slugs for s, _ in g.related_links("blog_blog", slug)}
+        edited = next((slug for slug in slugs if slug not in linked), slugs[0])
+        neighbour = next(slug for slug in slugs
+                         if edited not in dict(g.related_links("blog_blog", slug)) and slug != edited)
+        before = g.related_links("blog_blog", neighbour)
+        with open(g.STORE.path("blog", neighbour), encoding="utf-8") as f:
+            body = f.read().split("\n---\n", 1)[1]
+        with open(g.STORE.path("blog", edited), "a", encoding="utf-8") as f:
+            f.write("\n" + body * 3)
+
+        started = timeit.default_timer()
+        with contextlib.redirect_stdout(io.StringIO()):
+            _, outputs, writer = g.rebuild_changed({("blog", edited)}, outputs, site)
+        elapsed = timeit.default_timer() - started
+        after = g.related_links("blog_blog", neighbour)
+        print(f"Edited {edited}: rebuilt in {elapsed * 1000:.0f} ms, {writer.summary()}")
+        print(f"{neighbour} related: {[s for s, _ in before]} -> {[s for s, _ in after]}")
+
+        # A clean build must find nothing left to write.
+        g.use_content(content)
+        with contextlib.redirect_stdout(io.StringIO()):
+            clean = g.build(g.collect_targets(), outputs, site, force=True)
+    g.use_content(g.CONTENT_DIR)
+    g.use_lastmod(os.path.join(SCRIPT_DIR, g.LASTMOD_FILE))
+
+    if edited not in dict(after) or f"{neighbour}.html" not in writer.written:
+        sys.exit(f"FAIL: {neighbour} does not link to the edited {edited} after the rebuild")
+    if clean.written:
+        sys.exit(f"FAIL: the rebuild left stale outputs: {', '.join(clean.written)}")
+    print("Related links and every output are up to date after the rebuild.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the page generator.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("templates", help="compiled layouts vs the old f-string templates")
+    p.add_argument("--against", help="git revision with the f-string templates (auto-detected)")
+    p.add_argument("--repeat", type=int, default=200, help="renders per timing run")
+    p.set_defaults(func=bench_templates)
+
+    p = sub.add_parser("stream", help="peak memory of streamed vs in-memory rendering")
+    p.add_argument(
+        "--sizes", default="10,100,1000,10000",
+        help="comma-separated article lengths, in sections",
+    )
+    p.set_defaults(func=bench_stream)
+
+    p = sub.add_parser("matrix", help="cold-build throughput of a synthetic landing matrix")
+    p.add_argument("--pages", type=int, default=10000, help="matrix cells to synthesize")
+    p.add_argument("-j", "--jobs", type=int, default=0, help="worker processes (0 = one per core)")
+    p.add_argument(
+        "--min-rate", type=float, default=MATRIX_MIN_RATE,
+        help="serial pages/second to require (default: %(default)s)",
+    )
+    p.add_argument(
+        "--sitemap-max-urls", type=int,
+        help="lower the per-file sitemap limit to exercise sharding",
+    )
+    p.set_defaults(func=bench_matrix)
+
+    p = sub.add_parser("suite", help="renderer and full-build metrics at several site sizes")
+    p.add_argument("--scales", default=SUITE_SCALES, help="comma-separated page counts")
+    p.add_argument("--output", help="results file (default: bench-results/<date>-<rev>.json)")
+    p.add_argument("--compare", help="earlier results file to check for regressions")
+    p.add_argument(
+        "--threshold", type=float, default=SUITE_THRESHOLD,
+        help="relative change counted as a regression (default: %(default)s)",
+    )
+    p.set_defaults(func=bench_suite)
+
+    p = sub.add_parser("watch", help="--watch rebuild after an article edit")
+    p.set_defaults(func=bench_watch)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Content-hashed asset names, reference rewriting and cache headers.
+
+    python3 fingerprint_assets.py [--site DIR] [--dry-run]
+
+Renames every file under ``assets/`` to ``NAME.HASH.EXT``, where HASH is
+the first 10 hex digits of the SHA-256 of its bytes (the same scheme the
+generator uses for its stylesheet), so a URL never changes meaning and
+browsers and CDNs may cache assets forever. ``url()`` references inside
+stylesheets are rewritten first, so a stylesheet's hash covers the fonts
+and images it points to. Every ``assets/...`` reference in the site's pages
+(``*.html``, ``sitemap*.xml``) is then pointed at the hashed name, which
+covers home.html, 404.html and absolute og:image and JSON-LD URLs alike.
+
+``asset-manifest.json`` maps each logical name (``assets/fonts.css``) to
+its hashed name; generate_pages.py resolves its template references
+through it. To update an asset, drop the new file in under its plain name
+and run the script again: the plain file wins over the old hashed copy,
+which is removed, and the references follow. Hashed files not in the
+manifest (the generator's ``site.HASH.css``, the resized copies
+responsive_images.py writes to ``assets/variants/``) are left alone.
+
+Finally ``_headers`` (Netlify / Cloudflare Pages format) is written: hashed
+assets get ``Cache-Control: public, max-age=31536000, immutable`` and
+pages a short TTL. Paths are relative to the site root. generate_pages.py
+refreshes it after every build, so new pages are covered.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import posixpath
+import re
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_FILE = "asset-manifest.json"
+HEADERS_FILE = "_headers"
+ASSETS_DIR = "assets"
+
+HASH_LEN = 10
+HASHED_RE = re.compile(r"^(?P<stem>.+)\.(?P<hash>[0-9a-f]{%d})(?P<ext>\.[^.]+)$" % HASH_LEN)
+ASSET_REF_RE = re.compile(r"(?<![\w-])assets/[\w./-]*[\w-]")
+CSS_URL_RE = re.compile(r"""(url\(\s*["']?)([^"')]+)""", re.I)
+
+# Pages whose asset references are rewritten; each gets the page TTL.
+PAGE_PATTERNS = (".html",)
+REWRITE_SUFFIXES = (".html", ".xml")
+
+# Precompressed siblings (precompress.py) and temporary files are not assets.
+SKIP_SUFFIXES = (".br", ".gz", ".zst", ".tmp")
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+PAGE_TTL = "public, max-age=300"
+
+
+def digest(data):
+    return hashlib.sha256(data).hexdigest()[:HASH_LEN]
+
+
+def hashed_name(logical, data):
+    root, ext = posixpath.splitext(logical)
+    return f"{root}.{digest(data)}{ext}"
+
+
+def is_fingerprinted(path, data):
+    """True if the name of ``path`` carries the hash of ``data``."""
+    match = HASHED_RE.match(posixpath.basename(path))
+    return bool(match) and match["hash"] == digest(data)
+
+
+def read(site_dir, rel):
+    with open(os.path.join(site_dir, rel), "rb") as f:
+        return f.read()
+
+
+def write_if_changed(site_dir, rel, data):
+    """Atomically write ``data`` to ``rel`` unless it already holds it."""
+    path = os.path.join(site_dir, rel)
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return True
+
+
+def find_assets(site_dir):
+    """Site-relative ``/``-separated paths of every file under ``assets/``."""
+    found = []
+    for root, dirs, files in os.walk(os.path.join(site_dir, ASSETS_DIR)):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        rel_root = os.path.relpath(root, site_dir).replace(os.sep, "/")
+        for name in sorted(files):
+            if not name.startswith(".") and not name.endswith(SKIP_SUFFIXES):
+                found.append(f"{rel_root}/{name}")
+    return found
+
+
+def find_pages(site_dir, suffixes):
+    return sorted(
+        entry.name for entry in os.scandir(site_dir)
+        if entry.is_file() and entry.name.endswith(suffixes)
+    )
+
+
+def resolve(manifest, path):
+    """Current hashed name for a logical or outdated hashed path, else None."""
+    if path in manifest:
+        return manifest[path]
+    match = HASHED_RE.match(posixpath.basename(path))
+    if match:
+        logical = posixpath.join(posixpath.dirname(path), match["stem"] + match["ext"])
+        return manifest.get(logical)
+    return None
+
+
+def rewrite_css(data, css_path, manifest):
+    """Point the local ``url()``\\ s of a stylesheet at hashed names."""
+    folder = posixpath.dirname(css_path)
+
+    def replace(match):
+        ref = match.group(2).strip()
+        if ref.startswith(("data:", "#", "/")) or "//" in ref:
+            return match.group(0)
+        path, suffix = re.match(r"([^?#]*)(.*)", ref).groups()
+        target = resolve(manifest, posixpath.normpath(posixpath.join(folder, path)))
+        if target is None:
+            return match.group(0)
+        return match.group(1) + posixpath.relpath(target, folder) + suffix
+
+    return CSS_URL_RE.sub(replace, data.decode("utf-8")).encode("utf-8")
+
+
+def rewrite_refs(text, manifest):
+    """Point every ``assets/...`` reference in a page at its hashed name."""
+    return ASSET_REF_RE.sub(lambda m: resolve(manifest, m.group()) or m.group(), text)
+
+
+def load_manifest(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def collect_sources(site_dir, previous):
+    """Map logical name -> current file for every asset this script owns.
+
+    Returns ``(sources, stale)``; ``stale`` holds old hashed copies that a
+    plain file of the same logical name replaces.
+    """
+    owned = {hashed: logical for logical, hashed in previous.items()}
+    sources, stale = {}, []
+    for rel in find_assets(site_dir):
+        logical = owned.get(rel)
+        if logical is None:
+            if is_fingerprinted(rel, read(site_dir, rel)):
+                continue  # hashed by someone else, e.g. the generator's stylesheet
+            logical = rel
+        current = sources.get(logical)
+        if current is None:
+            sources[logical] = rel
+        elif rel == logical:
+            stale.append(current)
+            sources[logical] = rel
+        else:
+            stale.append(rel)
+    return sources, stale
+
+
+def fingerprint_assets(site_dir, dry_run=False):
+    """Hash, rename and rewrite; returns ``(manifest, stats)``."""
+    manifest_path = os.path.join(site_dir, MANIFEST_FILE)
+    previous = load_manifest(manifest_path)
+    sources, stale = collect_sources(site_dir, previous)
+    stats = {"assets": len(sources), "renamed": 0, "rewritten": 0, "removed": 0, "pages": 0}
+
+    # Stylesheets last: their bytes, and so their hashes, depend on the
+    # hashed names of what they reference.
+    manifest = {}
+    for logical in sorted(sources, key=lambda p: (p.endswith(".css"), p)):
+        rel = sources[logical]
+        data = original = read(site_dir, rel)
+        if logical.endswith(".css"):
+            data = rewrite_css(data, logical, manifest)
+        target = hashed_name(logical, data)
+        manifest[logical] = target
+        if target == rel:
+            continue
+        stats["renamed"] += 1
+        stats["rewritten"] += data != original
+        if dry_run:
+            continue
+        if data == original:
+            os.replace(os.path.join(site_dir, rel), os.path.join(site_dir, target))
+        else:
+            write_if_changed(site_dir, target, data)
+            os.remove(os.path.join(site_dir, rel))
+
+    # Hashed copies superseded by a new plain file, or left by an earlier run.
+    leftovers = set(stale) | {old for logical, old in previous.items() if manifest.get(logical) != old}
+    for rel in sorted(leftovers - set(manifest.values())):
+        path = os.path.join(site_dir, rel)
+        if os.path.exists(path):
+            stats["removed"] += 1
+            if not dry_run:
+                os.remove(path)
+
+    for name in find_pages(site_dir, REWRITE_SUFFIXES):
+        text = read(site_dir, name).decode("utf-8")
+        new = rewrite_refs(text, manifest)
+        if new != text:
+            stats["pages"] += 1
+            if not dry_run:
+                write_if_changed(site_dir, name, new.encode("utf-8"))
+
+    if not dry_run:
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+            f.write("\n")
+    return manifest, stats
+
+
+def page_paths(name):
+    """URL paths a page is served under: with and without ``.html``."""
+    stem = name[: -len(".html")]
+    if stem == "index":
+        return ["/", "/index.html"]
+    return [f"/{stem}", f"/{name}"]
+
+
+def write_headers(site_dir):
+    """Write ``_headers`` for the hashed assets and pages now in ``site_dir``.
+
+    Every path is listed explicitly: when several rules match a request,
+    Netlify and Cloudflare Pages merge their values rather than pick one.
+    Returns True if the file changed.
+    """
+    lines = ["# Written by fingerprint_assets.py; edits are overwritten.", ""]
+    for rel in find_assets(site_dir):
+        if is_fingerprinted(rel, read(site_dir, rel)):
+            lines += [f"/{rel}", f"  Cache-Control: {IMMUTABLE}"]
+    for name in find_pages(site_dir, PAGE_PATTERNS):
+        for path in page_paths(name):
+            lines += [path, f"  Cache-Control: {PAGE_TTL}"]
+    return write_if_changed(site_dir, HEADERS_FILE, ("\n".join(lines) + "\n").encode("utf-8"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rename assets to content-hashed names.")
+    parser.add_argument("--site", default=SCRIPT_DIR, help="site directory (default: %(default)s)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="report what would change without touching any file")
+    args = parser.parse_args(argv)
+
+    site_dir = os.path.abspath(args.site)
+    manifest, stats = fingerprint_assets(site_dir, args.dry_run)
+    print(
+        f"Fingerprinted {stats['assets']} assets: {stats['renamed']} renamed "
+        f"({stats['rewritten']} with rewritten references), {stats['removed']} old copies removed, "
+        f"{stats['pages']} pages updated."
+    )
+    if not args.dry_run:
+        changed = write_headers(site_dir)
+        print(f"{HEADERS_FILE}: {'written' if changed else 'unchanged'}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,7 +2,8 @@
 """
 Landing page generator for Curtains World product categories.
 
-Reads configuration for each product landing page and generates clean,
+Reads landing pages and blog articles from content/ (Markdown files with
+JSON front-matter, see "Content store" below) and generates clean,
 semantic HTML files using a shared template. Each page includes:
 - Unique meta tags (title, description, keywords, canonical)
 - Header/navigation matching the main site
@@ -13,9 +14,29 @@ semantic HTML files using a shared template. Each page includes:
 - WhatsApp floating button
 """
 
-import os
+import argparse
+import cProfile
+import functools
+import hashlib
+import inspect
+import itertools
 import json
+import math
+import os
+import pickle
+import re
+import shutil
+import sys
+import tempfile
+import textwrap
+import threading
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
 from html import escape
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import ru_text
 
 # ---------------------------------------------------------------------------
 # Base URL & shared constants
@@ -31,2645 +52,1269 @@ WA_LINK = (
 )
 EMAIL = "hello@curtainsfactory.ae"  # TODO: update when own domain is ready
 
-# ---------------------------------------------------------------------------
-# Page definitions
-# ---------------------------------------------------------------------------
-PAGES = [
-    {
-        "filename": "blackout-shtory-dubai.html",
-        "slug": "blackout-shtory-dubai",
-        "title": "Блэкаут шторы на заказ в Дубае | Curtains World",
-        "h1": "Блэкаут шторы на заказ в Дубае",
-        "description": (
-            "Блэкаут шторы в Дубае — полная блокировка света. "
-            "Натуральные ткани, пошив за 4-5 дней. "
-            "Бесплатный замер и установка. Звоните: +971 58 940 8100"
-        ),
-        "keywords": (
-            "блэкаут шторы дубай, затемняющие шторы дубай, "
-            "blackout curtains dubai, шторы блэкаут ОАЭ"
-        ),
-        "breadcrumb_name": "Блэкаут шторы",
-        "content_paragraphs": [
-            (
-                "Блэкаут шторы — идеальное решение для спален, детских комнат "
-                "и домашних кинотеатров в Дубае. Благодаря специальной "
-                "многослойной структуре ткани они блокируют до 99% солнечного "
-                "света, обеспечивая полную темноту даже в самый яркий день."
-            ),
-            (
-                "Мы используем ткани премиум-класса с термоизолирующим слоем, "
-                "который не только защищает от света, но и снижает нагрев "
-                "помещения. Это особенно важно в условиях жаркого климата "
-                "Дубая — блэкаут шторы помогают экономить на кондиционировании."
-            ),
-            (
-                "В нашем каталоге широкий выбор цветов и фактур: от матовых "
-                "однотонных до текстурных с рисунком. Все шторы шьются "
-                "индивидуально по вашим размерам. Замер, доставка и установка "
-                "входят в стоимость. Срок изготовления — 4-5 рабочих дней."
-            ),
-        ],
-        "faq": [
-            {
-                "q": "Сколько стоят блэкаут шторы на заказ?",
-                "a": (
-                    "Стоимость рассчитывается за квадратные метры и зависит от "
-                    "выбранной ткани. В цену включены замер, карниз, доставка и "
-                    "установка. Используйте калькулятор на нашем сайте для "
-                    "мгновенного расчёта."
-                ),
-            },
-            {
-                "q": "На сколько процентов блэкаут шторы блокируют свет?",
-                "a": (
-                    "Наши блэкаут шторы блокируют от 95% до 99% солнечного света "
-                    "в зависимости от выбранной ткани. Для максимального "
-                    "затемнения рекомендуем трёхслойные ткани."
-                ),
-            },
-            {
-                "q": "Какие ткани доступны для блэкаут штор?",
-                "a": (
-                    "Мы предлагаем блэкаут ткани различных типов: классические "
-                    "трёхслойные, с термоизоляцией, с текстурой льна, "
-                    "а также варианты для детских комнат с яркими расцветками."
-                ),
-            },
-            {
-                "q": "Сколько времени занимает установка?",
-                "a": (
-                    "Пошив занимает 4-5 рабочих дней после замера. "
-                    "Установка обычно выполняется в день доставки и занимает "
-                    "1-2 часа в зависимости от количества окон."
-                ),
-            },
-        ],
-    },
-    {
-        "filename": "tyul-na-zakaz-dubai.html",
-        "slug": "tyul-na-zakaz-dubai",
-        "title": "Тюль на заказ в Дубае | Curtains World",
-        "h1": "Тюль на заказ в Дубае",
-        "description": (
-            "Тюль на заказ в Дубае из натуральных тканей — лён и хлопок. "
-            "Бесплатный замер, установка. Пошив за 4-5 дней. "
-            "Звоните: +971 58 940 8100"
-        ),
-        "keywords": (
-            "тюль дубай, тюль на заказ дубай, "
-            "sheer curtains dubai, тюль ОАЭ"
-        ),
-        "breadcrumb_name": "Тюль на заказ",
-        "content_paragraphs": [
-            (
-                "Тюль — это лёгкая полупрозрачная ткань, которая мягко "
-                "рассеивает солнечный свет и создаёт уютную атмосферу "
-                "в любом помещении. Наш тюль на заказ идеально подходит "
-                "для гостиных, столовых и кухонь в Дубае."
-            ),
-            (
-                "Мы используем только натуральные ткани премиум-класса — "
-                "лён и хлопок. Эти материалы дышат, приятны на ощупь и "
-                "долговечны. Тюль из натуральных волокон не электризуется "
-                "и не притягивает пыль, что особенно актуально в климате ОАЭ."
-            ),
-            (
-                "Каждый тюль шьётся индивидуально по размерам вашего окна. "
-                "Мы предлагаем различные виды драпировки: классическую складку, "
-                "люверсы, ленту. Замер и установка бесплатны, срок пошива — "
-                "4-5 рабочих дней."
-            ),
-        ],
-        "faq": [
-            {
-                "q": "Из каких тканей шьётся тюль?",
-                "a": (
-                    "Мы предлагаем тюль из натурального льна и хлопка "
-                    "различной плотности — от лёгкого воздушного до более "
-                    "плотного с текстурой. Все ткани экологичные и гипоаллергенные."
-                ),
-            },
-            {
-                "q": "Насколько прозрачный тюль?",
-                "a": (
-                    "Степень прозрачности зависит от выбранной ткани. "
-                    "У нас есть варианты от почти полностью прозрачных до "
-                    "полупрозрачных, которые хорошо скрывают от взглядов снаружи, "
-                    "но пропускают свет."
-                ),
-            },
-            {
-                "q": "Как ухаживать за тюлем?",
-                "a": (
-                    "Тюль из натуральных тканей стирается в деликатном режиме "
-                    "при 30°C. Рекомендуем стирку раз в 3-4 месяца. "
-                    "Гладить на минимальной температуре или использовать отпариватель."
-                ),
-            },
-            {
-                "q": "Сколько стоит тюль на заказ?",
-                "a": (
-                    "Стоимость рассчитывается за квадратные метры готового изделия. "
-                    "Замер, карниз, доставка и установка включены. "
-                    "Используйте калькулятор на сайте для расчёта."
-                ),
-            },
-        ],
-    },
-    {
-        "filename": "motorizirovannye-shtory-dubai.html",
-        "slug": "motorizirovannye-shtory-dubai",
-        "title": "Моторизированные шторы в Дубае | Curtains World",
-        "h1": "Моторизированные шторы в Дубае",
-        "description": (
-            "Электрические шторы с управлением с пульта и смартфона. "
-            "Установка в Дубае. Бесплатный замер. "
-            "Звоните: +971 58 940 8100"
-        ),
-        "keywords": (
-            "моторизированные шторы дубай, электрические шторы дубай, "
-            "motorized curtains dubai"
-        ),
-        "breadcrumb_name": "Моторизированные шторы",
-        "content_paragraphs": [
-            (
-                "Моторизированные шторы — это современное решение для "
-                "управления освещением в вашем доме. Откройте или закройте "
-                "шторы одним нажатием кнопки на пульте, через приложение на "
-                "смартфоне или голосовой командой."
-            ),
-            (
-                "Наши электрические карнизы работают практически бесшумно "
-                "и совместимы с системами умного дома: Apple HomeKit, "
-                "Google Home, Amazon Alexa. Вы можете настроить расписание "
-                "автоматического открытия и закрытия штор."
-            ),
-            (
-                "Мы устанавливаем моторизированные системы для любых типов "
-                "штор — тюль, блэкаут, рулонные. Питание от сети 220В или "
-                "от аккумулятора с зарядкой через USB-C. Бесплатный замер "
-                "и профессиональная установка включены."
-            ),
-        ],
-        "faq": [
-            {
-                "q": "Как управлять моторизированными шторами?",
-                "a": (
-                    "Управление доступно с пульта ДУ, через мобильное приложение "
-                    "на смартфоне, голосовыми командами (Siri, Alexa, Google), "
-                    "а также по расписанию через приложение."
-                ),
-            },
-            {
-                "q": "Совместимы ли шторы с системами умного дома?",
-                "a": (
-                    "Да, наши моторизированные карнизы поддерживают Apple HomeKit, "
-                    "Google Home, Amazon Alexa и работают через Wi-Fi или Bluetooth. "
-                    "Интеграция настраивается при установке."
-                ),
-            },
-            {
-                "q": "Какое питание нужно для электрических штор?",
-                "a": (
-                    "Доступны два варианта: проводное подключение к сети 220В "
-                    "(скрытая проводка) или аккумуляторные моторы с зарядкой "
-                    "через USB-C, которые работают 6-12 месяцев без подзарядки."
-                ),
-            },
-            {
-                "q": "Как обслуживать моторизированные шторы?",
-                "a": (
-                    "Электрические карнизы практически не требуют обслуживания. "
-                    "Рекомендуем протирать направляющие раз в полгода. "
-                    "На мотор предоставляется гарантия 3 года."
-                ),
-            },
-        ],
-    },
-    {
-        "filename": "zhalyuzi-dubai.html",
-        "slug": "zhalyuzi-dubai",
-        "title": "Жалюзи на заказ в Дубае | Curtains World",
-        "h1": "Жалюзи на заказ в Дубае",
-        "description": (
-            "Жалюзи на заказ в Дубае — вертикальные, горизонтальные, "
-            "рулонные. Замер и установка бесплатно. "
-            "Звоните: +971 58 940 8100"
-        ),
-        "keywords": (
-            "жалюзи дубай, жалюзи на заказ дубай, "
-            "blinds dubai, рулонные шторы дубай"
-        ),
-        "breadcrumb_name": "Жалюзи",
-        "content_paragraphs": [
-            (
-                "Жалюзи — практичное и стильное решение для офисов, "
-                "кухонь, ванных комнат и любых помещений в Дубае. "
-                "Они позволяют точно регулировать количество света, "
-                "легко чистятся и занимают минимум места."
-            ),
-            (
-                "Мы предлагаем все основные типы жалюзи: вертикальные "
-                "из ткани, горизонтальные алюминиевые и деревянные, "
-                "а также рулонные шторы различной плотности. "
-                "Для влажных помещений есть влагостойкие модели."
-            ),
-            (
-                "Каждый заказ изготавливается индивидуально по вашим "
-                "размерам. Широкий выбор цветов и материалов позволяет "
-                "подобрать жалюзи под любой интерьер. Замер бесплатный, "
-                "установка включена в стоимость."
-            ),
-        ],
-        "faq": [
-            {
-                "q": "Какие типы жалюзи вы предлагаете?",
-                "a": (
-                    "Вертикальные тканевые, горизонтальные алюминиевые "
-                    "и деревянные, рулонные шторы (в том числе день-ночь), "
-                    "а также римские шторы. Все изготавливаются на заказ."
-                ),
-            },
-            {
-                "q": "Из каких материалов делают жалюзи?",
-                "a": (
-                    "Алюминий, натуральное дерево, бамбук, ткань, "
-                    "ПВХ (для влажных помещений). Выбор материала зависит "
-                    "от назначения помещения и ваших предпочтений."
-                ),
-            },
-            {
-                "q": "Подходят ли жалюзи для ванной комнаты?",
-                "a": (
-                    "Да, для ванных комнат мы предлагаем влагостойкие модели "
-                    "из алюминия или ПВХ, которые не боятся воды и пара. "
-                    "Они легко моются и долго сохраняют внешний вид."
-                ),
-            },
-            {
-                "q": "Сколько стоят жалюзи на заказ?",
-                "a": (
-                    "Цена зависит от типа жалюзи, материала и размеров окна. "
-                    "Замер, изготовление и установка включены. "
-                    "Свяжитесь с нами для бесплатного расчёта."
-                ),
-            },
-        ],
-    },
-    {
-        "filename": "karnizy-dubai.html",
-        "slug": "karnizy-dubai",
-        "title": "Карнизы в Дубае | Curtains World",
-        "h1": "Карнизы в Дубае",
-        "description": (
-            "Карнизы для штор в Дубае — потолочные, настенные, электрические. "
-            "Установка бесплатно. Звоните: +971 58 940 8100"
-        ),
-        "keywords": (
-            "карнизы дубай, карнизы для штор дубай, "
-            "curtain rods dubai, карнизы ОАЭ"
-        ),
-        "breadcrumb_name": "Карнизы",
-        "content_paragraphs": [
-            (
-                "Карниз — важный элемент оформления окна, от которого зависит "
-                "внешний вид и функциональность штор. Мы предлагаем широкий "
-                "выбор карнизов для любых помещений в Дубае: потолочные, "
-                "настенные и электрические."
-            ),
-            (
-                "Потолочные карнизы визуально увеличивают высоту помещения "
-                "и создают эффект штор \"от потолка до пола\". Настенные карнизы "
-                "— классический вариант, который подходит для большинства "
-                "интерьеров. Электрические карнизы обеспечивают управление "
-                "с пульта и смартфона."
-            ),
-            (
-                "Все карнизы устанавливаются нашими специалистами. "
-                "При заказе штор карниз и установка входят в стоимость. "
-                "Мы работаем с профильными алюминиевыми системами, "
-                "которые надёжны, бесшумны и долговечны."
-            ),
-        ],
-        "faq": [
-            {
-                "q": "Какие типы карнизов вы предлагаете?",
-                "a": (
-                    "Потолочные профильные (скрытые в нише или открытые), "
-                    "настенные (круглые и профильные), электрические "
-                    "с управлением с пульта и смартфона. Одно- и двухрядные."
-                ),
-            },
-            {
-                "q": "Что лучше — потолочный или настенный карниз?",
-                "a": (
-                    "Потолочный карниз создаёт эффект высоких потолков и "
-                    "визуально расширяет пространство. Настенный карниз "
-                    "проще в установке и подходит для подвесных потолков. "
-                    "Выбор зависит от особенностей помещения."
-                ),
-            },
-            {
-                "q": "Есть ли электрические карнизы?",
-                "a": (
-                    "Да, мы устанавливаем электрические карнизы с мотором. "
-                    "Управление через пульт, приложение на телефоне или "
-                    "голосом через Apple HomeKit, Google Home, Alexa."
-                ),
-            },
-            {
-                "q": "Сколько стоит карниз с установкой?",
-                "a": (
-                    "При заказе штор карниз и установка включены в стоимость. "
-                    "Отдельно карниз с установкой — от 200 AED за погонный метр "
-                    "в зависимости от типа и материала."
-                ),
-            },
-        ],
-    },
-]
+# Logical -> content-hashed asset names, written by fingerprint_assets.py.
+# Templates name assets by their plain paths; compile_layout() and
+# asset_url() swap in the hashed ones. Without the manifest the plain
+# names are used as is.
+ASSET_MANIFEST_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "asset-manifest.json")
+ASSET_REF_RE = re.compile(r"(?<![\w-])assets/[\w./-]*[\w-]")
+
+
+def load_asset_manifest(path=ASSET_MANIFEST_FILE):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+ASSETS = load_asset_manifest()
+
+
+def asset_url(path):
+    """The served path of an asset: its hashed name once fingerprinted."""
+    return ASSETS.get(path, path)
+
+
+def asset_refs(source):
+    """Replace every ``assets/...`` path in template source with asset_url()."""
+    return ASSET_REF_RE.sub(lambda m: asset_url(m.group()), source)
+
+
+# Resized copies of the images, written by responsive_images.py. home.html
+# may show a variant; the sitemap lists the full-size source instead.
+IMAGE_MANIFEST_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "image-manifest.json")
+
+
+def load_image_sources(path=IMAGE_MANIFEST_FILE):
+    """Map every variant path to the full-size image it was resized from."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            images = json.load(f)["images"]
+    except FileNotFoundError:
+        return {}
+    return {
+        variant: entry["source"]
+        for entry in images.values()
+        for fmt in ("avif", "webp")
+        for _, variant in entry[fmt]
+    }
+
+
+IMAGE_SOURCES = load_image_sources()
+
+HERO_IMAGE = asset_url("assets/img_2024-02-07_14131410.webp")  # og:image, Article and sitemap image
 
-# ---------------------------------------------------------------------------
-# All landing pages for cross-links (slug -> label)
-# ---------------------------------------------------------------------------
-ALL_LANDING_PAGES = [
-    ("blackout-shtory-dubai", "Блэкаут шторы"),
-    ("tyul-na-zakaz-dubai", "Тюль на заказ"),
-    ("motorizirovannye-shtory-dubai", "Моторизированные шторы"),
-    ("zhalyuzi-dubai", "Жалюзи"),
-    ("karnizy-dubai", "Карнизы"),
-]
 
 # ---------------------------------------------------------------------------
-# Blog articles
+# Shared fragment cache
 # ---------------------------------------------------------------------------
-BLOG_ARTICLES = [
-    {
-        "filename": "blog-kak-vybrat-shtory-dubai.html",
-        "slug": "blog-kak-vybrat-shtory-dubai",
-        "title": "Как выбрать шторы в Дубае: полное руководство | Curtains World",
-        "h1": "Как выбрать шторы в Дубае",
-        "description": (
-            "Полное руководство по выбору штор в Дубае: типы тканей, "
-            "особенности климата ОАЭ, размеры окон, бюджет. "
-            "Советы от экспертов Curtains World."
-        ),
-        "keywords": (
-            "как выбрать шторы дубай, шторы дубай советы, "
-            "ткани для штор ОАЭ, выбор штор"
-        ),
-        "breadcrumb_name": "Как выбрать шторы",
-        "date_published": "2026-02-25",
-        "content_sections": [
-            {
-                "heading": "Особенности климата ОАЭ и их влияние на выбор штор",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "Дубай — город с экстремальным солнечным излучением. "
-                        "Летом температура поднимается выше 45°C, а солнце светит "
-                        "более 10 часов в сутки. Это создаёт уникальные требования "
-                        "к шторам: они должны не только украшать интерьер, но и "
-                        "защищать помещение от перегрева."
-                    ),
-                    (
-                        "Пыльные бури — ещё одна особенность региона. Мелкий песок "
-                        "проникает даже через закрытые окна. Поэтому шторы в Дубае "
-                        "должны быть из ткани, которая легко чистится и не накапливает "
-                        "пыль. Синтетические материалы с антистатическим покрытием — "
-                        "оптимальный выбор для повседневного использования."
-                    ),
-                ],
-            },
-            {
-                "heading": "Типы тканей: какую выбрать",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "Блэкаут — плотная трёхслойная ткань, блокирующая 95-99% "
-                        "света. Идеальна для спален и детских. В Дубае блэкаут шторы "
-                        "также заметно снижают расходы на кондиционирование, отражая "
-                        "тепло обратно наружу."
-                    ),
-                    (
-                        "Лён и хлопок — натуральные ткани, которые создают уютную "
-                        "атмосферу и хорошо пропускают воздух. Однако в климате ОАЭ "
-                        "они быстрее выгорают на солнце. Рекомендуем использовать "
-                        "подкладку для защиты от ультрафиолета."
-                    ),
-                    (
-                        "Полиэстер и смесовые ткани — практичный выбор для Дубая. "
-                        "Они устойчивы к выгоранию, не мнутся, легко стираются. "
-                        "Современные полиэстеровые ткани визуально не отличаются "
-                        "от натуральных."
-                    ),
-                ],
-            },
-            {
-                "heading": "На что обратить внимание при выборе",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "Размер окон. В новостройках Дубая часто панорамное "
-                        "остекление от пола до потолка. Для таких окон нужны шторы "
-                        "длиной 2.8-3.2 метра. Моторизированный карниз значительно "
-                        "упростит ежедневное использование."
-                    ),
-                    (
-                        "Этаж и сторона света. Квартиры на высоких этажах получают "
-                        "больше прямого солнца. Южная и западная стороны требуют "
-                        "максимальной защиты — здесь оптимален блэкаут или плотный "
-                        "тюль в сочетании с рулонными шторами."
-                    ),
-                    (
-                        "Назначение помещения. Для спальни — блэкаут, для "
-                        "гостиной — тюль с портьерами, для кухни — рулонные шторы "
-                        "или жалюзи, для ванной — влагостойкие жалюзи."
-                    ),
-                ],
-            },
-            {
-                "heading": "Бюджет и сроки изготовления",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "Стоимость штор на заказ в Дубае зависит от типа ткани, "
-                        "размера окна и типа карниза. В среднем комплект штор для "
-                        "одного окна (блэкаут + тюль с карнизом и установкой) "
-                        "стоит от 500 до 1500 AED."
-                    ),
-                    (
-                        "Срок изготовления штор на заказ — 4-5 рабочих дней. "
-                        "Замер бесплатный: наш специалист приедет к вам, снимет "
-                        "точные размеры и поможет подобрать ткань из каталога "
-                        "с образцами."
-                    ),
-                ],
-            },
-        ],
-        "faq": [
-            {
-                "q": "Какие шторы лучше для жаркого климата Дубая?",
-                "a": (
-                    "Для максимальной защиты от жары рекомендуем блэкаут шторы "
-                    "с термоизолирующим слоем. Они блокируют до 99% солнечного "
-                    "света и снижают нагрев помещения, экономя до 30% "
-                    "на кондиционировании."
-                ),
-            },
-            {
-                "q": "Сколько стоят шторы на заказ в Дубае?",
-                "a": (
-                    "Стоимость зависит от типа ткани и размера окна. В среднем "
-                    "комплект (шторы + карниз + установка) стоит от 500 до "
-                    "1500 AED за окно. Замер бесплатный — используйте калькулятор "
-                    "на нашем сайте для точного расчёта."
-                ),
-            },
-            {
-                "q": "Как быстро изготовят шторы?",
-                "a": (
-                    "Срок изготовления штор на заказ — 4-5 рабочих дней после "
-                    "замера. Замер, доставка и установка включены в стоимость."
-                ),
-            },
-        ],
-    },
-    {
-        "filename": "blog-blackout-shtory-plyusy-minusy.html",
-        "slug": "blog-blackout-shtory-plyusy-minusy",
-        "title": "Блэкаут шторы: плюсы и минусы | Curtains World",
-        "h1": "Блэкаут шторы: плюсы и минусы",
-        "description": (
-            "Всё о блэкаут шторах: преимущества и недостатки, для каких "
-            "помещений подходят, как выбрать. Честный обзор от Curtains World."
-        ),
-        "keywords": (
-            "блэкаут шторы плюсы минусы, блэкаут шторы обзор, "
-            "blackout curtains pros cons, затемняющие шторы"
-        ),
-        "breadcrumb_name": "Блэкаут: плюсы и минусы",
-        "date_published": "2026-02-25",
-        "content_sections": [
-            {
-                "heading": "Что такое блэкаут шторы",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "Блэкаут (blackout) — это тип ткани, состоящий из "
-                        "нескольких слоёв. Внешний декоративный слой отвечает за "
-                        "внешний вид, средний чёрный слой блокирует свет, а "
-                        "внутренний белый слой отражает солнечные лучи. Такая "
-                        "конструкция обеспечивает затемнение от 95% до 99%."
-                    ),
-                    (
-                        "В Дубае блэкаут шторы особенно популярны из-за "
-                        "интенсивного солнечного света. Они используются в спальнях, "
-                        "детских комнатах, домашних кинотеатрах и офисах "
-                        "с проекторами."
-                    ),
-                ],
-            },
-            {
-                "heading": "Плюсы блэкаут штор",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "Полная блокировка света. Качественные блэкаут шторы "
-                        "создают абсолютную темноту даже в полдень. Это особенно "
-                        "важно для людей, работающих в ночные смены, и для детского "
-                        "дневного сна."
-                    ),
-                    (
-                        "Энергосбережение. Блэкаут ткань отражает солнечное тепло, "
-                        "снижая температуру в помещении на 5-10°C. В условиях "
-                        "Дубая это даёт экономию на кондиционировании до 25-30% "
-                        "в летние месяцы."
-                    ),
-                    (
-                        "Шумоизоляция. Плотная многослойная структура блэкаут "
-                        "ткани частично поглощает уличный шум. Это заметное "
-                        "преимущество для квартир, выходящих на оживлённые улицы."
-                    ),
-                    (
-                        "Защита мебели. Ультрафиолет разрушает обивку мебели, "
-                        "ковры и паркет. Блэкаут шторы полностью блокируют UV-лучи, "
-                        "продлевая срок службы интерьера."
-                    ),
-                ],
-            },
-            {
-                "heading": "Минусы блэкаут штор",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "Цена. Блэкаут ткань стоит дороже обычных штор из-за "
-                        "сложной многослойной конструкции. Однако экономия на "
-                        "кондиционировании постепенно окупает разницу в цене."
-                    ),
-                    (
-                        "Вес. Блэкаут шторы тяжелее обычных, что требует более "
-                        "прочного карниза. Для панорамных окон в Дубае рекомендуем "
-                        "моторизированные карнизы — управлять тяжёлыми шторами "
-                        "вручную неудобно."
-                    ),
-                    (
-                        "Полная темнота подходит не всем. Некоторым людям "
-                        "некомфортно спать в абсолютной темноте. В этом случае "
-                        "можно оставить небольшой зазор или дополнить блэкаут "
-                        "лёгким тюлем для мягкого рассеянного света днём."
-                    ),
-                ],
-            },
-            {
-                "heading": "Для каких помещений подходят блэкаут шторы",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "Спальни — основное применение. Полное затемнение "
-                        "улучшает качество сна, что подтверждено исследованиями. "
-                        "Особенно актуально для спален на южной и западной "
-                        "сторонах дома."
-                    ),
-                    (
-                        "Детские комнаты. Дневной сон ребёнка проходит лучше "
-                        "в затемнённом помещении. Для детских доступны блэкаут "
-                        "ткани с яркими расцветками и рисунками."
-                    ),
-                    (
-                        "Домашние кинотеатры и игровые комнаты. Блэкаут шторы "
-                        "устраняют блики на экране и создают идеальные условия "
-                        "для просмотра фильмов и игр."
-                    ),
-                    (
-                        "Офисы с проекторами. Если в переговорной комнате "
-                        "используется проектор, блэкаут шторы обеспечат чёткое "
-                        "изображение даже днём."
-                    ),
-                ],
-            },
-        ],
-        "faq": [
-            {
-                "q": "Блэкаут шторы полностью блокируют свет?",
-                "a": (
-                    "Качественные блэкаут шторы блокируют 95-99% света. "
-                    "Небольшое количество света может проникать по краям — "
-                    "для максимального затемнения используйте боковые направляющие "
-                    "или шторы с запасом по ширине."
-                ),
-            },
-            {
-                "q": "Блэкаут шторы помогают экономить на кондиционере?",
-                "a": (
-                    "Да, блэкаут ткань отражает солнечное тепло и снижает "
-                    "температуру в помещении. В условиях Дубая экономия на "
-                    "кондиционировании может достигать 25-30% в летние месяцы."
-                ),
-            },
-            {
-                "q": "Как стирать блэкаут шторы?",
-                "a": (
-                    "Блэкаут шторы можно стирать в машинке на деликатном режиме "
-                    "при 30°C. Не используйте отбеливатели. Сушите в расправленном "
-                    "виде, не выжимая. Рекомендуем стирку раз в 6 месяцев."
-                ),
-            },
-        ],
-    },
-    {
-        "filename": "blog-motorizirovannye-shtory-stoit-li.html",
-        "slug": "blog-motorizirovannye-shtory-stoit-li",
-        "title": "Моторизированные шторы — стоит ли? Обзор 2026 | Curtains World",
-        "h1": "Моторизированные шторы — стоит ли?",
-        "description": (
-            "Подробный обзор моторизированных штор: как работают, плюсы "
-            "и минусы, интеграция с умным домом. Стоит ли покупать "
-            "в Дубае в 2026 году?"
-        ),
-        "keywords": (
-            "моторизированные шторы стоит ли, электрические шторы обзор, "
-            "motorized curtains review, умные шторы дубай"
-        ),
-        "breadcrumb_name": "Моторизированные шторы: обзор",
-        "date_published": "2026-02-25",
-        "content_sections": [
-            {
-                "heading": "Как работают моторизированные шторы",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "Моторизированные шторы — это обычные шторы или жалюзи, "
-                        "закреплённые на электрическом карнизе. Внутри карниза "
-                        "установлен тихий мотор, который открывает и закрывает "
-                        "шторы по команде."
-                    ),
-                    (
-                        "Управление осуществляется несколькими способами: пульт ДУ, "
-                        "приложение на смартфоне, голосовые команды (Siri, Alexa, "
-                        "Google Assistant) или автоматически по расписанию. "
-                        "Современные моторы работают практически бесшумно."
-                    ),
-                    (
-                        "Питание может быть проводным (220В, скрытая проводка) или "
-                        "от встроенного аккумулятора с зарядкой через USB-C. "
-                        "Аккумуляторные моторы работают 6-12 месяцев без подзарядки "
-                        "при ежедневном использовании."
-                    ),
-                ],
-            },
-            {
-                "heading": "Преимущества моторизированных штор",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "Удобство. Одним нажатием кнопки или голосовой командой вы "
-                        "управляете всеми шторами в доме. Не нужно подходить к "
-                        "каждому окну — особенно ценно для панорамного остекления "
-                        "в квартирах Дубая."
-                    ),
-                    (
-                        "Безопасность для детей. Отсутствие шнуров и цепочек "
-                        "устраняет риск для маленьких детей. Это важный аргумент "
-                        "для семей с детьми."
-                    ),
-                    (
-                        "Автоматизация. Настройте расписание: шторы откроются "
-                        "утром в 7:00 и закроются вечером на закате. Датчик "
-                        "освещённости автоматически закроет шторы, когда солнце "
-                        "начнёт бить в окна."
-                    ),
-                    (
-                        "Панорамные окна. Для окон высотой 3+ метра моторизированный "
-                        "карниз — практически единственный удобный вариант. "
-                        "Управлять тяжёлыми шторами вручную на такой высоте "
-                        "крайне неудобно."
-                    ),
-                ],
-            },
-            {
-                "heading": "Недостатки и нюансы",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "Цена. Моторизированный карниз стоит в 3-5 раз дороже "
-                        "обычного. Однако для панорамных окон и систем «умный дом» "
-                        "это оправданная инвестиция в комфорт."
-                    ),
-                    (
-                        "Установка. Проводные моторы требуют скрытой проводки — "
-                        "это лучше планировать на этапе ремонта. Аккумуляторные "
-                        "моторы устанавливаются без проводки, но требуют "
-                        "периодической подзарядки."
-                    ),
-                    (
-                        "Обслуживание. Хотя моторы надёжны (гарантия 3 года), "
-                        "при поломке ремонт сложнее, чем для обычного карниза. "
-                        "Рекомендуем направляющие протирать от пыли раз в полгода."
-                    ),
-                ],
-            },
-            {
-                "heading": "Интеграция с умным домом",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "Apple HomeKit. Шторы появляются в приложении «Дом» и "
-                        "управляются через Siri. Можно создавать сценарии: "
-                        "«Доброе утро» откроет шторы и включит свет."
-                    ),
-                    (
-                        "Google Home. Голосовые команды на русском: «Окей, Гугл, "
-                        "закрой шторы в спальне». Поддержка расписания и "
-                        "интеграция с другими устройствами."
-                    ),
-                    (
-                        "Amazon Alexa. Полная поддержка голосового управления. "
-                        "Создание групп и сцен — например, «Alexa, кино» закроет "
-                        "шторы и приглушит свет."
-                    ),
-                ],
-            },
-        ],
-        "faq": [
-            {
-                "q": "Сколько стоят моторизированные шторы?",
-                "a": (
-                    "Стоимость зависит от ширины окна и типа мотора. "
-                    "Моторизированный карниз стоит от 800 AED за погонный метр "
-                    "с установкой. Аккумуляторные модели немного дешевле "
-                    "проводных."
-                ),
-            },
-            {
-                "q": "Можно ли моторизировать существующие шторы?",
-                "a": (
-                    "В большинстве случаев да — заменяется только карниз, "
-                    "а существующие шторы перевешиваются на новый электрический. "
-                    "Наш специалист оценит возможность при бесплатном замере."
-                ),
-            },
-            {
-                "q": "Насколько тихо работают моторизированные шторы?",
-                "a": (
-                    "Современные моторы производят шум менее 35 дБ — тише, чем "
-                    "шёпот. Вы не будете слышать их в соседней комнате. "
-                    "Работа мотора займёт 10-20 секунд в зависимости от ширины окна."
-                ),
-            },
-        ],
-    },
-    {
-        "filename": "blog-ukhod-za-shtorami-oae.html",
-        "slug": "blog-ukhod-za-shtorami-oae",
-        "title": "Уход за шторами в ОАЭ: советы и рекомендации | Curtains World",
-        "h1": "Уход за шторами в ОАЭ",
-        "description": (
-            "Как ухаживать за шторами в климате ОАЭ: чистка от пыли и песка, "
-            "стирка, защита от выгорания. Практические советы от Curtains World."
-        ),
-        "keywords": (
-            "уход за шторами ОАЭ, чистка штор дубай, стирка штор, "
-            "шторы выгорание солнце"
-        ),
-        "breadcrumb_name": "Уход за шторами",
-        "date_published": "2026-02-25",
-        "content_sections": [
-            {
-                "heading": "Пыль и песок: как часто чистить шторы",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "В ОАЭ пыль — главный враг штор. Мелкий пустынный песок "
-                        "проникает в помещения даже при закрытых окнах, особенно "
-                        "во время пыльных бурь (shamal). Шторы в Дубае нужно "
-                        "чистить чаще, чем в других климатических зонах."
-                    ),
-                    (
-                        "Рекомендуемая частота: пылесосьте шторы насадкой для "
-                        "мягкой мебели раз в 2 недели. Используйте минимальную "
-                        "мощность, чтобы не повредить ткань. Для блэкаут штор "
-                        "достаточно протирки влажной микрофиброй раз в месяц."
-                    ),
-                    (
-                        "Совет: после пыльной бури протрите шторы влажной тканью, "
-                        "не дожидаясь регулярной уборки. Песчинки со временем "
-                        "въедаются в ткань и повреждают волокна."
-                    ),
-                ],
-            },
-            {
-                "heading": "Стирка или химчистка",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "Домашняя стирка подходит для тюля и лёгких штор из "
-                        "хлопка, льна и полиэстера. Режим: деликатный, 30°C, "
-                        "без отжима. Используйте жидкие средства для стирки — "
-                        "порошок может оставить белые разводы."
-                    ),
-                    (
-                        "Химчистка рекомендуется для блэкаут штор, портьер из "
-                        "тяжёлых тканей, штор с подкладкой и любых штор с "
-                        "декоративными элементами. В Дубае много химчисток, "
-                        "предлагающих услугу «снятие — чистка — развешивание»."
-                    ),
-                    (
-                        "Как часто стирать: тюль — раз в 3-4 месяца, портьеры — "
-                        "раз в 6 месяцев, блэкаут — раз в 6-12 месяцев. В ОАЭ "
-                        "рекомендуем стирать чаще из-за пыли."
-                    ),
-                ],
-            },
-            {
-                "heading": "Защита от выгорания на солнце",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "Ультрафиолет в Дубае особенно интенсивен — шторы "
-                        "выгорают быстрее, чем в умеренном климате. Больше всего "
-                        "страдают яркие и тёмные цвета: красный, синий, чёрный."
-                    ),
-                    (
-                        "Способы защиты: используйте шторы с UV-защитной "
-                        "подкладкой — она принимает удар солнца на себя. Тюль "
-                        "перед портьерами также снижает воздействие UV на "
-                        "основные шторы."
-                    ),
-                    (
-                        "Выбирайте светлые и нейтральные тона: бежевый, серый, "
-                        "кремовый. Они выгорают менее заметно и служат дольше. "
-                        "Синтетические ткани устойчивее к выгоранию, чем "
-                        "натуральные."
-                    ),
-                ],
-            },
-            {
-                "heading": "Когда пора менять шторы",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "Средний срок службы штор в ОАЭ: тюль — 3-5 лет, "
-                        "портьеры — 5-7 лет, блэкаут — 5-8 лет, жалюзи — "
-                        "7-10 лет. Эти сроки зависят от ухода и расположения "
-                        "окна (солнечная сторона сокращает срок)."
-                    ),
-                    (
-                        "Признаки того, что шторы пора менять: заметное "
-                        "выгорание цвета, истончение ткани на просвет, "
-                        "устойчивые пятна после стирки, потеря формы "
-                        "и драпировки. Для блэкаут — снижение уровня "
-                        "затемнения."
-                    ),
-                    (
-                        "Совет: при замене штор можно обновить только ткань, "
-                        "сохранив карниз. Это экономит до 30% стоимости. "
-                        "Наши специалисты снимут старые шторы и установят "
-                        "новые на существующий карниз."
-                    ),
-                ],
-            },
-        ],
-        "faq": [
-            {
-                "q": "Как часто нужно стирать шторы в Дубае?",
-                "a": (
-                    "Тюль — раз в 3-4 месяца, портьеры — раз в 6 месяцев, "
-                    "блэкаут — раз в 6-12 месяцев. Между стирками пылесосьте "
-                    "шторы мягкой насадкой раз в 2 недели."
-                ),
-            },
-            {
-                "q": "Можно ли стирать блэкаут шторы в машинке?",
-                "a": (
-                    "Да, на деликатном режиме при 30°C без отжима и "
-                    "отбеливателя. Но для сохранения свойств ткани лучше "
-                    "отдать в химчистку. Между стирками протирайте влажной "
-                    "микрофиброй."
-                ),
-            },
-            {
-                "q": "Как защитить шторы от выгорания?",
-                "a": (
-                    "Используйте UV-защитную подкладку, выбирайте светлые тона "
-                    "и синтетические ткани. Тюль перед портьерами дополнительно "
-                    "снижает воздействие ультрафиолета."
-                ),
-            },
-        ],
-    },
-    {
-        "filename": "blog-shtory-dlya-arendnoj-kvartiry-dubai.html",
-        "slug": "blog-shtory-dlya-arendnoj-kvartiry-dubai",
-        "title": "Шторы для арендной квартиры в Дубае | Curtains World",
-        "h1": "Шторы для арендной квартиры в Дубае",
-        "description": (
-            "Как выбрать шторы для съёмной квартиры в Дубае: бюджетные "
-            "варианты, стандартные размеры окон, карнизы без сверления. "
-            "Практический гид."
-        ),
-        "keywords": (
-            "шторы арендная квартира дубай, шторы съёмная квартира, "
-            "бюджетные шторы дубай, карнизы без сверления"
-        ),
-        "breadcrumb_name": "Шторы для аренды",
-        "date_published": "2026-02-25",
-        "content_sections": [
-            {
-                "heading": "Стандартные размеры окон в квартирах ОАЭ",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "В новостройках Дубая преобладает панорамное остекление. "
-                        "Типичная высота окон — от 2.4 до 3.0 метров. В студиях "
-                        "и однокомнатных квартирах обычно 2-3 окна, в двухкомнатных "
-                        "— 4-6 окон, в трёхкомнатных — 6-8 окон."
-                    ),
-                    (
-                        "Стандартной ширины окон в ОАЭ нет — она варьируется от "
-                        "1.5 до 4 метров. Поэтому готовые шторы из магазина редко "
-                        "подходят по размеру. Шторы на заказ — практически "
-                        "единственный вариант для идеальной посадки."
-                    ),
-                ],
-            },
-            {
-                "heading": "Бюджетные варианты штор",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "Рулонные шторы — самый экономичный вариант. Они компактны, "
-                        "легко устанавливаются и стоят дешевле классических штор. "
-                        "Доступны в блэкаут и полупрозрачном исполнении."
-                    ),
-                    (
-                        "Тюль без портьер. Если квартира на высоком этаже и "
-                        "приватность не проблема, можно обойтись только тюлем. "
-                        "Это в 2 раза дешевле комплекта «тюль + блэкаут» и "
-                        "визуально расширяет пространство."
-                    ),
-                    (
-                        "Жалюзи для кухни и ванной. Алюминиевые жалюзи "
-                        "стоят дешевле тканевых штор, легко моются и служат "
-                        "дольше. Для кухни и ванной — оптимальный выбор "
-                        "по соотношению цена-качество."
-                    ),
-                ],
-            },
-            {
-                "heading": "Что делать со шторами при выезде",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "По закону ОАЭ, если арендатор установил шторы, он может "
-                        "забрать их при выезде. Однако карнизы, прикреплённые к стене "
-                        "или потолку, считаются улучшением квартиры — арендодатель "
-                        "может потребовать их оставить."
-                    ),
-                    (
-                        "Совет: договоритесь с арендодателем об установке карнизов "
-                        "до начала работ. Многие лендлорды приветствуют улучшения и "
-                        "соглашаются компенсировать часть стоимости."
-                    ),
-                    (
-                        "Если вы планируете часто переезжать, выбирайте "
-                        "универсальные шторы стандартных размеров и карнизы "
-                        "без сверления — их легко перевезти в новую квартиру."
-                    ),
-                ],
-            },
-            {
-                "heading": "Карнизы без сверления",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "Телескопические карнизы — самый простой вариант без "
-                        "сверления. Они устанавливаются в оконный проём враспор. "
-                        "Подходят для лёгких штор и тюля. Выдерживают вес "
-                        "до 5-8 кг."
-                    ),
-                    (
-                        "Карнизы на клею. Современные промышленные клеи "
-                        "выдерживают значительную нагрузку. Карниз крепится "
-                        "к стене без сверления, что сохраняет стены в "
-                        "идеальном состоянии для сдачи квартиры."
-                    ),
-                    (
-                        "Потолочные рельсы с клеевым креплением. Для более "
-                        "тяжёлых штор существуют профильные системы, которые "
-                        "крепятся к потолку на специальный монтажный клей. "
-                        "Наши специалисты оценят возможность такой установки "
-                        "при бесплатном замере."
-                    ),
-                ],
-            },
-        ],
-        "faq": [
-            {
-                "q": "Можно ли установить шторы в арендной квартире без сверления?",
-                "a": (
-                    "Да, существуют телескопические карнизы враспор и системы "
-                    "на промышленном клее. Они не оставляют следов на стенах "
-                    "и подходят для лёгких и средних по весу штор."
-                ),
-            },
-            {
-                "q": "Какие шторы самые дешёвые для съёмной квартиры?",
-                "a": (
-                    "Рулонные шторы — самый бюджетный вариант. Также можно "
-                    "использовать только тюль без портьер для квартир на "
-                    "высоких этажах, где приватность не является проблемой."
-                ),
-            },
-            {
-                "q": "Могу ли я забрать шторы при выезде из квартиры?",
-                "a": (
-                    "Шторы (ткань) — ваша собственность, вы забираете их "
-                    "при выезде. Карнизы, прикреплённые к стене, обычно "
-                    "остаются. Рекомендуем согласовать этот вопрос с "
-                    "арендодателем заранее."
-                ),
-            },
-        ],
-    },
-    {
-        "filename": "blog-zhalyuzi-ili-shtory-dubai.html",
-        "slug": "blog-zhalyuzi-ili-shtory-dubai",
-        "title": "Жалюзи или шторы: что выбрать для квартиры в Дубае | Curtains World",
-        "h1": "Жалюзи или шторы: что выбрать для квартиры в Дубае",
-        "description": (
-            "Сравнение жалюзи и штор для квартиры в Дубае: плюсы и минусы, "
-            "для каких комнат что подходит, стоимость и практичность. "
-            "Советы от Curtains World."
-        ),
-        "keywords": (
-            "жалюзи или шторы дубай, сравнение жалюзи штор, "
-            "blinds vs curtains dubai, жалюзи дубай"
-        ),
-        "breadcrumb_name": "Жалюзи или шторы",
-        "date_published": "2026-02-25",
-        "content_sections": [
-            {
-                "heading": "Жалюзи и шторы: в чём разница",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "Шторы — это тканевые полотна, подвешенные на карниз. Они "
-                        "создают уют, смягчают интерьер и предлагают бесконечное "
-                        "разнообразие тканей, цветов и фактур. Шторы — классическое "
-                        "решение для гостиных и спален."
-                    ),
-                    (
-                        "Жалюзи — это конструкция из горизонтальных или вертикальных "
-                        "ламелей, которые поворачиваются для регулировки света. "
-                        "Жалюзи компактнее штор, проще в уходе и обеспечивают точный "
-                        "контроль освещённости."
-                    ),
-                    (
-                        "В Дубае оба варианта востребованы, но для разных задач. "
-                        "Понимание сильных сторон каждого решения поможет сделать "
-                        "правильный выбор для конкретной комнаты."
-                    ),
-                ],
-            },
-            {
-                "heading": "Когда лучше выбрать жалюзи",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "Кухня и ванная. Жалюзи из алюминия или влагостойкого "
-                        "пластика идеальны для влажных помещений. Они не впитывают "
-                        "запахи, легко протираются влажной тканью и не деформируются "
-                        "от пара."
-                    ),
-                    (
-                        "Офисы и кабинеты. Жалюзи позволяют точно регулировать "
-                        "количество света — можно работать за компьютером без бликов, "
-                        "сохраняя при этом естественное освещение. Вертикальные "
-                        "жалюзи особенно хороши для панорамных окон в офисах."
-                    ),
-                    (
-                        "Небольшие помещения. Жалюзи не занимают пространство перед "
-                        "окном, что важно для компактных квартир-студий в Дубае. "
-                        "Они устанавливаются прямо в оконный проём, не скрадывая "
-                        "полезную площадь."
-                    ),
-                ],
-            },
-            {
-                "heading": "Когда лучше выбрать шторы",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "Спальня. Для полного затемнения блэкаут шторы превосходят "
-                        "жалюзи — между ламелями всегда проникает немного света. "
-                        "Шторы плотно прилегают к стене и обеспечивают максимальное "
-                        "затемнение."
-                    ),
-                    (
-                        "Гостиная. Шторы создают уют и завершённость интерьера. "
-                        "Комбинация тюля и портьер даёт гибкость: днём лёгкий тюль "
-                        "рассеивает свет, вечером тяжёлые портьеры обеспечивают "
-                        "приватность."
-                    ),
-                    (
-                        "Детская комната. Тканевые шторы безопаснее жалюзи с цепочками "
-                        "и шнурами. Также доступен огромный выбор детских расцветок "
-                        "и принтов, которых нет у жалюзи."
-                    ),
-                ],
-            },
-            {
-                "heading": "Комбинированные решения",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "Оптимальный вариант для многих квартир в Дубае — комбинация "
-                        "жалюзи и штор в разных комнатах. Жалюзи на кухне и в ванной, "
-                        "блэкаут шторы в спальне, тюль с портьерами в гостиной."
-                    ),
-                    (
-                        "Также популярно сочетание рулонных штор (разновидность "
-                        "жалюзи) с декоративными портьерами. Рулонная штора "
-                        "обеспечивает затемнение, а портьеры — эстетику. Такое "
-                        "решение объединяет преимущества обоих вариантов."
-                    ),
-                    (
-                        "При заказе комплексного решения для всей квартиры вы "
-                        "экономите: бесплатный замер всех окон за один визит, "
-                        "скидка на объём и единая установка."
-                    ),
-                ],
-            },
-        ],
-        "faq": [
-            {
-                "q": "Что дешевле — жалюзи или шторы?",
-                "a": (
-                    "Алюминиевые жалюзи обычно дешевле тканевых штор для "
-                    "одного окна. Однако разница зависит от материала: рулонные "
-                    "шторы сопоставимы по цене с жалюзи, а премиальные деревянные "
-                    "жалюзи могут стоить дороже штор."
-                ),
-            },
-            {
-                "q": "Что проще в уходе — жалюзи или шторы?",
-                "a": (
-                    "Жалюзи проще: достаточно протереть ламели влажной тканью. "
-                    "Шторы нужно периодически стирать или сдавать в химчистку. "
-                    "В пыльном климате Дубая это важный фактор."
-                ),
-            },
-            {
-                "q": "Можно ли комбинировать жалюзи и шторы в одной комнате?",
-                "a": (
-                    "Да, это популярное решение. Рулонные жалюзи обеспечивают "
-                    "затемнение, а декоративные шторы — эстетику. Такой комплект "
-                    "объединяет функциональность жалюзи и красоту штор."
-                ),
-            },
-            {
-                "q": "Какие жалюзи лучше для ванной в Дубае?",
-                "a": (
-                    "Алюминиевые горизонтальные жалюзи — лучший выбор. Они "
-                    "устойчивы к влаге, не ржавеют, легко моются. Пластиковые "
-                    "жалюзи также подходят, но менее долговечны."
-                ),
-            },
-        ],
-    },
-    {
-        "filename": "blog-karnizy-tipy-i-vybor.html",
-        "slug": "blog-karnizy-tipy-i-vybor",
-        "title": "Карнизы для штор: типы и как выбрать | Curtains World",
-        "h1": "Карнизы для штор: типы и как выбрать",
-        "description": (
-            "Полный гид по карнизам для штор: потолочные, настенные, "
-            "электрические. Как выбрать карниз для квартиры в Дубае. "
-            "Советы от Curtains World."
-        ),
-        "keywords": (
-            "карнизы для штор дубай, типы карнизов, потолочный карниз, "
-            "электрический карниз, curtain rods dubai"
-        ),
-        "breadcrumb_name": "Типы карнизов",
-        "date_published": "2026-02-25",
-        "content_sections": [
-            {
-                "heading": "Настенные карнизы: классика для любого интерьера",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "Настенные карнизы — самый распространённый тип. Они "
-                        "крепятся к стене над окном на кронштейнах. Доступны в "
-                        "виде труб (круглых или профильных), струнных систем и "
-                        "декоративных штанг."
-                    ),
-                    (
-                        "Для Дубая важно учитывать материал стен: в большинстве "
-                        "новостроек стены из гипсокартона или газобетона. Обычные "
-                        "дюбели не выдержат тяжёлые шторы — используйте специальные "
-                        "анкеры или крепите карниз в закладные."
-                    ),
-                    (
-                        "Преимущества настенных карнизов: простота установки, "
-                        "широкий выбор дизайнов и материалов (металл, дерево, "
-                        "пластик), доступная цена. Подходят для стандартных окон "
-                        "высотой до 2.4 метра."
-                    ),
-                ],
-            },
-            {
-                "heading": "Потолочные карнизы: современный минимализм",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "Потолочные карнизы крепятся к потолку и визуально "
-                        "увеличивают высоту помещения. Шторы на потолочном "
-                        "карнизе свисают от потолка до пола, создавая эффект "
-                        "максимального пространства."
-                    ),
-                    (
-                        "Этот тип идеален для панорамных окон в дубайских "
-                        "новостройках. Когда окно занимает всю стену от пола "
-                        "до потолка, настенному карнизу просто не за что "
-                        "крепиться — потолочный вариант единственный."
-                    ),
-                    (
-                        "Профильные потолочные карнизы (алюминиевый рельс) — "
-                        "самый практичный выбор. Они незаметны, выдерживают "
-                        "тяжёлые шторы и могут иметь несколько дорожек для "
-                        "тюля и портьер одновременно."
-                    ),
-                ],
-            },
-            {
-                "heading": "Электрические карнизы: комфорт и технологии",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "Электрический (моторизированный) карниз оснащён тихим "
-                        "мотором, который открывает и закрывает шторы по команде "
-                        "с пульта, смартфона или голосового помощника."
-                    ),
-                    (
-                        "Для панорамных окон шириной 3-6 метров в дубайских "
-                        "квартирах электрический карниз — не роскошь, а "
-                        "необходимость. Управлять тяжёлыми шторами вручную "
-                        "на такой ширине крайне неудобно."
-                    ),
-                    (
-                        "Современные электрокарнизы интегрируются с системами "
-                        "умного дома: Apple HomeKit, Google Home, Amazon Alexa. "
-                        "Можно настроить автоматическое открытие по утрам и "
-                        "закрытие на закате."
-                    ),
-                ],
-            },
-            {
-                "heading": "Как выбрать карниз: чек-лист",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "Определите тип крепления. Если над окном есть стена "
-                        "минимум 15 см — подойдёт настенный карниз. Если окно "
-                        "упирается в потолок — только потолочный. Для «умного "
-                        "дома» — электрический."
-                    ),
-                    (
-                        "Рассчитайте нагрузку. Лёгкий тюль — достаточно "
-                        "струнного карниза. Тюль + портьеры — нужен двухрядный "
-                        "профильный. Тяжёлый блэкаут — усиленный карниз с "
-                        "дополнительными кронштейнами."
-                    ),
-                    (
-                        "Учтите ширину. Карниз должен выступать за оконный "
-                        "проём на 15-20 см с каждой стороны, чтобы открытые "
-                        "шторы не перекрывали окно. Для панорамных окон "
-                        "карниз равен ширине стены."
-                    ),
-                ],
-            },
-        ],
-        "faq": [
-            {
-                "q": "Какой карниз лучше для панорамных окон в Дубае?",
-                "a": (
-                    "Потолочный профильный или электрический карниз. "
-                    "Настенные карнизы не подходят для окон от пола до потолка. "
-                    "Для окон шире 3 метров рекомендуем моторизированный вариант."
-                ),
-            },
-            {
-                "q": "Сколько стоит установка карниза в Дубае?",
-                "a": (
-                    "Настенный карниз с установкой — от 200 AED за окно. "
-                    "Потолочный профильный — от 300 AED. Электрический — "
-                    "от 800 AED за погонный метр. При заказе штор с карнизом "
-                    "установка обычно входит в стоимость."
-                ),
-            },
-            {
-                "q": "Можно ли установить потолочный карниз в натяжной потолок?",
-                "a": (
-                    "Да, но это нужно планировать до монтажа потолка. "
-                    "В натяжном потолке делается ниша (скрытый карниз), "
-                    "куда устанавливается профиль. Это создаёт красивый "
-                    "эффект штор «из потолка»."
-                ),
-            },
-            {
-                "q": "Какой карниз выдержит тяжёлые блэкаут шторы?",
-                "a": (
-                    "Алюминиевый профильный карниз с кронштейнами через "
-                    "каждые 50-60 см. Для двойных штор (тюль + блэкаут) "
-                    "нужен двухрядный карниз. Струнные и пластиковые "
-                    "карнизы для тяжёлых штор не подходят."
-                ),
-            },
-        ],
-    },
-    {
-        "filename": "blog-shtory-dlya-panoramnykh-okon.html",
-        "slug": "blog-shtory-dlya-panoramnykh-okon",
-        "title": "Шторы для панорамных окон в Дубае | Curtains World",
-        "h1": "Шторы для панорамных окон в Дубае",
-        "description": (
-            "Как выбрать шторы для панорамных окон в Дубае: решения "
-            "для больших окон, моторизация, защита от солнца. "
-            "Практический гид от Curtains World."
-        ),
-        "keywords": (
-            "шторы панорамные окна дубай, шторы большие окна, "
-            "curtains panoramic windows dubai, шторы от пола до потолка"
-        ),
-        "breadcrumb_name": "Шторы для панорамных окон",
-        "date_published": "2026-02-25",
-        "content_sections": [
-            {
-                "heading": "Панорамное остекление в Дубае: особенности",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "Панорамные окна — визитная карточка современных "
-                        "дубайских новостроек. В таких проектах, как Dubai Marina, "
-                        "Downtown, JBR и Business Bay, окна от пола до потолка "
-                        "высотой 2.8-3.5 метра — стандарт."
-                    ),
-                    (
-                        "Большие окна дают потрясающий вид, но создают серьёзные "
-                        "проблемы: мощный солнечный нагрев, отсутствие приватности "
-                        "на нижних этажах и сложность подбора штор нестандартных "
-                        "размеров."
-                    ),
-                    (
-                        "Готовые шторы из магазина для панорамных окон практически "
-                        "не подходят — нужен индивидуальный пошив. Также важно "
-                        "правильно выбрать тип карниза и систему управления."
-                    ),
-                ],
-            },
-            {
-                "heading": "Какие шторы подходят для панорамных окон",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "Блэкаут шторы — лучший выбор для спален с панорамным "
-                        "остеклением. Они полностью блокируют свет и значительно "
-                        "снижают нагрев помещения. Для окон высотой 3+ метра "
-                        "рекомендуем ткань средней плотности, чтобы шторы не были "
-                        "слишком тяжёлыми."
-                    ),
-                    (
-                        "Тюль для панорамных окон рассеивает свет и обеспечивает "
-                        "приватность, сохраняя ощущение простора. Выбирайте лёгкие "
-                        "ткани: вуаль, органзу или сетку. Они красиво драпируются "
-                        "на большой высоте."
-                    ),
-                    (
-                        "Комбинация тюль + блэкаут — универсальное решение. "
-                        "Днём тюль создаёт мягкое освещение, ночью блэкаут "
-                        "обеспечивает полную приватность и темноту. Для такого "
-                        "комплекта нужен двухрядный карниз."
-                    ),
-                ],
-            },
-            {
-                "heading": "Моторизация: необходимость для больших окон",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "Для панорамных окон шириной более 3 метров "
-                        "моторизированный карниз — не роскошь, а необходимость. "
-                        "Тяжёлые шторы на такой ширине сложно сдвигать вручную, "
-                        "а цепочки и шнуры выглядят неэстетично."
-                    ),
-                    (
-                        "Электрический карниз управляется пультом, смартфоном "
-                        "или голосом. Можно настроить автоматическое расписание: "
-                        "шторы откроются утром вместе с будильником и закроются "
-                        "вечером на закате."
-                    ),
-                    (
-                        "Аккумуляторные моторы не требуют проводки — идеально "
-                        "для готовых квартир без скрытых кабель-каналов. Зарядка "
-                        "через USB-C раз в 6-12 месяцев."
-                    ),
-                ],
-            },
-            {
-                "heading": "Защита от солнца: что важно в Дубае",
-                "level": 2,
-                "paragraphs": [
-                    (
-                        "Панорамные окна на южной и западной сторонах получают "
-                        "максимум солнечного тепла. Без штор температура у окна "
-                        "может достигать 60°C, а мебель и паркет выгорают "
-                        "за несколько месяцев."
-                    ),
-                    (
-                        "Блэкаут ткань с термоизолирующим слоем отражает до "
-                        "70% солнечного тепла. Это снижает температуру в "
-                        "помещении на 5-10°C и заметно экономит "
-                        "на кондиционировании."
-                    ),
-                    (
-                        "Для максимальной защиты рекомендуем двойную систему: "
-                        "рулонные шторы из screen-ткани (пропускают свет, но "
-                        "блокируют тепло) плюс декоративные портьеры. Это "
-                        "обеспечивает и комфорт, и эстетику."
-                    ),
-                ],
-            },
-        ],
-        "faq": [
-            {
-                "q": "Какие шторы лучше для панорамных окон в спальне?",
-                "a": (
-                    "Блэкаут шторы на моторизированном карнизе. Они полностью "
-                    "блокируют свет для комфортного сна и легко управляются "
-                    "с пульта или смартфона. Дополните лёгким тюлем для "
-                    "дневного использования."
-                ),
-            },
-            {
-                "q": "Обязателен ли моторизированный карниз для панорамных окон?",
-                "a": (
-                    "Для окон шире 3 метров — настоятельно рекомендуем. "
-                    "Управлять тяжёлыми шторами вручную на такой ширине "
-                    "неудобно. Для окон до 3 метров можно обойтись обычным "
-                    "карнизом."
-                ),
-            },
-            {
-                "q": "Сколько стоят шторы для панорамного окна?",
-                "a": (
-                    "Стоимость зависит от ширины и высоты окна, типа ткани "
-                    "и карниза. Ориентировочно: тюль + блэкаут с обычным "
-                    "карнизом — от 1500 AED, с моторизированным — от 3000 AED "
-                    "за окно. Замер бесплатный."
-                ),
-            },
-        ],
-    },
-]
-
-# All blog articles for cross-links (slug -> label)
-ALL_BLOG_ARTICLES = [
-    ("blog-kak-vybrat-shtory-dubai", "Как выбрать шторы в Дубае"),
-    ("blog-blackout-shtory-plyusy-minusy", "Блэкаут шторы: плюсы и минусы"),
-    ("blog-motorizirovannye-shtory-stoit-li", "Моторизированные шторы — стоит ли?"),
-    ("blog-ukhod-za-shtorami-oae", "Уход за шторами в ОАЭ"),
-    ("blog-shtory-dlya-arendnoj-kvartiry-dubai", "Шторы для арендной квартиры"),
-    ("blog-zhalyuzi-ili-shtory-dubai", "Жалюзи или шторы: что выбрать"),
-    ("blog-karnizy-tipy-i-vybor", "Карнизы: типы и как выбрать"),
-    ("blog-shtory-dlya-panoramnykh-okon", "Шторы для панорамных окон"),
-]
-
-# Product → related blog articles (for cross-linking)
-PRODUCT_BLOG_RELATED = {
-    "blackout-shtory-dubai": [
-        ("blog-blackout-shtory-plyusy-minusy", "Блэкаут шторы: плюсы и минусы"),
-        ("blog-shtory-dlya-panoramnykh-okon", "Шторы для панорамных окон"),
-    ],
-    "tyul-na-zakaz-dubai": [
-        ("blog-kak-vybrat-shtory-dubai", "Как выбрать шторы в Дубае"),
-        ("blog-shtory-dlya-panoramnykh-okon", "Шторы для панорамных окон"),
-    ],
-    "motorizirovannye-shtory-dubai": [
-        ("blog-motorizirovannye-shtory-stoit-li", "Моторизированные шторы — стоит ли?"),
-        ("blog-shtory-dlya-panoramnykh-okon", "Шторы для панорамных окон"),
-    ],
-    "zhalyuzi-dubai": [
-        ("blog-zhalyuzi-ili-shtory-dubai", "Жалюзи или шторы: что выбрать"),
-        ("blog-shtory-dlya-arendnoj-kvartiry-dubai", "Шторы для арендной квартиры"),
-    ],
-    "karnizy-dubai": [
-        ("blog-karnizy-tipy-i-vybor", "Карнизы: типы и как выбрать"),
-        ("blog-motorizirovannye-shtory-stoit-li", "Моторизированные шторы — стоит ли?"),
-    ],
-}
+class FragmentCache:
+    """Per-build memo for HTML fragments shared between pages.
 
-# Blog → related product pages (for cross-linking)
-BLOG_PRODUCT_RELATED = {
-    "blog-kak-vybrat-shtory-dubai": [
-        ("blackout-shtory-dubai", "Блэкаут шторы"),
-        ("tyul-na-zakaz-dubai", "Тюль на заказ"),
-        ("zhalyuzi-dubai", "Жалюзи"),
-    ],
-    "blog-blackout-shtory-plyusy-minusy": [
-        ("blackout-shtory-dubai", "Блэкаут шторы"),
-        ("motorizirovannye-shtory-dubai", "Моторизированные шторы"),
-    ],
-    "blog-motorizirovannye-shtory-stoit-li": [
-        ("motorizirovannye-shtory-dubai", "Моторизированные шторы"),
-        ("karnizy-dubai", "Карнизы"),
-    ],
-    "blog-ukhod-za-shtorami-oae": [
-        ("tyul-na-zakaz-dubai", "Тюль на заказ"),
-        ("blackout-shtory-dubai", "Блэкаут шторы"),
-    ],
-    "blog-shtory-dlya-arendnoj-kvartiry-dubai": [
-        ("zhalyuzi-dubai", "Жалюзи"),
-        ("blackout-shtory-dubai", "Блэкаут шторы"),
-        ("tyul-na-zakaz-dubai", "Тюль на заказ"),
-    ],
-    "blog-zhalyuzi-ili-shtory-dubai": [
-        ("zhalyuzi-dubai", "Жалюзи"),
-        ("blackout-shtory-dubai", "Блэкаут шторы"),
-        ("tyul-na-zakaz-dubai", "Тюль на заказ"),
-    ],
-    "blog-karnizy-tipy-i-vybor": [
-        ("karnizy-dubai", "Карнизы"),
-        ("motorizirovannye-shtory-dubai", "Моторизированные шторы"),
-    ],
-    "blog-shtory-dlya-panoramnykh-okon": [
-        ("motorizirovannye-shtory-dubai", "Моторизированные шторы"),
-        ("blackout-shtory-dubai", "Блэкаут шторы"),
-        ("karnizy-dubai", "Карнизы"),
-    ],
-}
+    Fragments such as the footer or the full navigation list only depend on
+    the site-wide tables, so they are built once per build and reused;
+    ``clear()`` must be called whenever those tables may have changed.
+    """
 
+    def __init__(self):
+        self.clear()
 
-def build_nav_links_html(current_slug):
-    """Build the list of navigation links, excluding the current page."""
-    links = ['<li><a href="home.html">Главная</a></li>']
-    for slug, label in ALL_LANDING_PAGES:
-        if slug == current_slug:
-            links.append(f'<li><a href="{slug}.html" aria-current="page"><strong>{escape(label)}</strong></a></li>')
-        else:
-            links.append(f'<li><a href="{slug}.html">{escape(label)}</a></li>')
-    return "\n              ".join(links)
+    def clear(self):
+        self.store = {}
+        self.hits = 0
+        self.misses = 0
 
+    def get(self, key, build):
+        """Return the cached fragment for ``key``, calling ``build()`` on a miss."""
+        try:
+            value = self.store[key]
+        except KeyError:
+            self.misses += 1
+            value = self.store[key] = build()
+            return value
+        self.hits += 1
+        return value
 
-def build_faq_html(faq_items):
-    """Build the FAQ section HTML."""
-    items_html = []
-    for item in faq_items:
-        items_html.append(f"""          <details class="lp-faq__item">
-            <summary class="lp-faq__question">{escape(item["q"])}</summary>
-            <div class="lp-faq__answer">
-              <p>{escape(item["a"])}</p>
-            </div>
-          </details>""")
-    return "\n".join(items_html)
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.store)}
 
 
-def build_faq_schema(faq_items):
-    """Build the FAQPage JSON-LD schema."""
-    entities = []
-    for item in faq_items:
-        entities.append({
-            "@type": "Question",
-            "name": item["q"],
-            "acceptedAnswer": {
-                "@type": "Answer",
-                "text": item["a"],
-            },
-        })
-    schema = {
-        "@context": "https://schema.org",
-        "@type": "FAQPage",
-        "mainEntity": entities,
-    }
-    return json.dumps(schema, ensure_ascii=False, indent=2)
+FRAGMENTS = FragmentCache()
 
 
-def build_breadcrumb_schema(page):
-    """Build the BreadcrumbList JSON-LD schema."""
-    schema = {
-        "@context": "https://schema.org",
-        "@type": "BreadcrumbList",
-        "itemListElement": [
-            {
-                "@type": "ListItem",
-                "position": 1,
-                "name": "Главная",
-                "item": f"{BASE_URL}/",
-            },
-            {
-                "@type": "ListItem",
-                "position": 2,
-                "name": page["breadcrumb_name"],
-                "item": f"{BASE_URL}/{page['slug']}",
-            },
-        ],
+def warm_fragments():
+    """Build every site-wide fragment up front.
+
+    Called before worker processes are forked so each worker inherits the
+    finished fragments instead of rebuilding them.
+    """
+    build_footer_html()
+    build_nav_links_html(None)
+    build_cross_links(None)
+    matrix_hub_links()
+    related_tables()
+    search_shards()
+
+
+# ---------------------------------------------------------------------------
+# Content store
+# ---------------------------------------------------------------------------
+# Content lives in content/: one Markdown file per landing page (pages/) and
+# blog article (blog/), each starting with a JSON front-matter block between
+# "---" lines. index.json holds the page order, nav labels, blog topics and
+# the pinned related links; the optional matrix.json defines the
+# programmatic landing pages (see "Landing matrix" below). Entries are parsed lazily on demand and
+# the parsed form is snapshotted under .content-cache/, keyed by the source
+# file's mtime/size and SHA-256, so a rebuild only re-reads edited files.
+CONTENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "content")
+CONTENT_CACHE_DIR = ".content-cache"
+
+
+def parse_front_matter(text):
+    """Split a content file into its JSON front-matter dict and Markdown body."""
+    if not text.startswith("---\n"):
+        raise ValueError("content file must start with a '---' front-matter block")
+    end = text.index("\n---\n", 3)
+    return json.loads(text[4:end]), text[end + 5:]
+
+
+def parse_blocks(body):
+    """Yield ``(level, text)`` for each blank-line separated Markdown block.
+
+    ``level`` is the heading level for ``##``/``###`` headings and 0 for
+    paragraphs; wrapped paragraph lines are joined with a space.
+    """
+    for block in re.split(r"\n\s*\n", body.strip()):
+        text = " ".join(line.strip() for line in block.splitlines())
+        heading = re.match(r"(#{2,3}) (.+)", text)
+        if heading:
+            yield len(heading.group(1)), heading.group(2).strip()
+        elif text:
+            yield 0, text
+
+
+def parse_page(slug, text):
+    """Build a landing-page dict from its content file."""
+    page, body = parse_front_matter(text)
+    page["slug"] = slug
+    page["filename"] = f"{slug}.html"
+    page["content_paragraphs"] = [t for level, t in parse_blocks(body) if not level]
+    return page
+
+
+def parse_article(slug, text):
+    """Build a blog-article dict from its content file."""
+    article, body = parse_front_matter(text)
+    article["slug"] = slug
+    article["filename"] = f"{slug}.html"
+    sections = []
+    for level, text in parse_blocks(body):
+        if level:
+            sections.append({"heading": text, "level": level, "paragraphs": []})
+        elif sections:
+            sections[-1]["paragraphs"].append(text)
+        else:
+            raise ValueError(f"{slug}: paragraph before the first heading")
+    article["content_sections"] = sections
+    return article
+
+
+class ContentStore:
+    """Lazy, snapshot-backed access to the files under a content directory."""
+
+    PARSERS = {"pages": parse_page, "blog": parse_article}
+
+    def __init__(self, root, cache_dir=None):
+        self.root = root
+        self.cache_dir = cache_dir or os.path.join(os.path.dirname(root), CONTENT_CACHE_DIR)
+        self.stat_path = os.path.join(self.cache_dir, "stat.pickle")
+        self.stat_cache = None
+        self.stat_dirty = False
+
+    def path(self, kind, slug):
+        return os.path.join(self.root, kind, f"{slug}.md")
+
+    def load_index(self):
+        with open(os.path.join(self.root, "index.json"), encoding="utf-8") as f:
+            return json.load(f)
+
+    def load_matrix(self):
+        """Return the landing matrix definition, or None if there is none."""
+        try:
+            with open(os.path.join(self.root, "matrix.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def source_hash(self, kind, slug):
+        """SHA-256 of an entry's source file, re-read only if mtime/size changed."""
+        if self.stat_cache is None:
+            try:
+                with open(self.stat_path, "rb") as f:
+                    self.stat_cache = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                self.stat_cache = {}
+        path = self.path(kind, slug)
+        st = os.stat(path)
+        key = (kind, slug)
+        cached = self.stat_cache.get(key)
+        if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2]
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        self.stat_cache[key] = (st.st_mtime_ns, st.st_size, digest)
+        self.stat_dirty = True
+        return digest
+
+    def load(self, kind, slug):
+        """Return the parsed entry, from its snapshot when the source is unchanged."""
+        digest = self.source_hash(kind, slug)
+        snapshot = os.path.join(self.cache_dir, kind, f"{slug}.pickle")
+        try:
+            with open(snapshot, "rb") as f:
+                cached_digest, entry = pickle.load(f)
+            if cached_digest == digest:
+                return entry
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            pass
+        with open(self.path(kind, slug), encoding="utf-8") as f:
+            entry = self.PARSERS[kind](slug, f.read())
+        os.makedirs(os.path.dirname(snapshot), exist_ok=True)
+        tmp = f"{snapshot}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump((digest, entry), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, snapshot)
+        return entry
+
+    def save(self):
+        """Persist the mtime/size -> hash table for the next build."""
+        if not self.stat_dirty:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = f"{self.stat_path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(self.stat_cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.stat_path)
+        self.stat_dirty = False
+
+
+def use_content(root):
+    """Point the generator at a content directory and load its index tables."""
+    global STORE, ALL_LANDING_PAGES, ALL_BLOG_ARTICLES, BLOG_TOPICS
+    global PRODUCT_BLOG_PINS, BLOG_PRODUCT_PINS, MATRIX, MATRIX_CELLS
+    STORE = ContentStore(root)
+    index = STORE.load_index()
+    # All landing pages / blog articles for nav and cross-links (slug -> label)
+    ALL_LANDING_PAGES = [tuple(item) for item in index["landing_pages"]]
+    ALL_BLOG_ARTICLES = [tuple(item) for item in index["blog_articles"]]
+    # Blog topics (slug -> label); articles list theirs under "topics"
+    BLOG_TOPICS = [tuple(item) for item in index.get("blog_topics", [])]
+    # Pinned related links (see "Related content"): product -> blog
+    # articles, blog article -> product pages
+    PRODUCT_BLOG_PINS = {
+        slug: [tuple(item) for item in items]
+        for slug, items in index.get("product_blog_pins", {}).items()
+    }
+    BLOG_PRODUCT_PINS = {
+        slug: [tuple(item) for item in items]
+        for slug, items in index.get("blog_product_pins", {}).items()
     }
-    return json.dumps(schema, ensure_ascii=False, indent=2)
+    MATRIX = STORE.load_matrix()
+    MATRIX_CELLS = None
+    FRAGMENTS.clear()
 
 
-def build_content_html(paragraphs):
-    """Build the content paragraphs HTML."""
-    return "\n".join(
-        f"          <p>{escape(p)}</p>" for p in paragraphs
-    )
+def load_page(slug):
+    return STORE.load("pages", slug)
 
 
-def build_cross_links(current_slug):
-    """Build the cross-links section for related pages."""
-    links = []
-    for slug, label in ALL_LANDING_PAGES:
-        if slug != current_slug:
-            links.append(
-                f'          <li><a href="{slug}.html">{escape(label)}</a></li>'
-            )
-    return "\n".join(links)
+def load_article(slug):
+    return STORE.load("blog", slug)
 
 
-def build_blog_content_html(sections):
-    """Build the article content HTML from sections with h2/h3 headings."""
-    parts = []
-    for section in sections:
-        tag = f"h{section['level']}"
-        parts.append(f"    <{tag}>{escape(section['heading'])}</{tag}>")
-        for p in section["paragraphs"]:
-            parts.append(f"    <p>{escape(p)}</p>")
-    return "\n".join(parts)
+def iter_pages():
+    """Yield landing pages in index order, parsing each only when reached."""
+    for slug, _ in ALL_LANDING_PAGES:
+        yield load_page(slug)
 
 
-def build_article_schema(article):
-    """Build the Article JSON-LD schema."""
-    schema = {
-        "@context": "https://schema.org",
-        "@type": "Article",
-        "headline": article["h1"],
-        "description": article["description"],
-        "author": {
-            "@type": "Organization",
-            "name": "Curtains World",
-            "url": BASE_URL,
-        },
-        "publisher": {
-            "@type": "Organization",
-            "name": "Curtains World",
-            "url": BASE_URL,
-        },
-        "datePublished": article["date_published"],
-        "image": f"{BASE_URL}/assets/img_2024-02-07_14131410.webp",
-        "mainEntityOfPage": {
-            "@type": "WebPage",
-            "@id": f"{BASE_URL}/{article['slug']}",
-        },
-    }
-    return json.dumps(schema, ensure_ascii=False, indent=2)
+def iter_articles():
+    """Yield blog articles in index order, parsing each only when reached."""
+    for slug, _ in ALL_BLOG_ARTICLES:
+        yield load_article(slug)
 
 
-def build_blog_breadcrumb_schema(article):
-    """Build the BreadcrumbList JSON-LD schema for blog articles (3 levels)."""
-    schema = {
-        "@context": "https://schema.org",
-        "@type": "BreadcrumbList",
-        "itemListElement": [
-            {
-                "@type": "ListItem",
-                "position": 1,
-                "name": "Главная",
-                "item": f"{BASE_URL}/",
-            },
-            {
-                "@type": "ListItem",
-                "position": 2,
-                "name": "Блог",
-                "item": f"{BASE_URL}/blog",
-            },
-            {
-                "@type": "ListItem",
-                "position": 3,
-                "name": article["breadcrumb_name"],
-                "item": f"{BASE_URL}/{article['slug']}",
-            },
-        ],
+def __getattr__(name):
+    # PAGES / BLOG_ARTICLES used to be module-level lists; keep them
+    # available to importers, materialized only when asked for.
+    if name == "PAGES":
+        return list(iter_pages())
+    if name == "BLOG_ARTICLES":
+        return list(iter_articles())
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+use_content(CONTENT_DIR)
+
+
+# ---------------------------------------------------------------------------
+# Landing matrix
+# ---------------------------------------------------------------------------
+# matrix.json describes landing pages for every product x district x intent
+# combination compactly: each intent holds str.format templates for the page
+# fields, filled from the product's and district's forms ({name}, {name_lc},
+# {genitive}, {district}, {in}, {note}) plus {phone}. "overrides" maps a cell
+# slug to fields replacing the generated ones, or to {"skip": true} to drop
+# the cell. Only the slug -> indices table is built up front; page dicts are
+# expanded when a cell is rendered or fingerprinted.
+#
+# Each product's landing page is the hub of its cells and links to all of
+# them; a cell links to at most MATRIX_LINK_BUDGET neighbours, so every
+# cell is two clicks from the home page however large the matrix grows.
+MATRIX_LINK_BUDGET = 4
+
+
+def iter_matrix():
+    """Yield ``(slug, (product, district, intent))`` indices for every cell."""
+    if not MATRIX:
+        return
+    overrides = MATRIX.get("overrides", {})
+    for p, product in enumerate(MATRIX["products"]):
+        for d, district in enumerate(MATRIX["districts"]):
+            for i, intent in enumerate(MATRIX["intents"]):
+                slug = f"{product['stem']}-{district['slug']}-{intent['slug']}"
+                if not overrides.get(slug, {}).get("skip"):
+                    yield slug, (p, d, i)
+
+
+def matrix_cells():
+    """Slug -> indices for every matrix cell, in matrix order."""
+    global MATRIX_CELLS
+    if MATRIX_CELLS is None:
+        MATRIX_CELLS = dict(iter_matrix())
+    return MATRIX_CELLS
+
+
+def load_matrix_page(slug):
+    """Expand one matrix cell into a landing-page dict."""
+    p, d, i = matrix_cells()[slug]
+    product = MATRIX["products"][p]
+    district = MATRIX["districts"][d]
+    intent = MATRIX["intents"][i]
+    fields = {
+        "name": product["name"],
+        "name_lc": product["name_lc"],
+        "genitive": product["genitive"],
+        "district": district["name"],
+        "in": district["in"],
+        "note": district["note"],
+        "phone": PHONE,
     }
-    return json.dumps(schema, ensure_ascii=False, indent=2)
+    page = {
+        key: intent[key].format_map(fields)
+        for key in ("title", "h1", "description", "keywords", "breadcrumb_name")
+    }
+    page["content_paragraphs"] = [text.format_map(fields) for text in intent["content"]]
+    page["faq"] = [
+        {"q": item["q"].format_map(fields), "a": item["a"].format_map(fields)}
+        for item in intent["faq"]
+    ]
+    page.update(MATRIX.get("overrides", {}).get(slug, {}))
+    page["slug"] = slug
+    page["filename"] = f"{slug}.html"
+    page["product"] = product["page"]
+    return page
 
 
-def build_blog_cross_links(current_slug):
-    """Build the cross-links section for related blog articles."""
-    links = []
-    for slug, label in ALL_BLOG_ARTICLES:
-        if slug != current_slug:
-            links.append(
-                f'          <li><a href="{slug}.html">{escape(label)}</a></li>'
-            )
-    return "\n".join(links)
+def iter_matrix_pages():
+    """Yield matrix pages in matrix order, expanding each only when reached."""
+    for slug in matrix_cells():
+        yield load_matrix_page(slug)
 
 
-def build_related_blog_links(product_slug):
-    """Build links to related blog articles for a product page."""
-    articles = PRODUCT_BLOG_RELATED.get(product_slug, [])
-    if not articles:
-        return ""
-    links = []
-    for slug, label in articles:
-        links.append(
-            f'          <li><a href="{slug}.html">{escape(label)}</a></li>'
-        )
-    return "\n".join(links)
+def matrix_hub_links():
+    """Product page slug -> ``(slug, h1)`` of each of its cells, in matrix order."""
+    return FRAGMENTS.get("matrix_hubs", _build_matrix_hub_links)
 
 
-def build_related_product_links(blog_slug):
-    """Build links to related product pages for a blog article."""
-    products = BLOG_PRODUCT_RELATED.get(blog_slug, [])
-    if not products:
-        return ""
-    links = []
-    for slug, label in products:
-        links.append(
-            f'          <li><a href="{slug}.html">{escape(label)}</a></li>'
-        )
-    return "\n".join(links)
+def _build_matrix_hub_links():
+    hubs = {}
+    for slug, (p, _, _) in matrix_cells().items():
+        hubs.setdefault(MATRIX["products"][p]["page"], []).append((slug, load_matrix_page(slug)["h1"]))
+    return hubs
 
 
-def build_footer_html():
-    """Build the shared footer HTML used by both product and blog pages."""
-    blog_links = "\n".join(
-        f'          <li><a href="{slug}.html">{escape(label)}</a></li>'
-        for slug, label in ALL_BLOG_ARTICLES
-    )
-    return f"""  <!-- Footer -->
-  <footer class="lp-footer">
-    <div class="lp-footer__inner">
-      <div class="lp-footer__col">
-        <h3>Curtains World</h3>
-        <p>Шторы и занавески на заказ<br>в Дубае из натуральных тканей</p>
-      </div>
-      <div class="lp-footer__col">
-        <h3>Контакты</h3>
-        <p>
-          <a href="{PHONE_LINK}">{PHONE}</a><br>
-          <a href="mailto:{EMAIL}">{EMAIL}</a><br>
-          Warehouse 174 Jaddaf, Dubai
-        </p>
-      </div>
-      <div class="lp-footer__col">
-        <h3>Каталог</h3>
-        <ul>
-          <li><a href="home.html">Главная</a></li>
-          <li><a href="blackout-shtory-dubai.html">Блэкаут шторы</a></li>
-          <li><a href="tyul-na-zakaz-dubai.html">Тюль на заказ</a></li>
-          <li><a href="motorizirovannye-shtory-dubai.html">Моторизированные шторы</a></li>
-          <li><a href="zhalyuzi-dubai.html">Жалюзи</a></li>
-          <li><a href="karnizy-dubai.html">Карнизы</a></li>
-        </ul>
-        <h3 style="margin-top:16px;">Блог</h3>
-        <ul>
-{blog_links}
-        </ul>
-      </div>
-    </div>
-    <div class="lp-footer__bottom">
-      &copy; 2024 Curtains World. Все права защищены.
-    </div>
-  </footer>"""
+def matrix_neighbour_links(slug):
+    """``(slug, h1)`` of up to MATRIX_LINK_BUDGET cells near a matrix cell.
 
+    The product's other intents in the same district come first, then the
+    same intent in the districts that follow in matrix order.
+    """
+    cells = matrix_cells()
+    p, d, i = cells[slug]
+    by_index = FRAGMENTS.get("matrix_index", lambda: {index: s for s, index in cells.items()})
+    districts, intents = len(MATRIX["districts"]), len(MATRIX["intents"])
+    near = [(p, d, j) for j in range(intents) if j != i]
+    near += [(p, (d + k) % districts, i) for k in range(1, districts)]
+    picked = [by_index[index] for index in near if index in by_index][:MATRIX_LINK_BUDGET]
+    labels = dict(matrix_hub_links()[MATRIX["products"][p]["page"]])
+    return [(s, labels[s]) for s in picked]
 
-def generate_blog_article(article):
-    """Generate the complete HTML for a blog article page."""
 
-    nav_links = build_nav_links_html(article["slug"])
-    content_html = build_blog_content_html(article["content_sections"])
-    article_schema = build_article_schema(article)
-    breadcrumb_schema = build_blog_breadcrumb_schema(article)
-    faq_html = build_faq_html(article["faq"])
-    faq_schema = build_faq_schema(article["faq"])
-    cross_links = build_blog_cross_links(article["slug"])
-    related_product_links = build_related_product_links(article["slug"])
-    footer_html = build_footer_html()
-
-    html = f"""<!DOCTYPE html>
-<html lang="ru">
-<head>
-  <meta charset="utf-8">
-  <meta name="viewport" content="width=device-width, initial-scale=1.0">
-  <title>{escape(article["title"])}</title>
-  <link rel="canonical" href="{BASE_URL}/{article['slug']}">
-  <meta name="description" content="{escape(article["description"])}">
-  <meta name="keywords" content="{escape(article["keywords"])}">
+def area_links(slug):
+    """Matrix links of a landing page: all cells of a hub, a cell's neighbours."""
+    if slug in matrix_cells():
+        return matrix_neighbour_links(slug)
+    return matrix_hub_links().get(slug, [])
 
-  <!-- Open Graph -->
-  <meta property="og:title" content="{escape(article["title"])}">
-  <meta property="og:description" content="{escape(article["description"])}">
-  <meta property="og:type" content="article">
-  <meta property="og:site_name" content="Curtains World">
-  <meta property="og:url" content="{BASE_URL}/{article['slug']}">
-  <meta property="og:image" content="{BASE_URL}/assets/img_2024-02-07_14131410.webp">
-  <meta property="og:image:width" content="1200">
-  <meta property="og:image:height" content="630">
-  <meta property="og:image:type" content="image/webp">
-  <meta property="og:locale" content="ru_RU">
-  <meta property="article:published_time" content="{article['date_published']}">
 
-  <!-- Twitter Card -->
-  <meta name="twitter:card" content="summary_large_image">
-  <meta name="twitter:title" content="{escape(article["title"])}">
-  <meta name="twitter:description" content="{escape(article["description"])}">
-  <meta name="twitter:image" content="{BASE_URL}/assets/img_2024-02-07_14131410.webp">
+# ---------------------------------------------------------------------------
+# Related content
+# ---------------------------------------------------------------------------
+# Landing pages link to related blog articles, and articles to related
+# landing pages and to other articles. The links are computed: every entry
+# becomes a TF-IDF vector over the stemmed terms (ru_text.terms) of its
+# title, headings, paragraphs and FAQ, and each page takes its nearest
+# neighbours by cosine similarity, scored against only the pages it shares a
+# term with (similarities()). Pins from index.json ("product_blog_pins",
+# "blog_product_pins") come first and the neighbours fill the remaining
+# slots; an article's list of other articles ends with the RECENT_LINKS
+# newest ones. Every list has a fixed length, so page size does not grow
+# with the number of articles: the complete lists live on the blog listings.
+# Term counts, which the search index shares, are cached in
+# .content-cache/terms.pickle by source hash, so a rebuild tokenizes only
+# edited entries; the finished tables are kept in related.pickle and reused
+# while no entry or pin changed.
+TERMS_CACHE_FILE = "terms.pickle"
+TERMS_VERSION = 1  # bump when entry_terms() changes
+RELATED_CACHE_FILE = "related.pickle"
+RELATED_VERSION = 2  # bump when the scoring changes
+RELATED_LIMITS = {"product_blog": 2, "blog_product": 3, "blog_blog": 3}
+RECENT_LINKS = 2  # newest articles listed after an article's related ones
+TITLE_WEIGHT = 3  # title and h1 terms count this many times
+
+
+def entry_terms(entry):
+    """Term counts of a landing page or blog article."""
+    texts = [entry["title"], entry["h1"]] * TITLE_WEIGHT
+    texts += [entry["description"], entry.get("keywords", "")]
+    texts += entry.get("content_paragraphs", [])
+    for section in entry.get("content_sections", []):
+        texts.append(section["heading"])
+        texts += section["paragraphs"]
+    for item in entry.get("faq", []):
+        texts += [item["q"], item["a"]]
+    counts = {}
+    for term in ru_text.terms(" ".join(texts)):
+        counts[term] = counts.get(term, 0) + 1
+    return counts
+
+
+def tfidf_vectors(counts):
+    """L2-normalized TF-IDF vectors (term -> weight) for a list of term counts.
+
+    Term frequency is sublinear (1 + log tf) so a word repeated throughout
+    one article does not drown out the rest; idf is smoothed.
+    """
+    df = {}
+    for doc in counts:
+        for term in doc:
+            df[term] = df.get(term, 0) + 1
+    n = len(counts)
+    idf = {term: math.log((1 + n) / (1 + d)) + 1 for term, d in df.items()}
+    vectors = []
+    for doc in counts:
+        vec = {term: (1 + math.log(tf)) * idf[term] for term, tf in doc.items()}
+        norm = math.sqrt(sum(w * w for w in vec.values())) or 1.0
+        vectors.append({term: w / norm for term, w in vec.items()})
+    return vectors
+
+
+def similarities(rows, cols):
+    """Cosine similarity matrix ``rows x cols`` of normalized sparse vectors.
+
+    The columns are inverted into term -> ``(column, weight)`` postings, so
+    each row only visits the columns it shares a term with: the work grows
+    with the overlapping terms, never with pages x vocabulary.
+    """
+    postings = {}
+    for j, col in enumerate(cols):
+        for term, w in col.items():
+            postings.setdefault(term, []).append((j, w))
+    matrix = []
+    for row in rows:
+        scores = [0.0] * len(cols)
+        for term, w in row.items():
+            for j, cw in postings.get(term, ()):
+                scores[j] += w * cw
+        matrix.append(scores)
+    return matrix
+
+
+def nearest(scores, k):
+    """Column indices of the ``k`` best scores, ties broken by index order."""
+    ranked = sorted(range(len(scores)), key=lambda j: (-round(scores[j], 9), j))
+    return [j for j in ranked[:k] if scores[j] > 0]
+
+
+def load_cache(path, version):
+    """Load a pickled cache dict, or None if it is missing or outdated."""
+    try:
+        with open(path, "rb") as f:
+            cache = pickle.load(f)
+        if cache.get("version") == version:
+            return cache
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        pass
+    return None
+
+
+def save_cache(path, cache):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def entry_hashes():
+    """``(kind, slug)`` -> source hash of every landing page and article, in index order."""
+    docs = [("pages", slug) for slug, _ in ALL_LANDING_PAGES]
+    docs += [("blog", slug) for slug, _ in ALL_BLOG_ARTICLES]
+    return {doc: STORE.source_hash(*doc) for doc in docs}
+
+
+def per_entry(filename, version, docs, extract):
+    """Map each ``(kind, slug)`` of ``docs`` to ``extract(entry)``.
+
+    ``docs`` maps entries to their source hashes. Results are cached in
+    ``filename`` under the content cache by source hash, so only entries
+    that changed are loaded; bump ``version`` when ``extract`` changes.
+    """
+    path = os.path.join(STORE.cache_dir, filename)
+    cached = (load_cache(path, version) or {}).get("entries", {})
+    entries = {}
+    for doc, digest in docs.items():
+        entry = cached.get(doc)
+        entries[doc] = entry if entry and entry[0] == digest else (digest, extract(STORE.load(*doc)))
+    if entries != cached:
+        save_cache(path, {"version": version, "entries": entries})
+    return {doc: value for doc, (_, value) in entries.items()}
+
+
+def term_counts():
+    """``(kind, slug)`` -> entry_terms() of every landing page and article."""
+    return FRAGMENTS.get("term_counts", lambda: per_entry(
+        TERMS_CACHE_FILE, TERMS_VERSION, entry_hashes(), entry_terms,
+    ))
+
+
+def related_tables():
+    """``{"product_blog": {slug: [(slug, label)]}, "blog_product": {...}, "blog_blog": {...}}``."""
+    return FRAGMENTS.get("related", _build_related_tables)
+
+
+def _build_related_tables():
+    hashes = entry_hashes()
+    pins = {"product_blog": PRODUCT_BLOG_PINS, "blog_product": BLOG_PRODUCT_PINS, "blog_blog": {}}
+    key = fingerprint(
+        [[*doc, digest] for doc, digest in hashes.items()],
+        {name: {slug: [s for s, _ in items] for slug, items in table.items()} for name, table in pins.items()},
+        RELATED_LIMITS, RECENT_LINKS, TITLE_WEIGHT, TERMS_VERSION,
+    )
+    path = os.path.join(STORE.cache_dir, RELATED_CACHE_FILE)
+    cache = load_cache(path, RELATED_VERSION)
+    if cache and cache["key"] == key:
+        return cache["tables"]
+
+    counts = term_counts()
+    products = [doc for doc in hashes if doc[0] == "pages"]
+    articles = [doc for doc in hashes if doc[0] == "blog"]
+    vectors = dict(zip(counts, tfidf_vectors(list(counts.values()))))
+    article_vectors = [vectors[doc] for doc in articles]
+    scores = similarities([vectors[doc] for doc in products], article_vectors)
+
+    labels = {"product_blog": dict(ALL_BLOG_ARTICLES), "blog_product": dict(ALL_LANDING_PAGES),
+              "blog_blog": dict(ALL_BLOG_ARTICLES)}
+    tables = {name: {} for name in RELATED_LIMITS}
+    for name, sources, targets, matrix in (
+        ("product_blog", products, articles, scores),
+        ("blog_product", articles, products, [list(col) for col in zip(*scores)]),
+        ("blog_blog", articles, articles, similarities(article_vectors, article_vectors)),
+    ):
+        for (_, slug), row in zip(sources, matrix):
+            links = list(pins[name].get(slug, []))
+            taken = {slug} | {s for s, _ in links}
+            limit = max(RELATED_LIMITS[name], len(links))
+            for j in nearest(row, limit + len(taken)):
+                target = targets[j][1]
+                if len(links) < limit and target not in taken:
+                    links.append((target, labels[name][target]))
+            tables[name][slug] = links
+
+    # Index order is publication order: the newest articles come last.
+    newest = [slug for _, slug in reversed(articles)]
+    for slug, links in tables["blog_blog"].items():
+        taken = {slug} | {s for s, _ in links}
+        links += [(s, labels["blog_blog"][s]) for s in newest if s not in taken][:RECENT_LINKS]
+
+    save_cache(path, {"version": RELATED_VERSION, "key": key, "tables": tables})
+    return tables
+
+
+def related_links(table, slug):
+    """``(slug, label)`` pairs ``slug`` links to in ``table``, pins first."""
+    return related_tables()[table].get(slug, [])
 
-  <!-- Geo -->
-  <meta name="geo.region" content="AE-DU">
-  <meta name="geo.placename" content="Dubai">
-  <meta name="geo.position" content="25.2048;55.2708">
-  <meta name="ICBM" content="25.2048, 55.2708">
 
-  <!-- Verification -->
+# ---------------------------------------------------------------------------
+# Site search
+# ---------------------------------------------------------------------------
+# blog.html has a search box backed by a static inverted index over the
+# landing pages and blog articles, built from the same term counts as the
+# related links. search/index.json lists the documents (slug and label) and
+# the shards with a hash of each for cache busting. A shard holds the terms
+# of one prefix in sorted order, front-coded like a flattened trie ("s" is
+# the length shared with the previous term, "t" the rest), each with
+# delta-encoded [doc, weight] postings: flat lists of small integers. A
+# shard starts as every term of one first letter and is split by longer
+# prefixes while it is over SEARCH_SHARD_BYTES, so shards stay small as
+# content grows and assets/search.js fetches only those a query falls into.
+SEARCH_DIR = "search"
+SEARCH_META = f"{SEARCH_DIR}/index.json"
+SEARCH_SHARD_BYTES = 4 * 1024
+SEARCH_MAX_PREFIX = 4
+
+
+def search_postings():
+    """Sorted ``(term, [(doc, weight)])`` pairs; docs number the entries in index order."""
+    index = {}
+    for doc, counts in enumerate(term_counts().values()):
+        for term, tf in counts.items():
+            index.setdefault(term, []).append((doc, round(10 * (1 + math.log(tf)))))
+    return sorted(index.items())
+
+
+def encode_search_shard(entries):
+    """Serialize ``(term, postings)`` pairs, front-coded and delta-encoded."""
+    shared, rest, postings = [], [], []
+    previous = ""
+    for term, docs in entries:
+        n = len(os.path.commonprefix([previous, term]))
+        shared.append(n)
+        rest.append(term[n:])
+        flat, last = [], 0
+        for doc, weight in docs:
+            flat += [doc - last, weight]
+            last = doc
+        postings.append(flat)
+        previous = term
+    return to_json_ld({"s": shared, "t": rest, "p": postings}).encode("utf-8")
+
+
+def search_shard_file(prefix):
+    return f"{SEARCH_DIR}/{prefix.encode('utf-8').hex()}.json"
+
+
+def search_shards():
+    """Prefix -> encoded shard, planned once per build."""
+    return FRAGMENTS.get("search_shards", _plan_search_shards)
+
+
+def _plan_search_shards():
+    shards = {}
+
+    def place(entries, length):
+        for prefix, group in itertools.groupby(entries, key=lambda e: e[0][:length]):
+            group = list(group)
+            data = encode_search_shard(group)
+            if len(data) > SEARCH_SHARD_BYTES and length < SEARCH_MAX_PREFIX and len(group) > 1:
+                place(group, length + 1)
+            else:
+                shards[prefix] = data
+
+    place(search_postings(), 1)
+    return shards
+
+
+def generate_search_meta():
+    """Generate search/index.json: documents and shard versions."""
+    return to_json_ld({
+        "docs": [list(item) for item in ALL_LANDING_PAGES + ALL_BLOG_ARTICLES],
+        "shards": {
+            prefix: hashlib.sha256(data).hexdigest()[:8]
+            for prefix, data in sorted(search_shards().items())
+        },
+    }).encode("utf-8")
 
 
+def stream_search_meta():
+    yield generate_search_meta()
 
-  <!-- Favicon -->
-  <link rel="icon" href="favicon.ico" type="image/x-icon">
-  <link rel="apple-touch-icon" href="apple-touch-icon.png">
-  <meta name="theme-color" content="#1a1a2e">
 
-  <!-- CSS -->
-  <link href="assets/tilda-grid-3.0.min.css" rel="stylesheet">
-  <link href="assets/fonts.css" rel="stylesheet">
-  <link href="assets/tilda-forms-1.0.min.css" rel="stylesheet" media="print" onload="this.media='all'">
+def generate_search_shard(prefix):
+    return search_shards()[prefix]
 
-  <!-- Structured Data: BreadcrumbList -->
-  <script type="application/ld+json">
-{breadcrumb_schema}
-  </script>
 
-  <!-- Structured Data: Article -->
-  <script type="application/ld+json">
-{article_schema}
-  </script>
+def stream_search_shard(prefix):
+    yield generate_search_shard(prefix)
 
-  <!-- Structured Data: FAQPage -->
-  <script type="application/ld+json">
-{faq_schema}
-  </script>
 
+# ---------------------------------------------------------------------------
+# Page fragments
+# ---------------------------------------------------------------------------
+def drop_line(block, line):
+    """Remove one line from a newline-joined block of list items."""
+    return ("\n" + block + "\n").replace("\n" + line + "\n", "\n", 1)[1:-1]
 
-  <style>
-    /* ===== Reset & Base ===== */
-    *, *::before, *::after {{ box-sizing: border-box; margin: 0; padding: 0; }}
-    html {{ scroll-behavior: smooth; }}
-    body {{
-      font-family: 'Montserrat', Arial, sans-serif;
-      color: #333;
-      line-height: 1.6;
-      background: #fff;
-      -webkit-font-smoothing: antialiased;
-    }}
-    a {{ color: #4e7a55; text-decoration: none; transition: color .2s; }}
-    a:hover {{ color: #3a5f40; }}
-    img {{ max-width: 100%; height: auto; }}
 
-    /* ===== Header ===== */
-    .lp-header {{
-      position: sticky; top: 0; z-index: 100;
-      background: #fff;
-      border-bottom: 1px solid #eee;
-      padding: 0 20px;
-    }}
-    .lp-header__inner {{
-      max-width: 1200px; margin: 0 auto;
-      display: flex; align-items: center; justify-content: space-between;
-      min-height: 64px;
-    }}
-    .lp-header__logo {{
-      font-family: 'Montserrat', Arial, sans-serif;
-      font-size: 22px; font-weight: 700; color: #333;
-    }}
-    .lp-header__logo a {{ color: inherit; }}
-    .lp-header__cta {{
-      display: inline-block;
-      padding: 10px 24px;
-      background: #536b58;
-      color: #fff;
-      border-radius: 5px;
-      font-family: 'Montserrat', Arial, sans-serif;
-      font-size: 14px; font-weight: 700;
-      text-transform: uppercase;
-      letter-spacing: 0.02em;
-      transition: background .2s;
-    }}
-    .lp-header__cta:hover {{ background: #4e7a55; color: #fff; }}
+def iter_lines(lines):
+    """Lazy ``"\\n".join(lines)``: yield each line with its separator."""
+    sep = ""
+    for line in lines:
+        yield sep + line
+        sep = "\n"
 
-    /* ===== Navigation ===== */
-    .lp-nav {{ background: #fafaf8; border-bottom: 1px solid #eee; }}
-    .lp-nav__inner {{
-      max-width: 1200px; margin: 0 auto; padding: 0 20px;
-    }}
-    .lp-nav ul {{
-      list-style: none; display: flex; flex-wrap: wrap; gap: 0;
-    }}
-    .lp-nav li a {{
-      display: block; padding: 12px 16px;
-      font-size: 14px; font-weight: 600; color: #333;
-      transition: color .2s, background .2s;
-    }}
-    .lp-nav li a:hover {{ color: #4e7a55; background: #f0ede8; }}
-    .lp-nav li a[aria-current="page"] {{ color: #4e7a55; }}
 
-    /* ===== Hero ===== */
-    .lp-hero {{
-      background: linear-gradient(135deg, #f8f2e9 0%, #e8e0d5 100%);
-      padding: 60px 20px 50px;
-      text-align: center;
-    }}
-    .lp-hero__inner {{ max-width: 800px; margin: 0 auto; }}
-    .lp-hero h1 {{
-      font-family: 'Montserrat', Arial, sans-serif;
-      font-size: 36px; font-weight: 700; color: #333;
-      margin-bottom: 16px; line-height: 1.25;
-    }}
-    .lp-hero__subtitle {{
-      font-size: 18px; color: #555; margin-bottom: 28px; line-height: 1.5;
-    }}
+def link_item(slug, label):
+    """Render one ``<li>`` link as used by the related and footer lists."""
+    return f'          <li><a href="{slug}.html">{escape(label)}</a></li>'
 
-    /* ===== Breadcrumb ===== */
-    .lp-breadcrumb {{
-      max-width: 1200px; margin: 0 auto; padding: 16px 20px;
-      font-size: 13px; color: #767676;
-    }}
-    .lp-breadcrumb a {{ color: #4e7a55; text-decoration: underline; }}
-    .lp-breadcrumb span {{ margin: 0 6px; }}
 
-    /* ===== Article content ===== */
-    .lp-article {{
-      max-width: 800px; margin: 0 auto;
-      padding: 40px 20px 50px;
-    }}
-    .lp-article h2 {{
-      font-family: 'Montserrat', Arial, sans-serif;
-      font-size: 26px; font-weight: 700; color: #333;
-      margin: 36px 0 16px;
-      line-height: 1.3;
-    }}
-    .lp-article h2:first-child {{ margin-top: 0; }}
-    .lp-article h3 {{
-      font-family: 'Montserrat', Arial, sans-serif;
-      font-size: 20px; font-weight: 600; color: #444;
-      margin: 28px 0 12px;
-      line-height: 1.3;
-    }}
-    .lp-article p {{
-      font-size: 16px; color: #444; margin-bottom: 16px;
-      font-family: 'Ubuntu', 'Montserrat', Arial, sans-serif;
-      line-height: 1.7;
-    }}
+def _build_landing_links():
+    return "\n".join(link_item(slug, label) for slug, label in ALL_LANDING_PAGES)
 
-    /* ===== CTA Banner ===== */
-    .lp-cta-banner {{
-      background: #4e7a55; color: #fff;
-      padding: 50px 20px; text-align: center;
-    }}
-    .lp-cta-banner__inner {{ max-width: 700px; margin: 0 auto; }}
-    .lp-cta-banner h2 {{
-      font-size: 28px; font-weight: 700; margin-bottom: 12px; color: #fff;
-    }}
-    .lp-cta-banner p {{
-      font-size: 16px; margin-bottom: 24px; color: #fff;
-    }}
-    .lp-cta-banner__btn {{
-      display: inline-block;
-      padding: 14px 36px;
-      background: #fff; color: #4e7a55;
-      border-radius: 8px;
-      font-size: 16px; font-weight: 700;
-      transition: background .2s, transform .15s;
-    }}
-    .lp-cta-banner__btn:hover {{ background: #f0f0f0; color: #3a5f40; transform: translateY(-1px); }}
 
-    /* ===== FAQ ===== */
-    .lp-faq {{
-      max-width: 800px; margin: 0 auto;
-      padding: 50px 20px 60px;
-    }}
-    .lp-faq h2 {{
-      font-family: 'Montserrat', Arial, sans-serif;
-      font-size: 28px; font-weight: 700; color: #333;
-      margin-bottom: 24px; text-align: center;
-    }}
-    .lp-faq__item {{
-      border-bottom: 1px solid #e0e0e0;
-    }}
-    .lp-faq__question {{
-      padding: 18px 40px 18px 0;
-      font-size: 16px; font-weight: 600; color: #333;
-      cursor: pointer; position: relative;
-      list-style: none;
-      font-family: 'Montserrat', Arial, sans-serif;
-    }}
-    .lp-faq__question::-webkit-details-marker {{ display: none; }}
-    .lp-faq__question::after {{
-      content: '+'; position: absolute; right: 0; top: 50%;
-      transform: translateY(-50%);
-      font-size: 22px; font-weight: 300; color: #4e7a55;
-      transition: transform .2s;
-    }}
-    details[open] .lp-faq__question::after {{
-      content: '\\2212';
-    }}
-    .lp-faq__answer {{
-      padding: 0 0 18px;
-      font-family: 'Ubuntu', 'Montserrat', Arial, sans-serif;
-    }}
-    .lp-faq__answer p {{ font-size: 15px; color: #555; line-height: 1.6; }}
+def _build_labels():
+    return dict(ALL_LANDING_PAGES)
 
-    /* ===== Cross-links ===== */
-    .lp-related {{
-      background: #fafaf8; padding: 40px 20px;
-    }}
-    .lp-related__inner {{
-      max-width: 800px; margin: 0 auto;
-    }}
-    .lp-related h2 {{
-      font-family: 'Montserrat', Arial, sans-serif;
-      font-size: 22px; font-weight: 700; color: #333;
-      margin-bottom: 16px;
-    }}
-    .lp-related ul {{ list-style: none; display: flex; flex-wrap: wrap; gap: 10px; }}
-    .lp-related li a {{
-      display: inline-block;
-      padding: 8px 20px;
-      background: #fff;
-      border: 1px solid #ddd;
-      border-radius: 20px;
-      font-size: 14px; font-weight: 600; color: #333;
-      transition: border-color .2s, color .2s;
-    }}
-    .lp-related li a:hover {{ border-color: #4e7a55; color: #4e7a55; }}
 
-    /* ===== Footer ===== */
-    .lp-footer {{
-      background: #333; color: #ccc; padding: 40px 20px;
-    }}
-    .lp-footer__inner {{
-      max-width: 1200px; margin: 0 auto;
-      display: flex; flex-wrap: wrap; gap: 40px;
-      justify-content: space-between;
-    }}
-    .lp-footer__col {{ flex: 1; min-width: 200px; }}
-    .lp-footer__col h3 {{
-      font-size: 16px; font-weight: 700; color: #fff;
-      margin-bottom: 12px;
-      font-family: 'Montserrat', Arial, sans-serif;
-    }}
-    .lp-footer__col p, .lp-footer__col a {{
-      font-size: 14px; color: #aaa; line-height: 1.8;
-    }}
-    .lp-footer__col a:hover {{ color: #fff; }}
-    .lp-footer__col ul {{ list-style: none; }}
-    .lp-footer__col ul li a {{
-      display: block; padding: 2px 0;
-      font-size: 14px; color: #aaa;
-    }}
-    .lp-footer__col ul li a:hover {{ color: #fff; }}
-    .lp-footer__bottom {{
-      max-width: 1200px; margin: 24px auto 0;
-      padding-top: 20px; border-top: 1px solid #555;
-      font-size: 13px; color: #aaa; text-align: center;
-    }}
+def _build_nav_items():
+    """Plain and current-page variants of every nav item, keyed by slug."""
+    return {
+        slug: (
+            f'<li><a href="{slug}.html">{escape(label)}</a></li>',
+            f'<li><a href="{slug}.html" aria-current="page"><strong>{escape(label)}</strong></a></li>',
+        )
+        for slug, label in ALL_LANDING_PAGES
+    }
 
-    /* ===== WhatsApp Button ===== */
-    .wa-float {{
-      position: fixed; bottom: 20px; right: 20px; z-index: 9999;
-      width: 60px; height: 60px; border-radius: 50%;
-      background: #25D366;
-      display: flex; align-items: center; justify-content: center;
-      box-shadow: 0 4px 12px rgba(0,0,0,.25);
-      cursor: pointer; transition: transform .2s;
-    }}
-    .wa-float:hover {{ transform: scale(1.1); }}
-    .wa-float svg {{ width: 32px; height: 32px; fill: #fff; }}
 
-    /* ===== Responsive ===== */
-    @media (max-width: 768px) {{
-      .lp-hero h1 {{ font-size: 28px; }}
-      .lp-hero__subtitle {{ font-size: 16px; }}
-      .lp-article h2, .lp-faq h2, .lp-cta-banner h2 {{ font-size: 24px; }}
-      .lp-article h3 {{ font-size: 18px; }}
-      .lp-header__cta {{ padding: 8px 16px; font-size: 12px; }}
-      .lp-nav ul {{ flex-direction: column; }}
-      .lp-nav li a {{ padding: 10px 16px; border-bottom: 1px solid #eee; }}
-      .lp-footer__inner {{ flex-direction: column; gap: 24px; }}
-    }}
-    @media (max-width: 480px) {{
-      .lp-hero {{ padding: 40px 16px 36px; }}
-      .lp-hero h1 {{ font-size: 24px; }}
-      .lp-article {{ padding: 30px 16px 40px; }}
-      .lp-faq {{ padding: 30px 16px 40px; }}
-      .lp-related {{ padding: 30px 16px; }}
-    }}
-    @media (min-width: 960px) {{
-      .wa-float {{ bottom: 30px; right: 30px; }}
-    }}
-  </style>
-</head>
-<body>
-  <!-- Header -->
-  <header class="lp-header">
-    <div class="lp-header__inner">
-      <div class="lp-header__logo"><a href="home.html">Curtains World</a></div>
-      <a href="{WA_LINK}" target="_blank" rel="noopener" class="lp-header__cta">
-        Бесплатный замер
-      </a>
-    </div>
-  </header>
+def _build_nav_base():
+    """Navigation list with no item marked as the current page."""
+    links = ['<li><a href="home.html">Главная</a></li>']
+    links.extend(plain for plain, _ in FRAGMENTS.get("nav_items", _build_nav_items).values())
+    return "\n              ".join(links)
 
-  <!-- Navigation -->
-  <nav class="lp-nav" aria-label="Каталог">
-    <div class="lp-nav__inner">
-      <ul>
-        {nav_links}
-      </ul>
-    </div>
-  </nav>
 
-  <!-- Breadcrumb -->
-  <div class="lp-breadcrumb" aria-label="Хлебные крошки">
-    <a href="home.html">Главная</a>
-    <span>/</span>
-    <a href="blog.html">Блог</a>
-    <span>/</span>
-    {escape(article["breadcrumb_name"])}
-  </div>
+def build_nav_links_html(current_slug):
+    """Build the list of navigation links, marking the current page."""
+    base = FRAGMENTS.get("nav", _build_nav_base)
+    items = FRAGMENTS.get("nav_items", _build_nav_items)
+    if current_slug not in items:
+        return base
+    plain, current = items[current_slug]
+    return base.replace(plain, current, 1)
 
-  <!-- Hero -->
-  <section class="lp-hero">
-    <div class="lp-hero__inner">
-      <h1>{escape(article["h1"])}</h1>
-      <p class="lp-hero__subtitle">{escape(article["description"])}</p>
-    </div>
-  </section>
 
-  <!-- Article -->
-  <article class="lp-article">
-{content_html}
-  </article>
+def build_faq_items(faq_items):
+    """Yield the HTML of each FAQ item."""
+    for item in faq_items:
+        yield f"""          <details class="lp-faq__item">
+            <summary class="lp-faq__question">{escape(item["q"])}</summary>
+            <div class="lp-faq__answer">
+              <p>{escape(item["a"])}</p>
+            </div>
+          </details>"""
 
-  <!-- CTA Banner -->
-  <section class="lp-cta-banner">
-    <div class="lp-cta-banner__inner">
-      <h2>Закажите бесплатный замер</h2>
-      <p>Наш специалист приедет в удобное время, снимет размеры и поможет подобрать ткань. Замер, доставка и установка бесплатно.</p>
-      <a href="{WA_LINK}" target="_blank" rel="noopener" class="lp-cta-banner__btn">
-        Написать в WhatsApp
-      </a>
-      <p style="margin-top:16px; margin-bottom:0; font-size:14px;">
-        Или позвоните: <a href="{PHONE_LINK}" style="color:#fff; text-decoration:underline;">{PHONE}</a>
-      </p>
-    </div>
-  </section>
 
-  <!-- FAQ -->
-  <section class="lp-faq">
-    <h2>Часто задаваемые вопросы</h2>
-{faq_html}
-  </section>
+def build_faq_html(faq_items):
+    """Build the FAQ section HTML."""
+    return "\n".join(build_faq_items(faq_items))
 
-  <!-- Related articles -->
-  <section class="lp-related">
-    <div class="lp-related__inner">
-      <h2>Читайте также</h2>
-      <ul>
-{cross_links}
-      </ul>
-    </div>
-  </section>
 
-  <!-- Related products -->
-  <section class="lp-related" style="padding-top:0;">
-    <div class="lp-related__inner">
-      <h2>Наши услуги</h2>
-      <ul>
-{related_product_links}
-      </ul>
-    </div>
-  </section>
+# Structured data ------------------------------------------------------------
+# Each page carries a single JSON-LD document: one compact @graph holding
+# the page's own nodes (breadcrumbs, FAQ, article, ...) and the site-wide
+# Organization and LocalBusiness, which page nodes reference by @id. The
+# shared nodes are serialized once per build and spliced into every page.
+ORGANIZATION_ID = f"{BASE_URL}/#organization"
+BUSINESS_ID = f"{BASE_URL}/#business"
 
-{footer_html}
 
+def to_json_ld(node):
+    """Serialize one schema.org node without indentation."""
+    return json.dumps(node, ensure_ascii=False, separators=(",", ":"))
 
-  <!-- WhatsApp Float Button -->
-  <a href="{WA_LINK}" target="_blank" rel="noopener" class="wa-float" aria-label="Написать в WhatsApp">
-    <svg viewBox="0 0 24 24"><path d="M17.472 14.382c-.297-.149-1.758-.867-2.03-.967-.273-.099-.471-.148-.67.15-.197.297-.767.966-.94 1.164-.173.199-.347.223-.644.075-.297-.15-1.255-.463-2.39-1.475-.883-.788-1.48-1.761-1.653-2.059-.173-.297-.018-.458.13-.606.134-.133.298-.347.446-.52.149-.174.198-.298.298-.497.099-.198.05-.371-.025-.52-.075-.149-.669-1.612-.916-2.207-.242-.579-.487-.5-.669-.51-.173-.008-.371-.01-.57-.01-.198 0-.52.074-.792.372-.272.297-1.04 1.016-1.04 2.479 0 1.462 1.065 2.875 1.213 3.074.149.198 2.096 3.2 5.077 4.487.709.306 1.262.489 1.694.625.712.227 1.36.195 1.871.118.571-.085 1.758-.719 2.006-1.413.248-.694.248-1.289.173-1.413-.074-.124-.272-.198-.57-.347m-5.421 7.403h-.004a9.87 9.87 0 01-5.031-1.378l-.361-.214-3.741.982.998-3.648-.235-.374a9.86 9.86 0 01-1.51-5.26c.001-5.45 4.436-9.884 9.888-9.884 2.64 0 5.122 1.03 6.988 2.898a9.825 9.825 0 012.893 6.994c-.003 5.45-4.437 9.884-9.885 9.884m8.413-18.297A11.815 11.815 0 0012.05 0C5.495 0 .16 5.335.157 11.892c0 2.096.547 4.142 1.588 5.945L.057 24l6.305-1.654a11.882 11.882 0 005.683 1.448h.005c6.554 0 11.89-5.335 11.893-11.893a11.821 11.821 0 00-3.48-8.413z"/></svg>
-  </a>
 
-  <!-- UTM Capture -->
-  <script>
-  (function(){{
-    var p=new URLSearchParams(window.location.search);
-    var utms=['utm_source','utm_medium','utm_campaign','utm_term','utm_content'];
-    var d={{}};
-    utms.forEach(function(k){{var v=p.get(k);if(v)d[k]=v;}});
-    if(Object.keys(d).length>0){{
-      try{{sessionStorage.setItem('utms',JSON.stringify(d));}}catch(e){{}}
-    }}
-  }})();
-  </script>
-</body>
-</html>"""
+def json_ld_graph(*nodes):
+    """Combine serialized nodes into one ``@graph`` document."""
+    return '{"@context":"https://schema.org","@graph":[' + ",".join(nodes) + "]}"
 
-    return html
 
+def build_organization_node():
+    """The Organization that publishes the site, serialized once per build."""
+    return FRAGMENTS.get("organization_node", lambda: to_json_ld({
+        "@type": "Organization",
+        "@id": ORGANIZATION_ID,
+        "name": "Curtains World",
+        "url": f"{BASE_URL}/",
+        "email": EMAIL,
+        "telephone": PHONE_LINK[len("tel:"):],
+    }))
 
-def generate_page(page):
-    """Generate the complete HTML for a landing page."""
 
-    nav_links = build_nav_links_html(page["slug"])
-    faq_html = build_faq_html(page["faq"])
-    faq_schema = build_faq_schema(page["faq"])
-    breadcrumb_schema = build_breadcrumb_schema(page)
-    content_html = build_content_html(page["content_paragraphs"])
-    cross_links = build_cross_links(page["slug"])
-    related_blog_links = build_related_blog_links(page["slug"])
-    footer_html = build_footer_html()
+def build_business_node():
+    """The showroom as a LocalBusiness, serialized once per build."""
+    return FRAGMENTS.get("business_node", lambda: to_json_ld({
+        "@type": "LocalBusiness",
+        "@id": BUSINESS_ID,
+        "name": "Curtains World",
+        "description": (
+            "Шторы, тюль, жалюзи и карнизы на заказ в Дубае: "
+            "бесплатный замер, пошив и установка."
+        ),
+        "url": f"{BASE_URL}/",
+        "image": f"{BASE_URL}/{HERO_IMAGE}",
+        "telephone": PHONE_LINK[len("tel:"):],
+        "email": EMAIL,
+        "parentOrganization": {"@id": ORGANIZATION_ID},
+        "address": {
+            "@type": "PostalAddress",
+            "streetAddress": "Warehouse 174 Jaddaf",
+            "addressLocality": "Dubai",
+            "addressRegion": "Dubai",
+            "addressCountry": "AE",
+        },
+        "geo": {
+            "@type": "GeoCoordinates",
+            "latitude": 25.2048,
+            "longitude": 55.2708,
+        },
+        "priceRange": "$$",
+        "openingHours": "Mo-Sa 09:00-18:00",
+        "aggregateRating": {
+            "@type": "AggregateRating",
+            "ratingValue": "4.8",
+            "bestRating": "5",
+            "ratingCount": "50",
+        },
+    }))
 
-    html = f"""<!DOCTYPE html>
-<html lang="ru">
-<head>
-  <meta charset="utf-8">
-  <meta name="viewport" content="width=device-width, initial-scale=1.0">
-  <title>{escape(page["title"])}</title>
-  <link rel="canonical" href="{BASE_URL}/{page['slug']}">
-  <meta name="description" content="{escape(page["description"])}">
-  <meta name="keywords" content="{escape(page["keywords"])}">
 
-  <!-- Open Graph -->
-  <meta property="og:title" content="{escape(page["title"])}">
-  <meta property="og:description" content="{escape(page["description"])}">
-  <meta property="og:type" content="website">
-  <meta property="og:site_name" content="Curtains World">
-  <meta property="og:url" content="{BASE_URL}/{page['slug']}">
-  <meta property="og:image" content="{BASE_URL}/assets/img_2024-02-07_14131410.webp">
-  <meta property="og:image:width" content="1200">
-  <meta property="og:image:height" content="630">
-  <meta property="og:image:type" content="image/webp">
-  <meta property="og:locale" content="ru_RU">
+def build_breadcrumb_node(url, trail):
+    """BreadcrumbList for ``url``: Главная, then each ``(name, url)`` of ``trail``."""
+    items = [("Главная", f"{BASE_URL}/")] + trail
+    return to_json_ld({
+        "@type": "BreadcrumbList",
+        "@id": f"{url}#breadcrumb",
+        "itemListElement": [
+            {"@type": "ListItem", "position": i, "name": name, "item": item}
+            for i, (name, item) in enumerate(items, 1)
+        ],
+    })
 
-  <!-- Twitter Card -->
-  <meta name="twitter:card" content="summary_large_image">
-  <meta name="twitter:title" content="{escape(page["title"])}">
-  <meta name="twitter:description" content="{escape(page["description"])}">
-  <meta name="twitter:image" content="{BASE_URL}/assets/img_2024-02-07_14131410.webp">
 
-  <!-- Geo -->
-  <meta name="geo.region" content="AE-DU">
-  <meta name="geo.placename" content="Dubai">
-  <meta name="geo.position" content="25.2048;55.2708">
-  <meta name="ICBM" content="25.2048, 55.2708">
+def build_faq_node(faq_items, url, **page):
+    """The page itself as an FAQPage; ``page`` adds name, description, about, ..."""
+    return to_json_ld({
+        "@type": "FAQPage",
+        "@id": url,
+        "url": url,
+        **page,
+        "breadcrumb": {"@id": f"{url}#breadcrumb"},
+        "mainEntity": [
+            {
+                "@type": "Question",
+                "name": item["q"],
+                "acceptedAnswer": {"@type": "Answer", "text": item["a"]},
+            }
+            for item in faq_items
+        ],
+    })
 
-  <!-- Verification -->
 
+def build_landing_schema(page):
+    """JSON-LD graph of a landing page."""
+    url = f"{BASE_URL}/{page['slug']}"
+    return json_ld_graph(
+        build_breadcrumb_node(url, [(page["breadcrumb_name"], url)]),
+        build_faq_node(
+            page["faq"], url, name=page["h1"], description=page["description"],
+            about={"@id": BUSINESS_ID},
+        ),
+        build_business_node(),
+        build_organization_node(),
+    )
 
 
-  <!-- Favicon -->
-  <link rel="icon" href="favicon.ico" type="image/x-icon">
-  <link rel="apple-touch-icon" href="apple-touch-icon.png">
-  <meta name="theme-color" content="#1a1a2e">
+def build_article_schema(article):
+    """JSON-LD graph of a blog article."""
+    url = f"{BASE_URL}/{article['slug']}"
+    return json_ld_graph(
+        build_breadcrumb_node(url, [("Блог", f"{BASE_URL}/blog"), (article["breadcrumb_name"], url)]),
+        to_json_ld({
+            "@type": "Article",
+            "@id": f"{url}#article",
+            "headline": article["h1"],
+            "description": article["description"],
+            "author": {"@id": ORGANIZATION_ID},
+            "publisher": {"@id": ORGANIZATION_ID},
+            "datePublished": article["date_published"],
+            "dateModified": article.get("date_modified") or article["date_published"],
+            "image": f"{BASE_URL}/{HERO_IMAGE}",
+            "mainEntityOfPage": {"@id": url},
+        }),
+        build_faq_node(article["faq"], url, name=article["h1"]),
+        build_organization_node(),
+    )
 
-  <!-- CSS -->
-  <link href="assets/tilda-grid-3.0.min.css" rel="stylesheet">
-  <link href="assets/fonts.css" rel="stylesheet">
-  <link href="assets/tilda-forms-1.0.min.css" rel="stylesheet" media="print" onload="this.media='all'">
 
-  <!-- Structured Data: BreadcrumbList -->
-  <script type="application/ld+json">
-{breadcrumb_schema}
-  </script>
+def build_blog_index_schema(url, name, description, trail):
+    """JSON-LD graph of a blog listing page; ``trail`` follows Главная."""
+    return json_ld_graph(
+        build_breadcrumb_node(url, trail),
+        to_json_ld({
+            "@type": "CollectionPage",
+            "@id": url,
+            "url": url,
+            "name": name,
+            "description": description,
+            "breadcrumb": {"@id": f"{url}#breadcrumb"},
+            "publisher": {"@id": ORGANIZATION_ID},
+        }),
+        build_organization_node(),
+    )
 
-  <!-- Structured Data: FAQPage -->
-  <script type="application/ld+json">
-{faq_schema}
-  </script>
 
-  <!-- Structured Data: LocalBusiness -->
-  <script type="application/ld+json">
-{{
-  "@context": "https://schema.org",
-  "@type": "LocalBusiness",
-  "name": "Curtains World",
-  "description": "{escape(page["description"])}",
-  "telephone": "+971589408100",
-  "email": "{EMAIL}",
-  "address": {{
-    "@type": "PostalAddress",
-    "streetAddress": "Warehouse 174 Jaddaf",
-    "addressLocality": "Dubai",
-    "addressRegion": "Dubai",
-    "addressCountry": "AE"
-  }},
-  "geo": {{
-    "@type": "GeoCoordinates",
-    "latitude": 25.2048,
-    "longitude": 55.2708
-  }},
-  "priceRange": "$$",
-  "openingHours": "Mo-Sa 09:00-18:00",
-  "url": "{BASE_URL}/{page['slug']}",
-  "aggregateRating": {{
-    "@type": "AggregateRating",
-    "ratingValue": "4.8",
-    "bestRating": "5",
-    "ratingCount": "50"
-  }}
-}}
-  </script>
+def build_content_items(paragraphs):
+    """Yield the HTML of each content paragraph."""
+    for p in paragraphs:
+        yield f"          <p>{escape(p)}</p>"
 
 
-  <style>
-    /* ===== Reset & Base ===== */
-    *, *::before, *::after {{ box-sizing: border-box; margin: 0; padding: 0; }}
-    html {{ scroll-behavior: smooth; }}
-    body {{
-      font-family: 'Montserrat', Arial, sans-serif;
-      color: #333;
-      line-height: 1.6;
-      background: #fff;
-      -webkit-font-smoothing: antialiased;
-    }}
-    a {{ color: #4e7a55; text-decoration: none; transition: color .2s; }}
-    a:hover {{ color: #3a5f40; }}
-    img {{ max-width: 100%; height: auto; }}
+def build_content_html(paragraphs):
+    """Build the content paragraphs HTML."""
+    return "\n".join(build_content_items(paragraphs))
 
-    /* ===== Header ===== */
-    .lp-header {{
-      position: sticky; top: 0; z-index: 100;
-      background: #fff;
-      border-bottom: 1px solid #eee;
-      padding: 0 20px;
-    }}
-    .lp-header__inner {{
-      max-width: 1200px; margin: 0 auto;
-      display: flex; align-items: center; justify-content: space-between;
-      min-height: 64px;
-    }}
-    .lp-header__logo {{
-      font-family: 'Montserrat', Arial, sans-serif;
-      font-size: 22px; font-weight: 700; color: #333;
-    }}
-    .lp-header__logo a {{ color: inherit; }}
-    .lp-header__cta {{
-      display: inline-block;
-      padding: 10px 24px;
-      background: #536b58;
-      color: #fff;
-      border-radius: 5px;
-      font-family: 'Montserrat', Arial, sans-serif;
-      font-size: 14px; font-weight: 700;
-      text-transform: uppercase;
-      letter-spacing: 0.02em;
-      transition: background .2s;
-    }}
-    .lp-header__cta:hover {{ background: #4e7a55; color: #fff; }}
 
-    /* Mobile menu toggle */
-    .lp-header__menu-btn {{
-      display: none; background: none; border: none; cursor: pointer;
-      width: 28px; height: 20px; position: relative;
-    }}
-    .lp-header__menu-btn span {{
-      display: block; position: absolute; width: 100%; height: 3px;
-      background: #536b58; left: 0; transition: .25s;
-    }}
-    .lp-header__menu-btn span:nth-child(1) {{ top: 0; }}
-    .lp-header__menu-btn span:nth-child(2) {{ top: 8px; }}
-    .lp-header__menu-btn span:nth-child(3) {{ top: 16px; }}
+def build_cross_links(current_slug):
+    """Build the cross-links section for related pages."""
+    base = FRAGMENTS.get("landing_links", _build_landing_links)
+    labels = FRAGMENTS.get("labels", _build_labels)
+    if current_slug not in labels:
+        return base
+    return drop_line(base, link_item(current_slug, labels[current_slug]))
 
-    /* ===== Navigation ===== */
-    .lp-nav {{ background: #fafaf8; border-bottom: 1px solid #eee; }}
-    .lp-nav__inner {{
-      max-width: 1200px; margin: 0 auto; padding: 0 20px;
-    }}
-    .lp-nav ul {{
-      list-style: none; display: flex; flex-wrap: wrap; gap: 0;
-    }}
-    .lp-nav li a {{
-      display: block; padding: 12px 16px;
-      font-size: 14px; font-weight: 600; color: #333;
-      transition: color .2s, background .2s;
-    }}
-    .lp-nav li a:hover {{ color: #4e7a55; background: #f0ede8; }}
-    .lp-nav li a[aria-current="page"] {{ color: #4e7a55; }}
 
-    /* ===== Hero ===== */
-    .lp-hero {{
-      background: linear-gradient(135deg, #f8f2e9 0%, #e8e0d5 100%);
-      padding: 60px 20px 50px;
-      text-align: center;
-    }}
-    .lp-hero__inner {{ max-width: 800px; margin: 0 auto; }}
-    .lp-hero h1 {{
-      font-family: 'Montserrat', Arial, sans-serif;
-      font-size: 36px; font-weight: 700; color: #333;
-      margin-bottom: 16px; line-height: 1.25;
-    }}
-    .lp-hero__subtitle {{
-      font-size: 18px; color: #555; margin-bottom: 28px; line-height: 1.5;
-    }}
-    .lp-hero__cta {{
-      display: inline-block;
-      padding: 14px 36px;
-      background: #4e7a55;
-      color: #fff;
-      border-radius: 8px;
-      font-size: 16px; font-weight: 700;
-      text-transform: uppercase;
-      transition: background .2s, transform .15s;
-    }}
-    .lp-hero__cta:hover {{ background: #3a5f40; color: #fff; transform: translateY(-1px); }}
+def build_area_links(slug):
+    """Section linking a product's matrix cells, or a cell's neighbours; may be empty."""
+    links = area_links(slug)
+    if not links:
+        return ""
+    heading = "Смотрите также" if slug in matrix_cells() else "По районам Дубая"
+    items = "\n".join(link_item(s, label) for s, label in links)
+    return f"""
+
+  <!-- District pages -->
+  <section class="lp-related" style="padding-top:0;">
+    <div class="lp-related__inner">
+      <h2>{heading}</h2>
+      <ul>
+{items}
+      </ul>
+    </div>
+  </section>"""
+
+
+def build_blog_content_items(sections):
+    """Yield the article's headings and paragraphs as HTML lines."""
+    for section in sections:
+        tag = f"h{section['level']}"
+        yield f"    <{tag}>{escape(section['heading'])}</{tag}>"
+        for p in section["paragraphs"]:
+            yield f"    <p>{escape(p)}</p>"
+
+
+def build_blog_content_html(sections):
+    """Build the article content HTML from sections with h2/h3 headings."""
+    return "\n".join(build_blog_content_items(sections))
+
+
+def build_blog_cross_links(current_slug):
+    """Build the cross-links section: related articles, then the newest."""
+    return "\n".join(link_item(slug, label) for slug, label in related_links("blog_blog", current_slug))
+
+
+def build_related_blog_links(product_slug):
+    """Build links to related blog articles for a product page."""
+    articles = related_links("product_blog", product_slug)
+    if not articles:
+        return ""
+    return "\n".join(link_item(slug, label) for slug, label in articles)
+
+
+def build_related_product_links(blog_slug):
+    """Build links to related product pages for a blog article."""
+    products = related_links("blog_product", blog_slug)
+    if not products:
+        return ""
+    return "\n".join(link_item(slug, label) for slug, label in products)
+
+
+def build_footer_html():
+    """Build the shared footer HTML used by both product and blog pages."""
+    return FRAGMENTS.get("footer", _build_footer_html)
+
+
+def _build_footer_html():
+    blog_links = "\n".join(
+        [link_item("blog", "Все статьи")] + [link_item(stem, label) for stem, label in blog_topic_links()]
+    )
+    return f"""  <!-- Footer -->
+  <footer class="lp-footer">
+    <div class="lp-footer__inner">
+      <div class="lp-footer__col">
+        <h3>Curtains World</h3>
+        <p>Шторы и занавески на заказ<br>в Дубае из натуральных тканей</p>
+      </div>
+      <div class="lp-footer__col">
+        <h3>Контакты</h3>
+        <p>
+          <a href="{PHONE_LINK}">{PHONE}</a><br>
+          <a href="mailto:{EMAIL}">{EMAIL}</a><br>
+          Warehouse 174 Jaddaf, Dubai
+        </p>
+      </div>
+      <div class="lp-footer__col">
+        <h3>Каталог</h3>
+        <ul>
+          <li><a href="home.html">Главная</a></li>
+          <li><a href="blackout-shtory-dubai.html">Блэкаут шторы</a></li>
+          <li><a href="tyul-na-zakaz-dubai.html">Тюль на заказ</a></li>
+          <li><a href="motorizirovannye-shtory-dubai.html">Моторизированные шторы</a></li>
+          <li><a href="zhalyuzi-dubai.html">Жалюзи</a></li>
+          <li><a href="karnizy-dubai.html">Карнизы</a></li>
+        </ul>
+        <h3 style="margin-top:16px;">Блог</h3>
+        <ul>
+{blog_links}
+        </ul>
+      </div>
+    </div>
+    <div class="lp-footer__bottom">
+      &copy; 2024 Curtains World. Все права защищены.
+    </div>
+  </footer>"""
+
+
+# ---------------------------------------------------------------------------
+# Layouts
+# ---------------------------------------------------------------------------
+class Layout:
+    """A template pre-compiled into static byte segments and named slots.
+
+    ``{{name}}`` in the source marks a slot. ``bind`` fills slots ahead of
+    time -- with another Layout (spliced in, its slots included) or a string
+    -- and folds the result into the static segments, so a page type is
+    compiled once at import. ``render`` is then a single ``bytes.join`` of
+    the cached segments and the few per-page values.
+    """
+
+    SLOT_RE = re.compile(r"\{\{(\w+)\}\}")
+
+    def __init__(self, source=""):
+        parts = self.SLOT_RE.split(source)
+        self.segments = [p.encode("utf-8") for p in parts[0::2]]
+        self.slots = parts[1::2]
+
+    @classmethod
+    def from_parts(cls, segments, slots):
+        layout = cls()
+        layout.segments = segments
+        layout.slots = slots
+        return layout
+
+    def bind(self, **values):
+        """Return a new Layout with the given slots filled in."""
+        segments = [self.segments[0]]
+        slots = []
+        for name, segment in zip(self.slots, self.segments[1:]):
+            value = values.get(name)
+            if value is None:
+                slots.append(name)
+                segments.append(segment)
+                continue
+            if isinstance(value, str):
+                value = Layout.from_parts([value.encode("utf-8")], [])
+            segments[-1] += value.segments[0]
+            slots.extend(value.slots)
+            segments.extend(value.segments[1:])
+            segments[-1] += segment
+        return Layout.from_parts(segments, slots)
+
+    def stream(self, **values):
+        """Yield the document as encoded chunks instead of one joined string.
+
+        A slot value may be a string or an iterable of strings, such as a
+        generator building a long section item by item. Nothing is joined,
+        so memory stays bounded by the largest single chunk.
+        """
+        missing = set(self.slots) - values.keys()
+        if missing:
+            raise KeyError(f"unfilled layout slots: {', '.join(sorted(missing))}")
+        yield self.segments[0]
+        for name, segment in zip(self.slots, self.segments[1:]):
+            value = values[name]
+            if isinstance(value, str):
+                yield self.encode(name, value)
+            else:
+                for chunk in value:
+                    yield self.encode(name, chunk)
+            yield segment
+
+    def render(self, **values):
+        """Join the static segments with the encoded slot values."""
+        encoded = {name: self.encode(name, value) for name, value in values.items()}
+        missing = set(self.slots) - encoded.keys()
+        if missing:
+            raise KeyError(f"unfilled layout slots: {', '.join(sorted(missing))}")
+        parts = [self.segments[0]]
+        for name, segment in zip(self.slots, self.segments[1:]):
+            parts.append(encoded[name])
+            parts.append(segment)
+        return b"".join(parts)
+
+    def encode(self, name, value):
+        """Encode one slot value (or one chunk of it) for output."""
+        return value.encode("utf-8")
+
+    @functools.cached_property
+    def minified(self):
+        """This layout as minified HTML; see MinifiedLayout."""
+        return MinifiedLayout(self)
+
+
+class MinifiedLayout(Layout):
+    """A page layout that renders minified HTML.
+
+    The static segments are minified once, here, so at render time only
+    the slot values go through ``minify_html`` -- and not even those
+    inside ``<script>``, which are JSON-LD that ``to_json_ld`` already
+    writes compact. Chunks of a streamed value are minified one by one.
+    ``saved`` totals the bytes minification dropped in this process.
+    """
+
+    saved = 0
+
+    def __init__(self, layout):
+        self.segments = [minify_html(s) for s in layout.segments]
+        self.slots = layout.slots
+        self.static_saved = sum(map(len, layout.segments)) - sum(map(len, self.segments))
+        self.raw_slots = set()
+        in_script = False
+        for name, segment in zip(layout.slots, layout.segments):
+            opened, closed = segment.rfind(b"<script"), segment.rfind(b"</script>")
+            if opened != closed:
+                in_script = opened > closed
+            if in_script:
+                self.raw_slots.add(name)
+
+    def encode(self, name, value):
+        if name in self.raw_slots or not ("\n" in value or "  " in value or "<" in value):
+            return value.encode("utf-8")  # nothing to minify: a URL, title, JSON-LD...
+        minified, size = minify_fragment(value)
+        MinifiedLayout.saved += size - len(minified)
+        return minified
+
+    def stream(self, **values):
+        MinifiedLayout.saved += self.static_saved
+        return super().stream(**values)
+
+    def render(self, **values):
+        MinifiedLayout.saved += self.static_saved
+        return super().render(**values)
+
+
+def page_layout(layout):
+    """The layout to render a page with: its minified form under ``--minify``."""
+    return layout.minified if MINIFY else layout
+
+
+def compile_layout(**parts):
+    """Specialize the base layout for a page type and bind site constants."""
+    layout = Layout(asset_refs(BASE_TEMPLATE)).bind(
+        **{name: Layout(asset_refs(source)) for name, source in parts.items()}
+    )
+    return layout.bind(
+        base_url=BASE_URL, wa_link=WA_LINK, phone=PHONE,
+        phone_link=PHONE_LINK, email=EMAIL, stylesheet=STYLESHEET_HREF,
+    )
+
+
+BASE_TEMPLATE = """<!DOCTYPE html>
+<html lang="ru">
+<head>
+  <meta charset="utf-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+  <title>{{title}}</title>
+  <link rel="canonical" href="{{canonical}}">
+  <meta name="description" content="{{description}}">
+  <meta name="keywords" content="{{keywords}}">
+
+  <!-- Open Graph -->
+  <meta property="og:title" content="{{title}}">
+  <meta property="og:description" content="{{og_description}}">
+  <meta property="og:type" content="{{og_type}}">
+  <meta property="og:site_name" content="Curtains World">
+  <meta property="og:url" content="{{canonical}}">
+  <meta property="og:image" content="{{base_url}}/assets/img_2024-02-07_14131410.webp">
+  <meta property="og:image:width" content="1200">
+  <meta property="og:image:height" content="630">
+  <meta property="og:image:type" content="image/webp">
+  <meta property="og:locale" content="ru_RU">{{og_extra}}
 
-    /* ===== Breadcrumb ===== */
-    .lp-breadcrumb {{
-      max-width: 1200px; margin: 0 auto; padding: 16px 20px;
-      font-size: 13px; color: #767676;
-    }}
-    .lp-breadcrumb a {{ color: #4e7a55; text-decoration: underline; }}
-    .lp-breadcrumb span {{ margin: 0 6px; }}
+  <!-- Twitter Card -->
+  <meta name="twitter:card" content="summary_large_image">
+  <meta name="twitter:title" content="{{title}}">
+  <meta name="twitter:description" content="{{og_description}}">
+  <meta name="twitter:image" content="{{base_url}}/assets/img_2024-02-07_14131410.webp">
 
-    /* ===== Content ===== */
-    .lp-content {{
-      max-width: 800px; margin: 0 auto;
-      padding: 40px 20px 50px;
-    }}
-    .lp-content h2 {{
-      font-family: 'Montserrat', Arial, sans-serif;
-      font-size: 28px; font-weight: 700; color: #333;
-      margin-bottom: 20px;
-    }}
-    .lp-content p {{
-      font-size: 16px; color: #444; margin-bottom: 18px;
-      font-family: 'Ubuntu', 'Montserrat', Arial, sans-serif;
-    }}
+  <!-- Geo -->
+  <meta name="geo.region" content="AE-DU">
+  <meta name="geo.placename" content="Dubai">
+  <meta name="geo.position" content="25.2048;55.2708">
+  <meta name="ICBM" content="25.2048, 55.2708">
 
-    /* ===== CTA Banner ===== */
-    .lp-cta-banner {{
-      background: #4e7a55; color: #fff;
-      padding: 50px 20px; text-align: center;
-    }}
-    .lp-cta-banner__inner {{ max-width: 700px; margin: 0 auto; }}
-    .lp-cta-banner h2 {{
-      font-size: 28px; font-weight: 700; margin-bottom: 12px; color: #fff;
-    }}
-    .lp-cta-banner p {{
-      font-size: 16px; margin-bottom: 24px; color: #fff;
-    }}
-    .lp-cta-banner__btn {{
-      display: inline-block;
-      padding: 14px 36px;
-      background: #fff; color: #4e7a55;
-      border-radius: 8px;
-      font-size: 16px; font-weight: 700;
-      transition: background .2s, transform .15s;
-    }}
-    .lp-cta-banner__btn:hover {{ background: #f0f0f0; color: #3a5f40; transform: translateY(-1px); }}
+  <!-- Verification -->
 
-    /* ===== FAQ ===== */
-    .lp-faq {{
-      max-width: 800px; margin: 0 auto;
-      padding: 50px 20px 60px;
-    }}
-    .lp-faq h2 {{
-      font-family: 'Montserrat', Arial, sans-serif;
-      font-size: 28px; font-weight: 700; color: #333;
-      margin-bottom: 24px; text-align: center;
-    }}
-    .lp-faq__item {{
-      border-bottom: 1px solid #e0e0e0;
-    }}
-    .lp-faq__question {{
-      padding: 18px 40px 18px 0;
-      font-size: 16px; font-weight: 600; color: #333;
-      cursor: pointer; position: relative;
-      list-style: none;
-      font-family: 'Montserrat', Arial, sans-serif;
-    }}
-    .lp-faq__question::-webkit-details-marker {{ display: none; }}
-    .lp-faq__question::after {{
-      content: '+'; position: absolute; right: 0; top: 50%;
-      transform: translateY(-50%);
-      font-size: 22px; font-weight: 300; color: #4e7a55;
-      transition: transform .2s;
-    }}
-    details[open] .lp-faq__question::after {{
-      content: '\\2212'; /* minus sign */
-    }}
-    .lp-faq__answer {{
-      padding: 0 0 18px;
-      font-family: 'Ubuntu', 'Montserrat', Arial, sans-serif;
-    }}
-    .lp-faq__answer p {{ font-size: 15px; color: #555; line-height: 1.6; }}
 
-    /* ===== Cross-links ===== */
-    .lp-related {{
-      background: #fafaf8; padding: 40px 20px;
-    }}
-    .lp-related__inner {{
-      max-width: 800px; margin: 0 auto;
-    }}
-    .lp-related h2 {{
-      font-family: 'Montserrat', Arial, sans-serif;
-      font-size: 22px; font-weight: 700; color: #333;
-      margin-bottom: 16px;
-    }}
-    .lp-related ul {{ list-style: none; display: flex; flex-wrap: wrap; gap: 10px; }}
-    .lp-related li a {{
-      display: inline-block;
-      padding: 8px 20px;
-      background: #fff;
-      border: 1px solid #ddd;
-      border-radius: 20px;
-      font-size: 14px; font-weight: 600; color: #333;
-      transition: border-color .2s, color .2s;
-    }}
-    .lp-related li a:hover {{ border-color: #4e7a55; color: #4e7a55; }}
 
-    /* ===== Footer ===== */
-    .lp-footer {{
-      background: #333; color: #ccc; padding: 40px 20px;
-    }}
-    .lp-footer__inner {{
-      max-width: 1200px; margin: 0 auto;
-      display: flex; flex-wrap: wrap; gap: 40px;
-      justify-content: space-between;
-    }}
-    .lp-footer__col {{ flex: 1; min-width: 200px; }}
-    .lp-footer__col h3 {{
-      font-size: 16px; font-weight: 700; color: #fff;
-      margin-bottom: 12px;
-      font-family: 'Montserrat', Arial, sans-serif;
-    }}
-    .lp-footer__col p, .lp-footer__col a {{
-      font-size: 14px; color: #aaa; line-height: 1.8;
-    }}
-    .lp-footer__col a:hover {{ color: #fff; }}
-    .lp-footer__col ul {{ list-style: none; }}
-    .lp-footer__col ul li a {{
-      display: block; padding: 2px 0;
-      font-size: 14px; color: #aaa;
-    }}
-    .lp-footer__col ul li a:hover {{ color: #fff; }}
-    .lp-footer__bottom {{
-      max-width: 1200px; margin: 24px auto 0;
-      padding-top: 20px; border-top: 1px solid #555;
-      font-size: 13px; color: #aaa; text-align: center;
-    }}
+  <!-- Favicon -->
+  <link rel="icon" href="favicon.ico" type="image/x-icon">
+  <link rel="apple-touch-icon" href="apple-touch-icon.png">
+  <meta name="theme-color" content="#1a1a2e">
 
-    /* ===== WhatsApp Button ===== */
-    .wa-float {{
-      position: fixed; bottom: 20px; right: 20px; z-index: 9999;
-      width: 60px; height: 60px; border-radius: 50%;
-      background: #25D366;
-      display: flex; align-items: center; justify-content: center;
-      box-shadow: 0 4px 12px rgba(0,0,0,.25);
-      cursor: pointer; transition: transform .2s;
-    }}
-    .wa-float:hover {{ transform: scale(1.1); }}
-    .wa-float svg {{ width: 32px; height: 32px; fill: #fff; }}
+  <!-- CSS -->
+  <link href="assets/tilda-grid-3.0.min.css" rel="stylesheet">
+  <link href="assets/fonts.css" rel="stylesheet">
+  <link href="assets/tilda-forms-1.0.min.css" rel="stylesheet" media="print" onload="this.media='all'">
+  <link href="{{stylesheet}}" rel="stylesheet" media="print" onload="this.media='all'">
+  <noscript><link href="{{stylesheet}}" rel="stylesheet"></noscript>
 
-    /* ===== Responsive ===== */
-    @media (max-width: 768px) {{
-      .lp-hero h1 {{ font-size: 28px; }}
-      .lp-hero__subtitle {{ font-size: 16px; }}
-      .lp-content h2, .lp-faq h2, .lp-cta-banner h2 {{ font-size: 24px; }}
-      .lp-header__cta {{ padding: 8px 16px; font-size: 12px; }}
-      .lp-nav ul {{ flex-direction: column; }}
-      .lp-nav li a {{ padding: 10px 16px; border-bottom: 1px solid #eee; }}
-      .lp-footer__inner {{ flex-direction: column; gap: 24px; }}
-    }}
-    @media (max-width: 480px) {{
-      .lp-hero {{ padding: 40px 16px 36px; }}
-      .lp-hero h1 {{ font-size: 24px; }}
-      .lp-content {{ padding: 30px 16px 40px; }}
-      .lp-faq {{ padding: 30px 16px 40px; }}
-      .lp-related {{ padding: 30px 16px; }}
-    }}
-    @media (min-width: 960px) {{
-      .wa-float {{ bottom: 30px; right: 30px; }}
-    }}
-  </style>
+{{schema}}
+
+
+  <style>
+{{style}}  </style>
 </head>
 <body>
   <!-- Header -->
   <header class="lp-header">
     <div class="lp-header__inner">
       <div class="lp-header__logo"><a href="home.html">Curtains World</a></div>
-      <a href="{WA_LINK}" target="_blank" rel="noopener" class="lp-header__cta">
+      <a href="{{wa_link}}" target="_blank" rel="noopener" class="lp-header__cta">
         Бесплатный замер
       </a>
     </div>
@@ -2679,7 +1324,7 @@ def generate_page(page):
   <nav class="lp-nav" aria-label="Каталог">
     <div class="lp-nav__inner">
       <ul>
-        {nav_links}
+        {{nav_links}}
       </ul>
     </div>
   </nav>
@@ -2688,232 +1333,192 @@ def generate_page(page):
   <div class="lp-breadcrumb" aria-label="Хлебные крошки">
     <a href="home.html">Главная</a>
     <span>/</span>
-    {escape(page["breadcrumb_name"])}
+{{breadcrumb}}
   </div>
 
   <!-- Hero -->
   <section class="lp-hero">
     <div class="lp-hero__inner">
-      <h1>{escape(page["h1"])}</h1>
-      <p class="lp-hero__subtitle">{escape(page["description"])}</p>
-      <a href="{WA_LINK}" target="_blank" rel="noopener" class="lp-hero__cta">
-        Заказать бесплатный замер
-      </a>
+{{hero}}
     </div>
   </section>
 
-  <!-- Content -->
-  <article class="lp-content">
-    <h2>О продукте</h2>
-{content_html}
-  </article>
+{{content}}
 
   <!-- CTA Banner -->
   <section class="lp-cta-banner">
     <div class="lp-cta-banner__inner">
       <h2>Закажите бесплатный замер</h2>
       <p>Наш специалист приедет в удобное время, снимет размеры и поможет подобрать ткань. Замер, доставка и установка бесплатно.</p>
-      <a href="{WA_LINK}" target="_blank" rel="noopener" class="lp-cta-banner__btn">
+      <a href="{{wa_link}}" target="_blank" rel="noopener" class="lp-cta-banner__btn">
         Написать в WhatsApp
       </a>
       <p style="margin-top:16px; margin-bottom:0; font-size:14px;">
-        Или позвоните: <a href="{PHONE_LINK}" style="color:#fff; text-decoration:underline;">{PHONE}</a>
+        Или позвоните: <a href="{{phone_link}}" style="color:#fff; text-decoration:underline;">{{phone}}</a>
       </p>
     </div>
-  </section>
-
-  <!-- FAQ -->
-  <section class="lp-faq">
-    <h2>Часто задаваемые вопросы</h2>
-{faq_html}
-  </section>
-
-  <!-- Related pages -->
-  <section class="lp-related">
-    <div class="lp-related__inner">
-      <h2>Другие услуги</h2>
-      <ul>
-{cross_links}
-      </ul>
-    </div>
-  </section>
-
-  <!-- Related blog articles -->
-  <section class="lp-related" style="padding-top:0;">
-    <div class="lp-related__inner">
-      <h2>Полезные статьи</h2>
-      <ul>
-{related_blog_links}
-      </ul>
-    </div>
-  </section>
+  </section>{{sections}}
 
-{footer_html}
+{{footer}}
 
 
   <!-- WhatsApp Float Button -->
-  <a href="{WA_LINK}" target="_blank" rel="noopener" class="wa-float" aria-label="Написать в WhatsApp">
+  <a href="{{wa_link}}" target="_blank" rel="noopener" class="wa-float" aria-label="Написать в WhatsApp">
     <svg viewBox="0 0 24 24"><path d="M17.472 14.382c-.297-.149-1.758-.867-2.03-.967-.273-.099-.471-.148-.67.15-.197.297-.767.966-.94 1.164-.173.199-.347.223-.644.075-.297-.15-1.255-.463-2.39-1.475-.883-.788-1.48-1.761-1.653-2.059-.173-.297-.018-.458.13-.606.134-.133.298-.347.446-.52.149-.174.198-.298.298-.497.099-.198.05-.371-.025-.52-.075-.149-.669-1.612-.916-2.207-.242-.579-.487-.5-.669-.51-.173-.008-.371-.01-.57-.01-.198 0-.52.074-.792.372-.272.297-1.04 1.016-1.04 2.479 0 1.462 1.065 2.875 1.213 3.074.149.198 2.096 3.2 5.077 4.487.709.306 1.262.489 1.694.625.712.227 1.36.195 1.871.118.571-.085 1.758-.719 2.006-1.413.248-.694.248-1.289.173-1.413-.074-.124-.272-.198-.57-.347m-5.421 7.403h-.004a9.87 9.87 0 01-5.031-1.378l-.361-.214-3.741.982.998-3.648-.235-.374a9.86 9.86 0 01-1.51-5.26c.001-5.45 4.436-9.884 9.888-9.884 2.64 0 5.122 1.03 6.988 2.898a9.825 9.825 0 012.893 6.994c-.003 5.45-4.437 9.884-9.885 9.884m8.413-18.297A11.815 11.815 0 0012.05 0C5.495 0 .16 5.335.157 11.892c0 2.096.547 4.142 1.588 5.945L.057 24l6.305-1.654a11.882 11.882 0 005.683 1.448h.005c6.554 0 11.89-5.335 11.893-11.893a11.821 11.821 0 00-3.48-8.413z"/></svg>
   </a>
 
   <!-- UTM Capture -->
   <script>
-  (function(){{
+  (function(){
     var p=new URLSearchParams(window.location.search);
     var utms=['utm_source','utm_medium','utm_campaign','utm_term','utm_content'];
-    var d={{}};
-    utms.forEach(function(k){{var v=p.get(k);if(v)d[k]=v;}});
-    if(Object.keys(d).length>0){{
-      try{{sessionStorage.setItem('utms',JSON.stringify(d));}}catch(e){{}}
-    }}
-  }})();
+    var d={};
+    utms.forEach(function(k){var v=p.get(k);if(v)d[k]=v;});
+    if(Object.keys(d).length>0){
+      try{sessionStorage.setItem('utms',JSON.stringify(d));}catch(e){}
+    }
+  })();
   </script>
 </body>
 </html>"""
 
-    return html
-
 
-def generate_blog_index():
-    """Generate the blog index page with cards for all blog articles."""
+# Landing pages -------------------------------------------------------------
+LANDING_SCHEMA = """  <!-- Structured Data: BreadcrumbList, FAQPage, LocalBusiness -->
+  <script type="application/ld+json">{{json_ld}}</script>"""
 
-    nav_links = build_nav_links_html("blog")
-    footer_html = build_footer_html()
+LANDING_HERO = """      <h1>{{h1}}</h1>
+      <p class="lp-hero__subtitle">{{description}}</p>
+      <a href="{{wa_link}}" target="_blank" rel="noopener" class="lp-hero__cta">
+        Заказать бесплатный замер
+      </a>"""
 
-    # Build article cards
-    cards = []
-    for article in BLOG_ARTICLES:
-        cards.append(f"""      <article class="lp-blog-card">
-        <h2><a href="{article['filename']}">{escape(article['h1'])}</a></h2>
-        <time datetime="{article['date_published']}">{article['date_published']}</time>
-        <p>{escape(article['description'])}</p>
-        <a href="{article['filename']}" class="lp-blog-card__link">Читать далее &rarr;</a>
-      </article>""")
-    cards_html = "\n".join(cards)
+LANDING_CONTENT = """  <!-- Content -->
+  <article class="lp-content">
+    <h2>О продукте</h2>
+{{content}}
+  </article>"""
 
-    # Schema: BreadcrumbList
-    breadcrumb_schema = json.dumps({
-        "@context": "https://schema.org",
-        "@type": "BreadcrumbList",
-        "itemListElement": [
-            {
-                "@type": "ListItem",
-                "position": 1,
-                "name": "Главная",
-                "item": f"{BASE_URL}/",
-            },
-            {
-                "@type": "ListItem",
-                "position": 2,
-                "name": "Блог",
-                "item": f"{BASE_URL}/blog",
-            },
-        ],
-    }, ensure_ascii=False, indent=2)
+LANDING_SECTIONS = """
 
-    # Schema: CollectionPage
-    collection_schema = json.dumps({
-        "@context": "https://schema.org",
-        "@type": "CollectionPage",
-        "name": "Блог о шторах в Дубае",
-        "description": (
-            "Полезные статьи о шторах, жалюзи и карнизах в Дубае: "
-            "советы по выбору, уходу и установке."
-        ),
-        "url": f"{BASE_URL}/blog",
-    }, ensure_ascii=False, indent=2)
+  <!-- FAQ -->
+  <section class="lp-faq">
+    <h2>Часто задаваемые вопросы</h2>
+{{faq}}
+  </section>
 
-    html = f"""<!DOCTYPE html>
-<html lang="ru">
-<head>
-  <meta charset="utf-8">
-  <meta name="viewport" content="width=device-width, initial-scale=1.0">
-  <title>Блог о шторах в Дубае | Curtains World</title>
-  <link rel="canonical" href="{BASE_URL}/blog">
-  <meta name="description" content="Полезные статьи о шторах в Дубае: как выбрать ткань, блэкаут vs тюль, моторизированные шторы, уход и советы для арендных квартир.">
-  <meta name="keywords" content="шторы дубай блог, советы по шторам ОАЭ, выбор штор дубай">
+  <!-- Related pages -->
+  <section class="lp-related">
+    <div class="lp-related__inner">
+      <h2>Другие услуги</h2>
+      <ul>
+{{cross_links}}
+      </ul>
+    </div>
+  </section>{{area_links}}
 
-  <!-- Open Graph -->
-  <meta property="og:title" content="Блог о шторах в Дубае | Curtains World">
-  <meta property="og:description" content="Полезные статьи о шторах в Дубае: как выбрать ткань, блэкаут vs тюль, моторизированные шторы, уход и советы.">
-  <meta property="og:type" content="website">
-  <meta property="og:site_name" content="Curtains World">
-  <meta property="og:url" content="{BASE_URL}/blog">
-  <meta property="og:image" content="{BASE_URL}/assets/img_2024-02-07_14131410.webp">
-  <meta property="og:image:width" content="1200">
-  <meta property="og:image:height" content="630">
-  <meta property="og:image:type" content="image/webp">
-  <meta property="og:locale" content="ru_RU">
+  <!-- Related blog articles -->
+  <section class="lp-related" style="padding-top:0;">
+    <div class="lp-related__inner">
+      <h2>Полезные статьи</h2>
+      <ul>
+{{related_links}}
+      </ul>
+    </div>
+  </section>"""
 
-  <!-- Twitter Card -->
-  <meta name="twitter:card" content="summary_large_image">
-  <meta name="twitter:title" content="Блог о шторах в Дубае | Curtains World">
-  <meta name="twitter:description" content="Полезные статьи о шторах в Дубае: как выбрать ткань, блэкаут vs тюль, моторизированные шторы, уход и советы.">
-  <meta name="twitter:image" content="{BASE_URL}/assets/img_2024-02-07_14131410.webp">
+# Blog articles -------------------------------------------------------------
+ARTICLE_SCHEMA = """  <!-- Structured Data: BreadcrumbList, Article, FAQPage -->
+  <script type="application/ld+json">{{json_ld}}</script>"""
 
-  <!-- Geo -->
-  <meta name="geo.region" content="AE-DU">
-  <meta name="geo.placename" content="Dubai">
-  <meta name="geo.position" content="25.2048;55.2708">
-  <meta name="ICBM" content="25.2048, 55.2708">
+ARTICLE_HERO = """      <h1>{{h1}}</h1>
+      <p class="lp-hero__subtitle">{{description}}</p>"""
 
-  <!-- Verification -->
+ARTICLE_CONTENT = """  <!-- Article -->
+  <article class="lp-article">
+{{content}}
+  </article>"""
 
+ARTICLE_SECTIONS = """
 
+  <!-- FAQ -->
+  <section class="lp-faq">
+    <h2>Часто задаваемые вопросы</h2>
+{{faq}}
+  </section>
 
-  <!-- Favicon -->
-  <link rel="icon" href="favicon.ico" type="image/x-icon">
-  <link rel="apple-touch-icon" href="apple-touch-icon.png">
-  <meta name="theme-color" content="#1a1a2e">
+  <!-- Related articles -->
+  <section class="lp-related">
+    <div class="lp-related__inner">
+      <h2>Читайте также</h2>
+      <ul>
+{{cross_links}}
+      </ul>
+    </div>
+  </section>
 
-  <!-- CSS -->
-  <link href="assets/tilda-grid-3.0.min.css" rel="stylesheet">
-  <link href="assets/fonts.css" rel="stylesheet">
-  <link href="assets/tilda-forms-1.0.min.css" rel="stylesheet" media="print" onload="this.media='all'">
+  <!-- Related products -->
+  <section class="lp-related" style="padding-top:0;">
+    <div class="lp-related__inner">
+      <h2>Наши услуги</h2>
+      <ul>
+{{related_links}}
+      </ul>
+    </div>
+  </section>"""
 
-  <!-- Structured Data: BreadcrumbList -->
-  <script type="application/ld+json">
-{breadcrumb_schema}
-  </script>
+# Blog index ----------------------------------------------------------------
+BLOG_INDEX_SCHEMA = """  <!-- Structured Data: BreadcrumbList, CollectionPage -->
+  <script type="application/ld+json">{{json_ld}}</script>"""
 
-  <!-- Structured Data: CollectionPage -->
-  <script type="application/ld+json">
-{collection_schema}
-  </script>
+BLOG_INDEX_HERO = """      <h1>{{h1}}</h1>
+      <p class="lp-hero__subtitle lp-hero__subtitle--flush">{{subtitle}}</p>
+      <ul class="lp-topics">
+{{topic_links}}
+      </ul>
+      <form class="lp-search" role="search" data-index="search/" hidden>
+        <input type="search" name="q" placeholder="Поиск по статьям и услугам" aria-label="Поиск по сайту" autocomplete="off">
+        <ul class="lp-search__results" aria-live="polite"></ul>
+      </form>
+      <script src="assets/search.js" defer></script>"""
 
+BLOG_INDEX_CONTENT = """  <!-- Blog articles grid -->
+  <section class="lp-blog-grid">
+{{cards}}
+  </section>{{pagination}}"""
 
-  <style>
-    /* ===== Reset & Base ===== */
-    *, *::before, *::after {{ box-sizing: border-box; margin: 0; padding: 0; }}
-    html {{ scroll-behavior: smooth; }}
-    body {{
+SITE_CSS = """    /* ===== Reset & Base ===== */
+    *, *::before, *::after { box-sizing: border-box; margin: 0; padding: 0; }
+    html { scroll-behavior: smooth; }
+    body {
       font-family: 'Montserrat', Arial, sans-serif;
       color: #333;
       line-height: 1.6;
       background: #fff;
       -webkit-font-smoothing: antialiased;
-    }}
-    a {{ color: #4e7a55; text-decoration: none; transition: color .2s; }}
-    a:hover {{ color: #3a5f40; }}
+    }
+    a { color: #4e7a55; text-decoration: none; transition: color .2s; }
+    a:hover { color: #3a5f40; }
+    img { max-width: 100%; height: auto; }
 
     /* ===== Header ===== */
-    .lp-header {{
+    .lp-header {
       position: sticky; top: 0; z-index: 100;
       background: #fff;
       border-bottom: 1px solid #eee;
       padding: 0 20px;
-    }}
-    .lp-header__inner {{
+    }
+    .lp-header__inner {
       max-width: 1200px; margin: 0 auto;
       display: flex; align-items: center; justify-content: space-between;
       min-height: 64px;
-    }}
-    .lp-header__logo {{
+    }
+    .lp-header__logo {
       font-family: 'Montserrat', Arial, sans-serif;
       font-size: 22px; font-weight: 700; color: #333;
-    }}
-    .lp-header__logo a {{ color: inherit; }}
-    .lp-header__cta {{
+    }
+    .lp-header__logo a { color: inherit; }
+    .lp-header__cta {
       display: inline-block;
       padding: 10px 24px;
       background: #536b58;
@@ -2924,346 +1529,2142 @@ def generate_blog_index():
       text-transform: uppercase;
       letter-spacing: 0.02em;
       transition: background .2s;
-    }}
-    .lp-header__cta:hover {{ background: #4e7a55; color: #fff; }}
+    }
+    .lp-header__cta:hover { background: #4e7a55; color: #fff; }
+
+    /* Mobile menu toggle */
+    .lp-header__menu-btn {
+      display: none; background: none; border: none; cursor: pointer;
+      width: 28px; height: 20px; position: relative;
+    }
+    .lp-header__menu-btn span {
+      display: block; position: absolute; width: 100%; height: 3px;
+      background: #536b58; left: 0; transition: .25s;
+    }
+    .lp-header__menu-btn span:nth-child(1) { top: 0; }
+    .lp-header__menu-btn span:nth-child(2) { top: 8px; }
+    .lp-header__menu-btn span:nth-child(3) { top: 16px; }
 
     /* ===== Navigation ===== */
-    .lp-nav {{ background: #fafaf8; border-bottom: 1px solid #eee; }}
-    .lp-nav__inner {{
+    .lp-nav { background: #fafaf8; border-bottom: 1px solid #eee; }
+    .lp-nav__inner {
       max-width: 1200px; margin: 0 auto; padding: 0 20px;
-    }}
-    .lp-nav ul {{
+    }
+    .lp-nav ul {
       list-style: none; display: flex; flex-wrap: wrap; gap: 0;
-    }}
-    .lp-nav li a {{
+    }
+    .lp-nav li a {
       display: block; padding: 12px 16px;
       font-size: 14px; font-weight: 600; color: #333;
       transition: color .2s, background .2s;
-    }}
-    .lp-nav li a:hover {{ color: #4e7a55; background: #f0ede8; }}
-    .lp-nav li a[aria-current="page"] {{ color: #4e7a55; }}
+    }
+    .lp-nav li a:hover { color: #4e7a55; background: #f0ede8; }
+    .lp-nav li a[aria-current="page"] { color: #4e7a55; }
 
     /* ===== Hero ===== */
-    .lp-hero {{
+    .lp-hero {
       background: linear-gradient(135deg, #f8f2e9 0%, #e8e0d5 100%);
       padding: 60px 20px 50px;
       text-align: center;
-    }}
-    .lp-hero__inner {{ max-width: 800px; margin: 0 auto; }}
-    .lp-hero h1 {{
+    }
+    .lp-hero__inner { max-width: 800px; margin: 0 auto; }
+    .lp-hero h1 {
       font-family: 'Montserrat', Arial, sans-serif;
       font-size: 36px; font-weight: 700; color: #333;
       margin-bottom: 16px; line-height: 1.25;
-    }}
-    .lp-hero__subtitle {{
-      font-size: 18px; color: #555; margin-bottom: 0; line-height: 1.5;
-    }}
+    }
+    .lp-hero__subtitle {
+      font-size: 18px; color: #555; margin-bottom: 28px; line-height: 1.5;
+    }
+    .lp-hero__subtitle--flush { margin-bottom: 0; }
+    .lp-hero__cta {
+      display: inline-block;
+      padding: 14px 36px;
+      background: #4e7a55;
+      color: #fff;
+      border-radius: 8px;
+      font-size: 16px; font-weight: 700;
+      text-transform: uppercase;
+      transition: background .2s, transform .15s;
+    }
+    .lp-hero__cta:hover { background: #3a5f40; color: #fff; transform: translateY(-1px); }
+
+    /* ===== Search ===== */
+    .lp-search { max-width: 560px; margin: 28px auto 0; text-align: left; }
+    .lp-search input {
+      width: 100%; padding: 12px 16px;
+      font: inherit; font-size: 16px;
+      border: 1px solid #d6cfc4; border-radius: 8px; background: #fff;
+    }
+    .lp-search input:focus { outline: 2px solid #4e7a55; outline-offset: 1px; }
+    .lp-search__results { list-style: none; margin-top: 8px; }
+    .lp-search__results a { display: block; padding: 8px 4px; border-bottom: 1px solid #e0d8cc; }
+    .lp-search__empty { padding: 8px 4px; color: #767676; }
+
+    /* ===== Blog topics & pagination ===== */
+    .lp-topics {
+      list-style: none; margin-top: 20px;
+      display: flex; flex-wrap: wrap; justify-content: center; gap: 8px;
+    }
+    .lp-topics a {
+      display: block; padding: 6px 14px;
+      border: 1px solid #d6cfc4; border-radius: 20px;
+      font-size: 14px; color: #555; background: #fff;
+    }
+    .lp-topics a:hover, .lp-topics a[aria-current="page"] { border-color: #4e7a55; color: #4e7a55; }
+    .lp-pagination {
+      max-width: 1200px; margin: 0 auto; padding: 0 20px 50px;
+      display: flex; flex-wrap: wrap; align-items: center; justify-content: center; gap: 8px 16px;
+      font-size: 15px; color: #767676;
+    }
+    .lp-pagination a { font-weight: 600; }
+    .lp-pagination [aria-current] { color: #333; font-weight: 600; }
 
     /* ===== Breadcrumb ===== */
-    .lp-breadcrumb {{
+    .lp-breadcrumb {
       max-width: 1200px; margin: 0 auto; padding: 16px 20px;
       font-size: 13px; color: #767676;
-    }}
-    .lp-breadcrumb a {{ color: #4e7a55; text-decoration: underline; }}
-    .lp-breadcrumb span {{ margin: 0 6px; }}
+    }
+    .lp-breadcrumb a { color: #4e7a55; text-decoration: underline; }
+    .lp-breadcrumb span { margin: 0 6px; }
+
+    /* ===== Content ===== */
+    .lp-content {
+      max-width: 800px; margin: 0 auto;
+      padding: 40px 20px 50px;
+    }
+    .lp-content h2 {
+      font-family: 'Montserrat', Arial, sans-serif;
+      font-size: 28px; font-weight: 700; color: #333;
+      margin-bottom: 20px;
+    }
+    .lp-content p {
+      font-size: 16px; color: #444; margin-bottom: 18px;
+      font-family: 'Ubuntu', 'Montserrat', Arial, sans-serif;
+    }
 
+    /* ===== Article content ===== */
+    .lp-article {
+      max-width: 800px; margin: 0 auto;
+      padding: 40px 20px 50px;
+    }
+    .lp-article h2 {
+      font-family: 'Montserrat', Arial, sans-serif;
+      font-size: 26px; font-weight: 700; color: #333;
+      margin: 36px 0 16px;
+      line-height: 1.3;
+    }
+    .lp-article h2:first-child { margin-top: 0; }
+    .lp-article h3 {
+      font-family: 'Montserrat', Arial, sans-serif;
+      font-size: 20px; font-weight: 600; color: #444;
+      margin: 28px 0 12px;
+      line-height: 1.3;
+    }
+    .lp-article p {
+      font-size: 16px; color: #444; margin-bottom: 16px;
+      font-family: 'Ubuntu', 'Montserrat', Arial, sans-serif;
+      line-height: 1.7;
+    }
     /* ===== Blog Grid ===== */
-    .lp-blog-grid {{
+    .lp-blog-grid {
       max-width: 1200px; margin: 0 auto;
       padding: 40px 20px 50px;
       display: grid;
       grid-template-columns: repeat(auto-fit, minmax(320px, 1fr));
       gap: 24px;
-    }}
-    .lp-blog-card {{
+    }
+    .lp-blog-card {
       background: #fff;
       border: 1px solid #e8e8e8;
       border-radius: 12px;
       padding: 28px 24px;
       transition: box-shadow .2s, transform .15s;
-    }}
-    .lp-blog-card:hover {{
+    }
+    .lp-blog-card:hover {
       box-shadow: 0 8px 24px rgba(0,0,0,.08);
       transform: translateY(-2px);
-    }}
-    .lp-blog-card h2 {{
+    }
+    .lp-blog-card h2 {
       font-family: 'Montserrat', Arial, sans-serif;
       font-size: 20px; font-weight: 700; color: #333;
       margin-bottom: 8px; line-height: 1.3;
-    }}
-    .lp-blog-card h2 a {{ color: inherit; }}
-    .lp-blog-card h2 a:hover {{ color: #4e7a55; }}
-    .lp-blog-card time {{
+    }
+    .lp-blog-card h2 a { color: inherit; }
+    .lp-blog-card h2 a:hover { color: #4e7a55; }
+    .lp-blog-card time {
       display: block;
       font-size: 13px; color: #999;
       margin-bottom: 12px;
-    }}
-    .lp-blog-card p {{
+    }
+    .lp-blog-card p {
       font-size: 15px; color: #555; line-height: 1.6;
       margin-bottom: 16px;
       font-family: 'Ubuntu', 'Montserrat', Arial, sans-serif;
-    }}
-    .lp-blog-card__link {{
+    }
+    .lp-blog-card__link {
       font-size: 14px; font-weight: 600;
       color: #4e7a55;
-    }}
-    .lp-blog-card__link:hover {{ color: #3a5f40; }}
-
+    }
+    .lp-blog-card__link:hover { color: #3a5f40; }
     /* ===== CTA Banner ===== */
-    .lp-cta-banner {{
+    .lp-cta-banner {
       background: #4e7a55; color: #fff;
       padding: 50px 20px; text-align: center;
-    }}
-    .lp-cta-banner__inner {{ max-width: 700px; margin: 0 auto; }}
-    .lp-cta-banner h2 {{
+    }
+    .lp-cta-banner__inner { max-width: 700px; margin: 0 auto; }
+    .lp-cta-banner h2 {
       font-size: 28px; font-weight: 700; margin-bottom: 12px; color: #fff;
-    }}
-    .lp-cta-banner p {{
+    }
+    .lp-cta-banner p {
       font-size: 16px; margin-bottom: 24px; color: #fff;
-    }}
-    .lp-cta-banner__btn {{
+    }
+    .lp-cta-banner__btn {
       display: inline-block;
       padding: 14px 36px;
       background: #fff; color: #4e7a55;
       border-radius: 8px;
       font-size: 16px; font-weight: 700;
       transition: background .2s, transform .15s;
-    }}
-    .lp-cta-banner__btn:hover {{ background: #f0f0f0; color: #3a5f40; transform: translateY(-1px); }}
+    }
+    .lp-cta-banner__btn:hover { background: #f0f0f0; color: #3a5f40; transform: translateY(-1px); }
+
+    /* ===== FAQ ===== */
+    .lp-faq {
+      max-width: 800px; margin: 0 auto;
+      padding: 50px 20px 60px;
+    }
+    .lp-faq h2 {
+      font-family: 'Montserrat', Arial, sans-serif;
+      font-size: 28px; font-weight: 700; color: #333;
+      margin-bottom: 24px; text-align: center;
+    }
+    .lp-faq__item {
+      border-bottom: 1px solid #e0e0e0;
+    }
+    .lp-faq__question {
+      padding: 18px 40px 18px 0;
+      font-size: 16px; font-weight: 600; color: #333;
+      cursor: pointer; position: relative;
+      list-style: none;
+      font-family: 'Montserrat', Arial, sans-serif;
+    }
+    .lp-faq__question::-webkit-details-marker { display: none; }
+    .lp-faq__question::after {
+      content: '+'; position: absolute; right: 0; top: 50%;
+      transform: translateY(-50%);
+      font-size: 22px; font-weight: 300; color: #4e7a55;
+      transition: transform .2s;
+    }
+    details[open] .lp-faq__question::after {
+      content: '\\2212'; /* minus sign */
+    }
+    .lp-faq__answer {
+      padding: 0 0 18px;
+      font-family: 'Ubuntu', 'Montserrat', Arial, sans-serif;
+    }
+    .lp-faq__answer p { font-size: 15px; color: #555; line-height: 1.6; }
+
+    /* ===== Cross-links ===== */
+    .lp-related {
+      background: #fafaf8; padding: 40px 20px;
+    }
+    .lp-related__inner {
+      max-width: 800px; margin: 0 auto;
+    }
+    .lp-related h2 {
+      font-family: 'Montserrat', Arial, sans-serif;
+      font-size: 22px; font-weight: 700; color: #333;
+      margin-bottom: 16px;
+    }
+    .lp-related ul { list-style: none; display: flex; flex-wrap: wrap; gap: 10px; }
+    .lp-related li a {
+      display: inline-block;
+      padding: 8px 20px;
+      background: #fff;
+      border: 1px solid #ddd;
+      border-radius: 20px;
+      font-size: 14px; font-weight: 600; color: #333;
+      transition: border-color .2s, color .2s;
+    }
+    .lp-related li a:hover { border-color: #4e7a55; color: #4e7a55; }
 
     /* ===== Footer ===== */
-    .lp-footer {{
+    .lp-footer {
       background: #333; color: #ccc; padding: 40px 20px;
-    }}
-    .lp-footer__inner {{
+    }
+    .lp-footer__inner {
       max-width: 1200px; margin: 0 auto;
       display: flex; flex-wrap: wrap; gap: 40px;
       justify-content: space-between;
-    }}
-    .lp-footer__col {{ flex: 1; min-width: 200px; }}
-    .lp-footer__col h3 {{
+    }
+    .lp-footer__col { flex: 1; min-width: 200px; }
+    .lp-footer__col h3 {
       font-size: 16px; font-weight: 700; color: #fff;
       margin-bottom: 12px;
       font-family: 'Montserrat', Arial, sans-serif;
-    }}
-    .lp-footer__col p, .lp-footer__col a {{
+    }
+    .lp-footer__col p, .lp-footer__col a {
       font-size: 14px; color: #aaa; line-height: 1.8;
-    }}
-    .lp-footer__col a:hover {{ color: #fff; }}
-    .lp-footer__col ul {{ list-style: none; }}
-    .lp-footer__col ul li a {{
+    }
+    .lp-footer__col a:hover { color: #fff; }
+    .lp-footer__col ul { list-style: none; }
+    .lp-footer__col ul li a {
       display: block; padding: 2px 0;
       font-size: 14px; color: #aaa;
-    }}
-    .lp-footer__col ul li a:hover {{ color: #fff; }}
-    .lp-footer__bottom {{
+    }
+    .lp-footer__col ul li a:hover { color: #fff; }
+    .lp-footer__bottom {
       max-width: 1200px; margin: 24px auto 0;
       padding-top: 20px; border-top: 1px solid #555;
       font-size: 13px; color: #aaa; text-align: center;
-    }}
+    }
 
     /* ===== WhatsApp Button ===== */
-    .wa-float {{
+    .wa-float {
       position: fixed; bottom: 20px; right: 20px; z-index: 9999;
       width: 60px; height: 60px; border-radius: 50%;
       background: #25D366;
       display: flex; align-items: center; justify-content: center;
       box-shadow: 0 4px 12px rgba(0,0,0,.25);
       cursor: pointer; transition: transform .2s;
-    }}
-    .wa-float:hover {{ transform: scale(1.1); }}
-    .wa-float svg {{ width: 32px; height: 32px; fill: #fff; }}
+    }
+    .wa-float:hover { transform: scale(1.1); }
+    .wa-float svg { width: 32px; height: 32px; fill: #fff; }
 
     /* ===== Responsive ===== */
-    @media (max-width: 768px) {{
-      .lp-hero h1 {{ font-size: 28px; }}
-      .lp-hero__subtitle {{ font-size: 16px; }}
-      .lp-cta-banner h2 {{ font-size: 24px; }}
-      .lp-header__cta {{ padding: 8px 16px; font-size: 12px; }}
-      .lp-nav ul {{ flex-direction: column; }}
-      .lp-nav li a {{ padding: 10px 16px; border-bottom: 1px solid #eee; }}
-      .lp-footer__inner {{ flex-direction: column; gap: 24px; }}
-    }}
-    @media (max-width: 480px) {{
-      .lp-hero {{ padding: 40px 16px 36px; }}
-      .lp-hero h1 {{ font-size: 24px; }}
-      .lp-blog-grid {{ padding: 24px 16px 30px; gap: 16px; }}
-      .lp-blog-card {{ padding: 20px 16px; }}
-    }}
-    @media (min-width: 960px) {{
-      .wa-float {{ bottom: 30px; right: 30px; }}
-    }}
-  </style>
-</head>
-<body>
-  <!-- Header -->
-  <header class="lp-header">
-    <div class="lp-header__inner">
-      <div class="lp-header__logo"><a href="home.html">Curtains World</a></div>
-      <a href="{WA_LINK}" target="_blank" rel="noopener" class="lp-header__cta">
-        Бесплатный замер
-      </a>
-    </div>
-  </header>
+    @media (max-width: 768px) {
+      .lp-hero h1 { font-size: 28px; }
+      .lp-hero__subtitle { font-size: 16px; }
+      .lp-content h2, .lp-article h2, .lp-faq h2, .lp-cta-banner h2 { font-size: 24px; }
+      .lp-article h3 { font-size: 18px; }
+      .lp-header__cta { padding: 8px 16px; font-size: 12px; }
+      .lp-nav ul { flex-direction: column; }
+      .lp-nav li a { padding: 10px 16px; border-bottom: 1px solid #eee; }
+      .lp-footer__inner { flex-direction: column; gap: 24px; }
+    }
+    @media (max-width: 480px) {
+      .lp-hero { padding: 40px 16px 36px; }
+      .lp-hero h1 { font-size: 24px; }
+      .lp-content { padding: 30px 16px 40px; }
+      .lp-article { padding: 30px 16px 40px; }
+      .lp-blog-grid { padding: 24px 16px 30px; gap: 16px; }
+      .lp-blog-card { padding: 20px 16px; }
+      .lp-faq { padding: 30px 16px 40px; }
+      .lp-related { padding: 30px 16px; }
+    }
+    @media (min-width: 960px) {
+      .wa-float { bottom: 30px; right: 30px; }
+    }
+"""
 
-  <!-- Navigation -->
-  <nav class="lp-nav" aria-label="Каталог">
-    <div class="lp-nav__inner">
-      <ul>
-        {nav_links}
-      </ul>
-    </div>
-  </nav>
+# Rules every page type needs for its first screen: base styles, header,
+# navigation, breadcrumb, hero and the floating WhatsApp button. Each page
+# type adds the selectors of its main content; everything else is left to
+# the shared stylesheet.
+CRITICAL_SELECTORS = (
+    "*", "html", "body", "a", "img",
+    ".lp-header", ".lp-nav", ".lp-breadcrumb", ".lp-hero", ".wa-float",
+)
 
-  <!-- Breadcrumb -->
-  <div class="lp-breadcrumb" aria-label="Хлебные крошки">
-    <a href="home.html">Главная</a>
-    <span>/</span>
-    Блог
-  </div>
+CSS_COMMENT_RE = re.compile(r"[ \t]*/\*.*?\*/", re.S)
+CSS_TOKEN_RE = re.compile(r"([^{}]*)([{}])")
+
+
+def split_css(css):
+    """Split a stylesheet into ``(media, selector, rule)`` in source order.
+
+    ``media`` is the prelude of the enclosing ``@media`` block, or None.
+    Comments are dropped; at-rules cannot nest deeper than one level.
+    """
+    rules, media, selector = [], None, None
+    for text, brace in CSS_TOKEN_RE.findall(CSS_COMMENT_RE.sub("", css)):
+        if brace == "{":
+            if text.strip().startswith("@"):
+                media = text.strip()
+            else:
+                selector = text.strip()
+        elif selector is not None:
+            rules.append((media, selector, f"{selector} {{{text}}}"))
+            selector = None
+        else:
+            media = None
+    return rules
+
+
+def format_css(rules):
+    """Render ``split_css`` rules back into source, regrouping ``@media``."""
+    lines, media = [], None
+    for rule_media, _, rule in rules:
+        if rule_media != media:
+            if media:
+                lines.append("    }")
+            if rule_media:
+                lines.append(f"    {rule_media} {{")
+            media = rule_media
+        lines.append(("      " if media else "    ") + rule)
+    if media:
+        lines.append("    }")
+    return "".join(line + "\n" for line in lines)
+
+
+def is_critical(selector, prefixes):
+    """True if any selector in the group targets one of the ``prefixes``.
+
+    A prefix covers its BEM elements and modifiers, descendants and
+    pseudo-classes: ``.lp-hero`` matches ``.lp-hero__cta:hover``.
+    """
+    pattern = "|".join(re.escape(p) for p in prefixes)
+    return any(
+        re.match(rf"(?:{pattern})(?:__|--|(?![\w-]))", part.strip())
+        for part in selector.split(",")
+    )
 
-  <!-- Hero -->
-  <section class="lp-hero">
-    <div class="lp-hero__inner">
-      <h1>Блог о шторах в Дубае</h1>
-      <p class="lp-hero__subtitle">Полезные статьи о выборе, установке и уходе за шторами в ОАЭ</p>
-    </div>
-  </section>
 
-  <!-- Blog articles grid -->
-  <section class="lp-blog-grid">
-{cards_html}
-  </section>
+SITE_RULES = split_css(SITE_CSS)
+SITE_STYLESHEET = textwrap.dedent(
+    format_css([r for r in SITE_RULES if not is_critical(r[1], CRITICAL_SELECTORS)])
+)
+STYLESHEET_HREF = (
+    f"assets/site.{hashlib.sha256(SITE_STYLESHEET.encode()).hexdigest()[:10]}.css"
+)
 
-  <!-- CTA Banner -->
-  <section class="lp-cta-banner">
-    <div class="lp-cta-banner__inner">
-      <h2>Закажите бесплатный замер</h2>
-      <p>Наш специалист приедет в удобное время, снимет размеры и поможет подобрать ткань. Замер, доставка и установка бесплатно.</p>
-      <a href="{WA_LINK}" target="_blank" rel="noopener" class="lp-cta-banner__btn">
-        Написать в WhatsApp
-      </a>
-      <p style="margin-top:16px; margin-bottom:0; font-size:14px;">
-        Или позвоните: <a href="{PHONE_LINK}" style="color:#fff; text-decoration:underline;">{PHONE}</a>
-      </p>
-    </div>
-  </section>
 
-{footer_html}
+def critical_css(*selectors):
+    """Inline CSS for a page type whose main content uses ``selectors``."""
+    return format_css([
+        r for r in SITE_RULES if is_critical(r[1], CRITICAL_SELECTORS + selectors)
+    ])
 
 
-  <!-- WhatsApp Float Button -->
-  <a href="{WA_LINK}" target="_blank" rel="noopener" class="wa-float" aria-label="Написать в WhatsApp">
-    <svg viewBox="0 0 24 24"><path d="M17.472 14.382c-.297-.149-1.758-.867-2.03-.967-.273-.099-.471-.148-.67.15-.197.297-.767.966-.94 1.164-.173.199-.347.223-.644.075-.297-.15-1.255-.463-2.39-1.475-.883-.788-1.48-1.761-1.653-2.059-.173-.297-.018-.458.13-.606.134-.133.298-.347.446-.52.149-.174.198-.298.298-.497.099-.198.05-.371-.025-.52-.075-.149-.669-1.612-.916-2.207-.242-.579-.487-.5-.669-.51-.173-.008-.371-.01-.57-.01-.198 0-.52.074-.792.372-.272.297-1.04 1.016-1.04 2.479 0 1.462 1.065 2.875 1.213 3.074.149.198 2.096 3.2 5.077 4.487.709.306 1.262.489 1.694.625.712.227 1.36.195 1.871.118.571-.085 1.758-.719 2.006-1.413.248-.694.248-1.289.173-1.413-.074-.124-.272-.198-.57-.347m-5.421 7.403h-.004a9.87 9.87 0 01-5.031-1.378l-.361-.214-3.741.982.998-3.648-.235-.374a9.86 9.86 0 01-1.51-5.26c.001-5.45 4.436-9.884 9.888-9.884 2.64 0 5.122 1.03 6.988 2.898a9.825 9.825 0 012.893 6.994c-.003 5.45-4.437 9.884-9.885 9.884m8.413-18.297A11.815 11.815 0 0012.05 0C5.495 0 .16 5.335.157 11.892c0 2.096.547 4.142 1.588 5.945L.057 24l6.305-1.654a11.882 11.882 0 005.683 1.448h.005c6.554 0 11.89-5.335 11.893-11.893a11.821 11.821 0 00-3.48-8.413z"/></svg>
-  </a>
+def generate_stylesheet():
+    return SITE_STYLESHEET.encode("utf-8")
 
-  <!-- UTM Capture -->
-  <script>
-  (function(){{
-    var p=new URLSearchParams(window.location.search);
-    var utms=['utm_source','utm_medium','utm_campaign','utm_term','utm_content'];
-    var d={{}};
-    utms.forEach(function(k){{var v=p.get(k);if(v)d[k]=v;}});
-    if(Object.keys(d).length>0){{
-      try{{sessionStorage.setItem('utms',JSON.stringify(d));}}catch(e){{}}
-    }}
-  }})();
-  </script>
-</body>
-</html>"""
 
-    return html
+def stream_stylesheet():
+    yield generate_stylesheet()
 
 
-def generate_sitemap():
-    """Generate sitemap.xml from page definitions."""
-    from datetime import date
-    today = date.today().isoformat()
-
-    urls = []
-
-    # Home page with image
-    urls.append(f"""  <url>
-    <loc>{BASE_URL}/home.html</loc>
-    <xhtml:link rel="alternate" hreflang="ru" href="{BASE_URL}/home.html" />
-    <lastmod>{today}</lastmod>
-    <changefreq>weekly</changefreq>
-    <priority>1.0</priority>
-    <image:image>
-      <image:loc>{BASE_URL}/assets/img_2024-02-07_14131410.webp</image:loc>
-      <image:title>Шторы на заказ в Дубае — Curtains World</image:title>
-    </image:image>
-  </url>""")
-
-    # Product pages
-    for page in PAGES:
-        urls.append(f"""  <url>
-    <loc>{BASE_URL}/{page['filename']}</loc>
-    <lastmod>{today}</lastmod>
-    <changefreq>weekly</changefreq>
-    <priority>0.8</priority>
-  </url>""")
-
-    # Blog index
-    urls.append(f"""  <url>
-    <loc>{BASE_URL}/blog.html</loc>
-    <lastmod>{today}</lastmod>
-    <changefreq>weekly</changefreq>
-    <priority>0.7</priority>
-  </url>""")
-
-    # Blog articles
-    for article in BLOG_ARTICLES:
-        urls.append(f"""  <url>
-    <loc>{BASE_URL}/{article['filename']}</loc>
-    <lastmod>{today}</lastmod>
-    <changefreq>monthly</changefreq>
-    <priority>0.6</priority>
-  </url>""")
-
-    xml = f"""<?xml version="1.0" encoding="UTF-8"?>
+LANDING_LAYOUT = compile_layout(
+    og_type="website",
+    og_description="{{description}}",
+    og_extra="",
+    schema=LANDING_SCHEMA,
+    style=critical_css(".lp-content"),
+    breadcrumb="    {{breadcrumb_name}}",
+    hero=LANDING_HERO,
+    content=LANDING_CONTENT,
+    sections=LANDING_SECTIONS,
+)
+
+ARTICLE_LAYOUT = compile_layout(
+    og_type="article",
+    og_description="{{description}}",
+    og_extra='\n  <meta property="article:published_time" content="{{date_published}}">',
+    schema=ARTICLE_SCHEMA,
+    style=critical_css(".lp-article"),
+    breadcrumb=(
+        '    <a href="blog.html">Блог</a>\n'
+        "    <span>/</span>\n"
+        "    {{breadcrumb_name}}"
+    ),
+    hero=ARTICLE_HERO,
+    content=ARTICLE_CONTENT,
+    sections=ARTICLE_SECTIONS,
+)
+
+BLOG_INDEX_LAYOUT = compile_layout(
+    og_type="website",
+    og_description="{{description}}",
+    og_extra="{{rel_links}}",
+    schema=BLOG_INDEX_SCHEMA,
+    style=critical_css(".lp-blog-grid", ".lp-blog-card", ".lp-search", ".lp-topics"),
+    breadcrumb="{{breadcrumb_trail}}",
+    hero=BLOG_INDEX_HERO,
+    content=BLOG_INDEX_CONTENT,
+    sections="",
+)
+
+
+def _build_article_slots(article, join):
+    """Slot values for an article; ``join`` combines the repeated items."""
+    return dict(
+        title=escape(article["title"]),
+        canonical=f"{BASE_URL}/{article['slug']}",
+        description=escape(article["description"]),
+        keywords=escape(article["keywords"]),
+        date_published=article["date_published"],
+        breadcrumb_name=escape(article["breadcrumb_name"]),
+        h1=escape(article["h1"]),
+        nav_links=build_nav_links_html(article["slug"]),
+        json_ld=build_article_schema(article),
+        content=join(build_blog_content_items(article["content_sections"])),
+        faq=join(build_faq_items(article["faq"])),
+        cross_links=build_blog_cross_links(article["slug"]),
+        related_links=build_related_product_links(article["slug"]),
+        footer=build_footer_html(),
+    )
+
+
+def generate_blog_article(article):
+    """Generate the complete HTML for a blog article page."""
+    return page_layout(ARTICLE_LAYOUT).render(**_build_article_slots(article, "\n".join))
+
+
+def stream_blog_article(article):
+    """Yield a blog article page as encoded chunks."""
+    return page_layout(ARTICLE_LAYOUT).stream(**_build_article_slots(article, iter_lines))
+
+
+def _build_page_slots(page, join):
+    """Slot values for a landing page; ``join`` combines the repeated items."""
+    return dict(
+        title=escape(page["title"]),
+        canonical=f"{BASE_URL}/{page['slug']}",
+        description=escape(page["description"]),
+        keywords=escape(page["keywords"]),
+        breadcrumb_name=escape(page["breadcrumb_name"]),
+        h1=escape(page["h1"]),
+        nav_links=build_nav_links_html(page["slug"]),
+        json_ld=build_landing_schema(page),
+        content=join(build_content_items(page["content_paragraphs"])),
+        faq=join(build_faq_items(page["faq"])),
+        cross_links=build_cross_links(page["slug"]),
+        area_links=build_area_links(page["slug"]),
+        related_links=build_related_blog_links(page.get("product", page["slug"])),
+        footer=build_footer_html(),
+    )
+
+
+def generate_page(page):
+    """Generate the complete HTML for a landing page."""
+    return page_layout(LANDING_LAYOUT).render(**_build_page_slots(page, "\n".join))
+
+
+def stream_page(page):
+    """Yield a landing page as encoded chunks."""
+    return page_layout(LANDING_LAYOUT).stream(**_build_page_slots(page, iter_lines))
+
+
+# Blog listings -------------------------------------------------------------
+# The blog index is paginated: blog.html, blog-2.html, ... hold
+# BLOG_PAGE_SIZE cards each, in index order, linked with rel=prev/next.
+# Every topic in index.json's "blog_topics" gets an archive of the same
+# shape, blog-tema-TOPIC.html, blog-tema-TOPIC-2.html, ..., listing the
+# articles whose front matter names it under "topics". New articles go to
+# the end of the index, so publishing one changes the last page of each
+# listing it joins (and every page of the listing when it opens a new one);
+# a page's inputs are its own articles and the page count, not the whole
+# blog. The page links reach pages at growing distances (see
+# pagination_numbers), so every article stays a few clicks from blog.html.
+BLOG_PAGE_SIZE = 12
+BLOG_TOPIC_PREFIX = "blog-tema-"
+TOPICS_CACHE_FILE = "topics.pickle"
+BLOG_INDEX_TITLE = "Блог о шторах в Дубае"
+BLOG_INDEX_DESCRIPTION = (
+    "Полезные статьи о шторах в Дубае: как выбрать ткань, блэкаут vs тюль, "
+    "моторизированные шторы, уход и советы для арендных квартир."
+)
+
+
+def article_topics():
+    """Article slug -> topic slugs from its front matter, cached by source hash."""
+    return FRAGMENTS.get("article_topics", lambda: {
+        slug: topics for (_, slug), topics in per_entry(
+            TOPICS_CACHE_FILE, 1,
+            {("blog", slug): STORE.source_hash("blog", slug) for slug, _ in ALL_BLOG_ARTICLES},
+            lambda article: article.get("topics", []),
+        ).items()
+    })
+
+
+def listing_file(stem, n):
+    return f"{stem}.html" if n == 1 else f"{stem}-{n}.html"
+
+
+def blog_listings():
+    """Filename -> one page of a blog listing, planned once per build.
+
+    Pages are dicts with the listing's ``stem``, page number ``n`` of
+    ``pages``, the ``topic`` as ``[slug, label]`` (None for the main
+    listing), the ``articles`` on the page and the ``prev``/``next``
+    filenames or None.
+    """
+    return FRAGMENTS.get("blog_listings", _plan_blog_listings)
+
+
+def _plan_blog_listings():
+    slugs = [slug for slug, _ in ALL_BLOG_ARTICLES]
+    topics = article_topics()
+    known = dict(BLOG_TOPICS)
+    for slug in slugs:
+        for topic in topics[slug]:
+            if topic not in known:
+                raise ValueError(f"{slug}: unknown topic {topic!r}; add it to blog_topics in index.json")
+    listings = [("blog", None, slugs)] + [
+        (f"{BLOG_TOPIC_PREFIX}{topic}", [topic, label], [s for s in slugs if topic in topics[s]])
+        for topic, label in BLOG_TOPICS
+    ]
+    plan = {}
+    for stem, topic, members in listings:
+        if topic and not members:
+            continue
+        pages = [members[i:i + BLOG_PAGE_SIZE] for i in range(0, len(members), BLOG_PAGE_SIZE)] or [[]]
+        for n, articles in enumerate(pages, 1):
+            plan[listing_file(stem, n)] = {
+                "stem": stem, "n": n, "pages": len(pages), "topic": topic, "articles": articles,
+                "prev": listing_file(stem, n - 1) if n > 1 else None,
+                "next": listing_file(stem, n + 1) if n < len(pages) else None,
+            }
+    clash = plan.keys() & {f"{slug}.html" for slug, _ in ALL_LANDING_PAGES + ALL_BLOG_ARTICLES}
+    if clash:
+        raise ValueError(f"blog listing pages clash with content: {', '.join(sorted(clash))}")
+    return plan
+
+
+def blog_topic_links():
+    """``(stem, label)`` of every topic archive, in index order."""
+    listings = blog_listings()
+    return [
+        (f"{BLOG_TOPIC_PREFIX}{topic}", label) for topic, label in BLOG_TOPICS
+        if f"{BLOG_TOPIC_PREFIX}{topic}.html" in listings
+    ]
+
+
+def canonical_url(filename):
+    return f"{BASE_URL}/{filename[:-len('.html')]}"
+
+
+def build_blog_cards(slugs):
+    """Yield a card for each article in ``slugs``, loading each only when reached."""
+    for slug in slugs:
+        article = load_article(slug)
+        yield f"""      <article class="lp-blog-card">
+        <h2><a href="{article['filename']}">{escape(article['h1'])}</a></h2>
+        <time datetime="{article['date_published']}">{article['date_published']}</time>
+        <p>{escape(article['description'])}</p>
+        <a href="{article['filename']}" class="lp-blog-card__link">Читать далее &rarr;</a>
+      </article>"""
+
+
+def build_topic_links(current):
+    """Yield the topic links of the listing hero, marking ``current``."""
+    for stem, label in blog_topic_links():
+        attr = ' aria-current="page"' if stem == current else ""
+        yield f'        <li><a href="{stem}.html"{attr}>{escape(label)}</a></li>'
+
+
+def pagination_numbers(n, count):
+    """Page numbers page ``n`` of ``count`` links to, itself included.
+
+    The first and last pages and those 1, 2, 5, 10, 20, 50, ... pages away:
+    a page links to O(log count) others, and any page is O(log count)
+    clicks from the first.
+    """
+    numbers = {1, n, count}
+    distance, factors = 1, itertools.cycle((2, 2.5, 2))
+    while distance < count:
+        numbers.update(m for m in (n - distance, n + distance) if 1 <= m <= count)
+        distance = int(distance * next(factors))
+    return sorted(numbers)
+
+
+def build_pagination(listing):
+    """Prev/next and page links below the cards; empty for a single-page listing."""
+    if listing["pages"] == 1:
+        return ""
+    lines = ["", "", '  <nav class="lp-pagination" aria-label="Страницы">']
+    if listing["prev"]:
+        lines.append(f'    <a href="{listing["prev"]}" rel="prev">&larr; Назад</a>')
+    last = 0
+    for m in pagination_numbers(listing["n"], listing["pages"]):
+        if m > last + 1:
+            lines.append("    <span>&hellip;</span>")
+        if m == listing["n"]:
+            lines.append(f'    <span aria-current="page">{m}</span>')
+        else:
+            lines.append(f'    <a href="{listing_file(listing["stem"], m)}">{m}</a>')
+        last = m
+    if listing["next"]:
+        lines.append(f'    <a href="{listing["next"]}" rel="next">Далее &rarr;</a>')
+    lines.append("  </nav>")
+    return "\n".join(lines)
+
+
+def _build_blog_index_slots(filename, join):
+    """Slot values for one blog listing page; ``join`` combines the cards."""
+    listing = blog_listings()[filename]
+    n = listing["n"]
+    page = f" — страница {n}" if n > 1 else ""
+    url = canonical_url(filename)
+    if listing["topic"]:
+        label = listing["topic"][1]
+        name = f"{label}: статьи о шторах"
+        description = f"Статьи Curtains World по теме «{label}»: советы по шторам, жалюзи и карнизам в Дубае."
+        subtitle = f"Статьи по теме «{label}»"
+        crumb = label + page
+    else:
+        name = BLOG_INDEX_TITLE
+        description = BLOG_INDEX_DESCRIPTION
+        subtitle = "Полезные статьи о выборе, установке и уходе за шторами в ОАЭ"
+        crumb = f"Страница {n}" if n > 1 else None
+    if crumb:
+        trail = [("Блог", f"{BASE_URL}/blog"), (crumb, url)]
+        breadcrumb = f'    <a href="blog.html">Блог</a>\n    <span>/</span>\n    {escape(crumb)}'
+    else:
+        trail = [("Блог", url)]
+        breadcrumb = "    Блог"
+    rel_links = "".join(
+        f'\n  <link rel="{rel}" href="{canonical_url(listing[rel])}">'
+        for rel in ("prev", "next") if listing[rel]
+    )
+    return dict(
+        title=escape(f"{name}{page} | Curtains World"),
+        canonical=url,
+        description=escape(description),
+        keywords="шторы дубай блог, советы по шторам ОАЭ, выбор штор дубай",
+        rel_links=rel_links,
+        breadcrumb_trail=breadcrumb,
+        h1=escape(name),
+        subtitle=escape(subtitle + (f", страница {n}" if n > 1 else "")),
+        topic_links=join(build_topic_links(listing["stem"])),
+        nav_links=build_nav_links_html("blog"),
+        json_ld=build_blog_index_schema(url, name + page, description, trail),
+        cards=join(build_blog_cards(listing["articles"])),
+        pagination=build_pagination(listing),
+        footer=build_footer_html(),
+    )
+
+
+def generate_blog_index(filename="blog.html"):
+    """Generate one page of the blog index or a topic archive."""
+    return page_layout(BLOG_INDEX_LAYOUT).render(**_build_blog_index_slots(filename, "\n".join))
+
+
+def stream_blog_index(filename="blog.html"):
+    """Yield one blog listing page as encoded chunks."""
+    return page_layout(BLOG_INDEX_LAYOUT).stream(**_build_blog_index_slots(filename, iter_lines))
+
+
+# The sitemap is split into gzip-compressed shards, sitemap-1.xml.gz,
+# sitemap-2.xml.gz, ..., listed by sitemap-index.xml. Shard boundaries are
+# planned once per build from the entry sizes; each shard is then streamed
+# entry by entry through the compressor, so memory does not grow with the
+# number of URLs.
+SITEMAP_INDEX = "sitemap-index.xml"
+SITEMAP_MAX_URLS = 50000  # per shard, the sitemap protocol limit
+SITEMAP_MAX_BYTES = 50 * 1024 * 1024  # per shard, uncompressed; ditto
+IMAGE_TYPES = (".avif", ".webp", ".png", ".jpg", ".jpeg", ".gif", ".svg")
+HOME_PAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "home.html")
+
+SITEMAP_LAYOUT = Layout("""<?xml version="1.0" encoding="UTF-8"?>
 <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
         xmlns:image="http://www.google.com/schemas/sitemap-image/1.1"
         xmlns:xhtml="http://www.w3.org/1999/xhtml">
-{chr(10).join(urls)}
+{{urls}}
 </urlset>
+""")
+
+SITEMAP_INDEX_LAYOUT = Layout("""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+{{sitemaps}}
+</sitemapindex>
+""")
+
+
+def gzip_chunks(chunks):
+    """Gzip a stream of byte chunks at level 9, chunk by chunk.
+
+    The gzip header carries no file name and a zero mtime, so the same
+    sitemap always compresses to the same bytes and is skipped as identical.
+    """
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def home_images():
+    """Images of the hand-written home page, hero first, from the asset index.
+
+    Every image in the asset manifest that home.html references, in page
+    order, with variants replaced by their sources; without a manifest,
+    every image path it references.
+    """
+    return FRAGMENTS.get("home_images", _build_home_images)
+
+
+def _build_home_images():
+    try:
+        with open(HOME_PAGE, encoding="utf-8") as f:
+            refs = [IMAGE_SOURCES.get(ref, ref) for ref in ASSET_REF_RE.findall(f.read())]
+    except FileNotFoundError:
+        refs = []
+    known = set(ASSETS.values())
+    images = [
+        ref for ref in refs
+        if ref.lower().endswith(IMAGE_TYPES) and (ref in known or not ASSETS)
+    ]
+    return list(dict.fromkeys([HERO_IMAGE] + images))
+
+
+def sitemap_entries():
+    """Yield ``(path, changefreq, priority, images)`` for every page, home first."""
+    yield "home.html", "weekly", "1.0", home_images()
+    for slug, _ in ALL_LANDING_PAGES:
+        yield f"{slug}.html", "weekly", "0.8", ()
+    for slug in matrix_cells():
+        yield f"{slug}.html", "monthly", "0.5", ()
+    for filename in blog_listings():
+        yield filename, "weekly", "0.7" if filename == "blog.html" else "0.4", ()
+    for slug, _ in ALL_BLOG_ARTICLES:
+        yield f"{slug}.html", "monthly", "0.6", (HERO_IMAGE,)
+
+
+def sitemap_lastmod(path):
+    """The date ``path`` last changed, per the lastmod history."""
+    return LASTMOD.lastmod(path) or today()
+
+
+def build_sitemap_url(path, changefreq, priority, images):
+    """Render one ``<url>`` entry with its ``<image:image>`` children."""
+    lastmod = sitemap_lastmod(path)
+    lines = ["  <url>", f"    <loc>{BASE_URL}/{path}</loc>"]
+    if path == "home.html":
+        lines.append(f'    <xhtml:link rel="alternate" hreflang="ru" href="{BASE_URL}/{path}" />')
+    lines += [
+        f"    <lastmod>{lastmod}</lastmod>",
+        f"    <changefreq>{changefreq}</changefreq>",
+        f"    <priority>{priority}</priority>",
+    ]
+    for image in images:
+        lines += ["    <image:image>", f"      <image:loc>{BASE_URL}/{image}</image:loc>", "    </image:image>"]
+    lines.append("  </url>")
+    return "\n".join(lines)
+
+
+def sitemap_shards():
+    """``(start, stop)`` entry ranges of the sitemap shards, planned once per build.
+
+    A shard is closed before it would exceed SITEMAP_MAX_URLS entries or
+    SITEMAP_MAX_BYTES; only the boundaries are kept.
+    """
+    return FRAGMENTS.get("sitemap_shards", _plan_sitemap_shards)
+
+
+def _plan_sitemap_shards():
+    frame = sum(len(segment) for segment in SITEMAP_LAYOUT.segments)
+    shards = []
+    start = count = 0
+    size = frame
+    for i, entry in enumerate(sitemap_entries()):
+        length = len(build_sitemap_url(*entry).encode("utf-8")) + 1  # + "\n"
+        if count and (count == SITEMAP_MAX_URLS or size + length > SITEMAP_MAX_BYTES):
+            shards.append((start, i))
+            start, count, size = i, 0, frame
+        count += 1
+        size += length
+    shards.append((start, start + count))
+    return shards
+
+
+def build_sitemap_shard(n):
+    """Yield the ``<url>`` entries of shard ``n`` (1-based)."""
+    start, stop = sitemap_shards()[n - 1]
+    for entry in itertools.islice(sitemap_entries(), start, stop):
+        yield build_sitemap_url(*entry)
+
+
+def generate_sitemap_shard(n):
+    """Generate sitemap-N.xml.gz in memory."""
+    return b"".join(stream_sitemap_shard(n))
+
+
+def stream_sitemap_shard(n):
+    """Yield sitemap-N.xml.gz as compressed chunks, one entry at a time."""
+    return gzip_chunks(SITEMAP_LAYOUT.stream(urls=iter_lines(build_sitemap_shard(n))))
+
+
+def build_sitemap_index():
+    """Yield the ``<sitemap>`` entry of every shard, dated by its newest URL."""
+    entries = sitemap_entries()
+    for n, (start, stop) in enumerate(sitemap_shards(), 1):
+        lastmod = max(sitemap_lastmod(entry[0]) for entry in itertools.islice(entries, stop - start))
+        yield f"""  <sitemap>
+    <loc>{BASE_URL}/sitemap-{n}.xml.gz</loc>
+    <lastmod>{lastmod}</lastmod>
+  </sitemap>"""
+
+
+def generate_sitemap_index():
+    """Generate sitemap-index.xml, listing every shard."""
+    return SITEMAP_INDEX_LAYOUT.render(sitemaps="\n".join(build_sitemap_index()))
+
+
+def stream_sitemap_index():
+    """Yield sitemap-index.xml as encoded chunks."""
+    return SITEMAP_INDEX_LAYOUT.stream(sitemaps=iter_lines(build_sitemap_index()))
+
+
+# ---------------------------------------------------------------------------
+# Minification
+# ---------------------------------------------------------------------------
+MINIFY = False  # set by --minify through use_minify()
+
+# Elements around which whitespace never renders, so it can be dropped.
+# script and style count too: the layouts only place them between blocks.
+BLOCK_TAGS = (
+    b"!DOCTYPE|html|head|body|title|meta|link|base|div|section|article|header|"
+    b"footer|nav|main|aside|ul|ol|li|p|h[1-6]|details|summary|table|thead|tbody|"
+    b"tr|td|th|form|noscript|br|hr|script|style"
+)
+# Comments and elements whose text is not markup. Tags are matched in lower
+# case, as the layouts write them; the bodies are scanned with unrolled
+# loops instead of a lazy ``.*?``, which is several times faster.
+RAW_RE = re.compile(
+    rb"(<!--(?!\[)[^-]*(?:-(?!->)[^-]*)*-->"
+    rb"|<(pre|textarea|script|style)\b[^>]*>[^<]*(?:<(?!/\2>)[^<]*)*</\2>)"
+)
+RAW_PARTS_RE = re.compile(rb"(<(\w+)\b[^>]*>)(.*)(</\w+>)$", re.S)
+BLOCK_TAG_AT = re.compile(rb"/?(?:" + BLOCK_TAGS + rb")\b").match
+CSS_MINIFY_RE = re.compile(
+    r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|\s*([{};,])\s*|:\s+|\s+"""
+)
+
+
+def use_minify(enabled):
+    """Switch minified output on or off; also makes JSON-LD compact at source."""
+    global MINIFY
+    MINIFY = enabled
+    FRAGMENTS.clear()
+
+
+def _minify_css_token(m):
+    if m.group(1):
+        return m.group(1)
+    if m.group(2):
+        return m.group(2)
+    return ":" if m.group(0).startswith(":") else " "
+
+
+@functools.lru_cache(maxsize=256)
+def minify_raw(element):
+    """Minify one ``<script>``, ``<style>``, ``<pre>`` or ``<textarea>`` element.
+
+    ``<pre>``, ``<textarea>`` and external scripts are kept verbatim. JSON-LD
+    is re-serialized without whitespace. Other inline scripts keep their
+    line breaks (automatic semicolon insertion depends on them) and only
+    lose indentation and blank lines. CSS loses comments and the spaces
+    around punctuation outside strings. Cached, since the inline CSS and
+    scripts repeat on every page of a type.
+    """
+    open_tag, tag, body, close_tag = RAW_PARTS_RE.match(element).groups()
+    tag = tag.lower()
+    attrs = open_tag.lower()
+    if tag in (b"pre", b"textarea") or b"src=" in attrs:
+        return element
+    if tag == b"style":
+        css = CSS_COMMENT_RE.sub("", body.decode("utf-8"))
+        css = CSS_MINIFY_RE.sub(_minify_css_token, css).strip()
+        body = css.replace(";}", "}").encode("utf-8")
+    elif b"ld+json" in attrs:
+        body = body.strip()
+        if b"\n" in body:  # pretty-printed; to_json_ld is compact under --minify
+            body = json.dumps(json.loads(body), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    else:
+        lines = (line.strip() for line in body.splitlines())
+        body = b"\n".join(line for line in lines if line)
+    return open_tag + body + close_tag
+
+
+def minify_text(text):
+    """Collapse the whitespace in markup between raw elements.
+
+    Runs shrink to one space; a space between two tags goes too when
+    either of them is block-level. ``bytes.split`` does the collapsing in
+    C, so Python only looks at the tag boundaries.
+    """
+    words = text.split()
+    if not words:
+        return b""
+    collapsed = b" ".join(words)
+    # Keep an edge space unless it touches a block-level tag.
+    if text[:1].isspace() and not (collapsed[:1] == b"<" and BLOCK_TAG_AT(collapsed, 1)):
+        collapsed = b" " + collapsed
+    if text[-1:].isspace() and not (
+        collapsed[-1:] == b">" and BLOCK_TAG_AT(collapsed, collapsed.rfind(b"<") + 1)
+    ):
+        collapsed += b" "
+    pieces = collapsed.split(b"> <")
+    out = [pieces[0]]
+    for prev, piece in zip(pieces, pieces[1:]):
+        block = BLOCK_TAG_AT(piece) or BLOCK_TAG_AT(prev, prev.rfind(b"<") + 1)
+        out.append(b"><" if block else b"> <")
+        out.append(piece)
+    return b"".join(out)
+
+
+@functools.lru_cache(maxsize=1024)
+def minify_fragment(value):
+    """Encode and minify one slot value; returns ``(minified, encoded size)``.
+
+    Cached: the nav, footer and link lists repeat across pages, and their
+    strings come from the fragment cache with their hash already computed.
+    """
+    data = value.encode("utf-8")
+    return minify_html(data), len(data)
+
+
+def minify_html(data):
+    """Minify an HTML document given as bytes.
+
+    Drops comments, collapses insignificant whitespace (``minify_text``)
+    and compacts inline CSS, scripts and JSON-LD (``minify_raw``);
+    ``<pre>`` and ``<textarea>`` are copied verbatim. The markup is
+    handled by C-level splits and joins, and the raw elements repeating on
+    every page are cached. Pages do not go through this whole: see
+    MinifiedLayout.
+    """
+    parts = RAW_RE.split(data)
+    out, text = [], [parts[0]]
+    for i in range(1, len(parts), 3):
+        element = parts[i]
+        if not element.startswith(b"<!--"):
+            out.append(minify_text(b"".join(text)))
+            out.append(minify_raw(element))
+            text = []
+        text.append(parts[i + 2])
+    out.append(minify_text(b"".join(text)))
+    return b"".join(out)
+
+
+# ---------------------------------------------------------------------------
+# Incremental build manifest
+# ---------------------------------------------------------------------------
+MANIFEST_FILE = ".build-manifest.json"
+
+
+# Helpers the pages are known to go through. template_version() fails if one
+# of them is no longer reached from the renderers (called through a table,
+# say), rather than letting an edit to it leave stale pages behind.
+RENDER_HELPERS = (
+    "link_item", "drop_line",
+    "MinifiedLayout", "minify_fragment", "minify_html", "minify_text", "minify_raw",
+    "to_json_ld", "json_ld_graph",
+    "pagination_numbers", "canonical_url", "listing_file",
+)
+
+
+def code_names(code):
+    """Global names used by ``code`` and the functions nested in it."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= code_names(const)
+    return names
+
+
+def render_code():
+    """Names of this module's functions and classes the renderers reach.
+
+    Starts from the build_ / generate_ / stream_ functions and follows the
+    global names each one uses, through classes and their methods too.
+    """
+    module = globals()
+    queue = [name for name, obj in module.items()
+             if inspect.isfunction(obj) and name.lstrip("_").startswith(("build_", "generate_", "stream_"))]
+    reached = set()
+    while queue:
+        name = queue.pop()
+        obj = inspect.unwrap(module[name]) if callable(module.get(name)) else None
+        if name in reached or getattr(obj, "__module__", None) != __name__:
+            continue
+        if inspect.isfunction(obj):
+            queue.extend(code_names(obj.__code__))
+        elif inspect.isclass(obj):
+            for base in obj.__mro__[1:]:
+                queue.append(base.__name__)
+            for attr in vars(obj).values():
+                attr = getattr(attr, "__func__", getattr(attr, "fget", attr))
+                if inspect.isfunction(attr):
+                    queue.extend(code_names(attr.__code__))
+        else:
+            continue
+        reached.add(name)
+    return reached
+
+
+@functools.lru_cache(maxsize=None)
+def template_version():
+    """Fingerprint of the rendering code, so markup edits invalidate outputs.
+
+    Hashes the source of everything render_code() reaches, and the layouts.
+    """
+    reached = render_code()
+    missing = sorted(set(RENDER_HELPERS) - reached)
+    if missing:
+        raise RuntimeError(f"template_version(): renderers no longer reach {', '.join(missing)}")
+    h = hashlib.sha256()
+    for name in sorted(reached):
+        h.update(inspect.getsource(inspect.unwrap(globals()[name])).encode("utf-8"))
+    for name, obj in sorted(globals().items()):
+        if isinstance(obj, Layout):
+            h.update(name.encode("utf-8"))
+            h.update(b"\0".join(obj.segments))
+            h.update(" ".join(obj.slots).encode("utf-8"))
+    return h.hexdigest()
+
+
+def fingerprint(*parts):
+    """Return a stable SHA-256 hex digest of JSON-serializable parts."""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(json.dumps(part, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def render_landing(slug):
+    return generate_page(load_page(slug))
+
+
+def article_with_lastmod(slug):
+    """The article dated with its last recorded ``date_modified``.
+
+    The real date depends on the rendered page, whose digest ignores the
+    date: the page is rendered once with the date it keeps if unchanged,
+    and corrected afterwards (set_date_modified(), DigestStream) if not.
+    """
+    filename = f"{slug}.html"
+    return dict(load_article(slug), date_modified=LASTMOD.lastmod(filename) or today())
+
+
+def render_article(slug):
+    content = generate_blog_article(article_with_lastmod(slug))
+    return set_date_modified(content, LASTMOD.date_for(f"{slug}.html", output_digest(content)))
+
+
+def stream_landing(slug):
+    return stream_page(load_page(slug))
+
+
+def render_matrix(slug):
+    return generate_page(load_matrix_page(slug))
+
+
+def stream_matrix(slug):
+    return stream_page(load_matrix_page(slug))
+
+
+def stream_article(slug):
+    article = article_with_lastmod(slug)
+    return DigestStream(stream_blog_article(article), f"{slug}.html", article["date_modified"])
+
+
+def target_inputs():
+    """Map every output to the input keys it is rendered from.
+
+    Keys are tuples: ``("code",)`` for the templates and shared constants,
+    ``("pages", slug)`` / ``("blog", slug)`` for content files,
+    ``("table", name)`` for the index lists, ``("related", table, slug)``
+    for one page's related links, ``("area", slug)`` for a landing page's
+    matrix links, ``("listing", filename)`` for one page
+    of a blog listing, ``("matrix", slug)`` for one expanded matrix cell,
+    ``("images", "home")`` for the home page's images and ``("lastmod",)``
+    for the lastmod history, which build() settles before rendering the
+    outputs that use it.
+    """
+    common = [("code",), ("table", "landing_pages"), ("table", "blog_topics")]
+    blog_table = ("table", "blog_articles")
+    inputs = {}
+    for slug, _ in ALL_LANDING_PAGES:
+        inputs[f"{slug}.html"] = common + [
+            ("pages", slug),
+            ("area", slug),
+            ("related", "product_blog", slug),
+        ] + [("blog", blog_slug) for blog_slug, _ in related_links("product_blog", slug)]
+    for slug, _ in ALL_BLOG_ARTICLES:
+        inputs[f"{slug}.html"] = common + [
+            ("blog", slug),
+            ("related", "blog_blog", slug),
+            ("related", "blog_product", slug),
+        ]
+    for slug, page in matrix_cells().items():
+        product = MATRIX["products"][page[0]]["page"]
+        inputs[f"{slug}.html"] = common + [
+            ("matrix", slug),
+            ("area", slug),
+            ("related", "product_blog", product),
+        ] + [("blog", blog_slug) for blog_slug, _ in related_links("product_blog", product)]
+    for filename, listing in blog_listings().items():
+        inputs[filename] = common + [("listing", filename)] + [("blog", slug) for slug in listing["articles"]]
+    search = common + [blog_table] + [("pages", slug) for slug, _ in ALL_LANDING_PAGES] + [
+        ("blog", slug) for slug, _ in ALL_BLOG_ARTICLES
+    ]
+    inputs[SEARCH_META] = search
+    for prefix in search_shards():
+        inputs[search_shard_file(prefix)] = search
+    inputs[STYLESHEET_HREF] = [("code",)]
+    sitemap = common + [blog_table, ("table", "matrix"), ("table", "listings"), ("images", "home"), ("lastmod",)]
+    inputs[SITEMAP_INDEX] = sitemap
+    for n in range(1, len(sitemap_shards()) + 1):
+        inputs[f"sitemap-{n}.xml.gz"] = sitemap
+    return inputs
+
+
+def input_value(key):
+    """Current value of one input key, as hashed into output fingerprints."""
+    kind = key[0]
+    if kind == "code":
+        return [BASE_URL, PHONE, PHONE_LINK, WA_LINK, EMAIL, MINIFY, ASSETS, template_version()]
+    if kind in ("pages", "blog"):
+        return STORE.source_hash(kind, key[1])
+    if kind == "table":
+        if key[1] == "matrix":
+            return list(matrix_cells())
+        if key[1] == "listings":
+            return list(blog_listings())
+        if key[1] == "blog_topics":
+            return blog_topic_links()
+        return {"landing_pages": ALL_LANDING_PAGES, "blog_articles": ALL_BLOG_ARTICLES}[key[1]]
+    if kind == "listing":
+        return blog_listings()[key[1]]
+    if kind == "matrix":
+        return load_matrix_page(key[1])
+    if kind == "related":
+        return related_links(key[1], key[2])
+    if kind == "area":
+        return area_links(key[1])
+    if kind == "images":
+        return home_images()
+    if kind == "lastmod":
+        return LASTMOD.snapshot()
+    raise KeyError(key)
+
+
+def input_hash(key):
+    """Digest of one input's current value; target fingerprints combine these."""
+    return fingerprint(input_value(key))
+
+
+def collect_targets():
+    """List every output with its inputs and a hash of their current values.
+
+    Each target is a dict with ``filename``, ``inputs``, ``fingerprint``,
+    the ``render`` and ``stream`` callables and their ``args``. Fingerprints use the content
+    files' hashes, so unchanged outputs are skipped without parsing or
+    rendering anything.
+    """
+    renderers = {}
+    for slug, _ in ALL_LANDING_PAGES:
+        renderers[f"{slug}.html"] = (render_landing, stream_landing, (slug,))
+    for slug, _ in ALL_BLOG_ARTICLES:
+        renderers[f"{slug}.html"] = (render_article, stream_article, (slug,))
+    for slug in matrix_cells():
+        renderers[f"{slug}.html"] = (render_matrix, stream_matrix, (slug,))
+    for filename in blog_listings():
+        renderers[filename] = (generate_blog_index, stream_blog_index, (filename,))
+    renderers[SEARCH_META] = (generate_search_meta, stream_search_meta, ())
+    for prefix in search_shards():
+        renderers[search_shard_file(prefix)] = (generate_search_shard, stream_search_shard, (prefix,))
+    renderers[STYLESHEET_HREF] = (generate_stylesheet, stream_stylesheet, ())
+    renderers[SITEMAP_INDEX] = (generate_sitemap_index, stream_sitemap_index, ())
+    for n in range(1, len(sitemap_shards()) + 1):
+        renderers[f"sitemap-{n}.xml.gz"] = (generate_sitemap_shard, stream_sitemap_shard, (n,))
+
+    values = {}
+    targets = []
+    for filename, inputs in target_inputs().items():
+        for key in inputs:
+            if key not in values:
+                values[key] = input_hash(key)
+        render, stream, args = renderers[filename]
+        targets.append({
+            "filename": filename,
+            "inputs": inputs,
+            "fingerprint": fingerprint(*(values[key] for key in inputs)),
+            "render": render,
+            "stream": stream,
+            "args": args,
+        })
+    return targets
+
+
+def load_manifest(path):
+    """Load the output -> input-hash map from the last build (empty if absent)."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data.get("outputs", {})
+
+
+def save_manifest(path, outputs):
+    """Persist the output -> input-hash map for the next incremental build."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "outputs": outputs}, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+# ---------------------------------------------------------------------------
+# Lastmod history
+# ---------------------------------------------------------------------------
+# lastmod.json (committed with the site) records, per output, a hash of its
+# rendered bytes and the day that hash last changed. Sitemap <lastmod> and
+# the articles' dateModified come from it, so they only move when a page
+# really changed, not on every build. An article shows its own date, so
+# the hash skips the dateModified value; otherwise the date would change
+# the page, and the page the date, every day.
+LASTMOD_FILE = "lastmod.json"
+DATE_MODIFIED_RE = re.compile(rb'("dateModified":\s*")[^"]*(")')
+
+
+def output_digest(data):
+    """SHA-256 of an output with its dateModified values blanked out."""
+    return hashlib.sha256(DATE_MODIFIED_RE.sub(rb"\1\2", data)).hexdigest()
+
+
+def file_digest(path):
+    with open(path, "rb") as f:
+        return output_digest(f.read())
+
+
+def set_date_modified(data, date):
+    """``data`` with every dateModified value set to ``date``."""
+    return DATE_MODIFIED_RE.sub(rb"\g<1>" + date.encode("ascii") + rb"\2", data)
+
+
+class DigestStream:
+    """Chunks of a streamed output, digested like output_digest() on the way.
+
+    A dateModified value must not straddle two chunks; the JSON-LD slot is
+    always one. With ``filename`` and the ``date`` the page was rendered
+    with, settle() afterwards corrects the date in the staged file if the
+    history assigns the digest another one, without holding the page.
+    """
+
+    def __init__(self, chunks, filename=None, date=None):
+        self.chunks = chunks
+        self.filename = filename
+        self.date = date
+        self.hash = hashlib.sha256()
+        self.size = 0
+        self.offsets = []  # positions of the dateModified values
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            for m in DATE_MODIFIED_RE.finditer(chunk):
+                self.offsets.append(self.size + m.end(1))
+            self.hash.update(DATE_MODIFIED_RE.sub(rb"\1\2", chunk))
+            self.size += len(chunk)
+            yield chunk
+
+    def digest(self):
+        return self.hash.hexdigest()
+
+    def settle(self, dest, tmp, changed):
+        """Patch the date staged at ``tmp``; returns the new ``changed``."""
+        if self.filename is None:
+            return changed
+        date = LASTMOD.date_for(self.filename, self.digest())
+        if date == self.date:
+            return changed
+        if not changed:
+            shutil.copyfile(dest, tmp)  # identical bytes, stale date
+        with open(tmp, "r+b") as f:
+            for offset in self.offsets:
+                f.seek(offset)
+                f.write(date.encode("ascii"))  # ISO dates all have one length
+        return True
+
+
+def today():
+    from datetime import date
+    return date.today().isoformat()
+
+
+class LastmodHistory:
+    """Per-output content hash and the date it last changed."""
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.entries = json.load(f).get("outputs", {})
+        except (OSError, ValueError):
+            self.entries = {}
+        self.dirty = False
+
+    def lastmod(self, filename):
+        """Date ``filename`` last changed, or None if it was never recorded."""
+        entry = self.entries.get(filename)
+        return entry["lastmod"] if entry else None
+
+    def date_for(self, filename, digest):
+        """Date to show for ``filename`` if it renders to ``digest``."""
+        entry = self.entries.get(filename)
+        if entry and entry["sha256"] == digest:
+            return entry["lastmod"]
+        return today()
+
+    def record(self, filename, digest):
+        """Note the digest of a rendered output, advancing its date if it changed."""
+        entry = self.entries.get(filename)
+        if not entry or entry["sha256"] != digest:
+            self.entries[filename] = {"sha256": digest, "lastmod": self.date_for(filename, digest)}
+            self.dirty = True
+
+    def prune(self, filenames):
+        """Forget outputs that are no longer generated."""
+        for filename in self.entries.keys() - set(filenames):
+            del self.entries[filename]
+            self.dirty = True
+
+    def snapshot(self):
+        return {filename: entry["lastmod"] for filename, entry in self.entries.items()}
+
+    def save(self):
+        if not self.dirty:
+            return
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "outputs": self.entries}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        self.dirty = False
+
+
+LASTMOD = LastmodHistory(os.path.join(os.path.dirname(os.path.abspath(__file__)), LASTMOD_FILE))
+
+
+def use_lastmod(path):
+    """Read and record lastmod dates in ``path`` (the site being built)."""
+    global LASTMOD
+    LASTMOD = LastmodHistory(path)
+
+
+def minify_saved(target, before):
+    """Bytes minification saved on ``target`` since ``MinifiedLayout.saved`` was ``before``."""
+    if MINIFY and target["filename"].endswith(".html"):
+        return MinifiedLayout.saved - before
+    return None
+
+
+def render_target(target):
+    """Render one target; top-level so it can run in a worker process.
+
+    Returns ``(content, bytes saved by --minify or None)``.
+    """
+    before = MinifiedLayout.saved
+    content = target["render"](*target["args"])
+    return content, minify_saved(target, before)
+
+
+def stream_target(target):
+    """Stream one target into its staging file; top-level for worker processes.
+
+    Returns ``(changed, size, bytes saved by --minify or None, digest)``;
+    the digest is output_digest() of the staged bytes.
+    """
+    before = MinifiedLayout.saved
+    chunks = target["stream"](*target["args"])
+    if not isinstance(chunks, DigestStream):
+        chunks = DigestStream(chunks)
+    changed, size = stage_stream(target["dest"], target["tmp"], chunks)
+    changed = chunks.settle(target["dest"], target["tmp"], changed)
+    return changed, size, minify_saved(target, before), chunks.digest()
+
+
+def init_worker(content_dir, minify, lastmod_path):
+    """Give a spawned worker the parent's content directory and settings."""
+    if STORE.root != content_dir:
+        use_content(content_dir)
+    if LASTMOD.path != lastmod_path:
+        use_lastmod(lastmod_path)
+    if MINIFY != minify:
+        use_minify(minify)
+
+
+def render_targets(targets, jobs, work=render_target):
+    """Yield ``(target, work(target))`` in input order on ``jobs`` cores.
+
+    Workers receive targets in batches and hand back whole batches, so IPC
+    overhead stays small and the parent writes each file as soon as its
+    batch arrives. Ordering follows the input, keeping output deterministic.
+    """
+    if jobs <= 1 or len(targets) <= 1:
+        for target in targets:
+            yield target, work(target)
+        return
+    warm_fragments()
+    chunksize = max(1, len(targets) // (jobs * 4))
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=init_worker, initargs=(STORE.root, MINIFY, LASTMOD.path),
+    ) as pool:
+        yield from zip(targets, pool.map(work, targets, chunksize=chunksize))
+
+
+# ---------------------------------------------------------------------------
+# Output writer
+# ---------------------------------------------------------------------------
+STREAM_BUFFER = 64 * 1024  # write buffer for streamed outputs
+
+
+def stage_stream(dest, tmp, chunks):
+    """Write ``chunks`` to ``tmp`` while comparing them against ``dest``.
+
+    Returns ``(changed, size)``. Only one chunk and the file buffers are held
+    at a time; if the stream turns out identical to ``dest``, ``tmp`` is
+    removed again.
+    """
+    try:
+        old = open(dest, "rb")
+    except OSError:
+        old = None
+    same = old is not None
+    size = 0
+    try:
+        with open(tmp, "wb", buffering=STREAM_BUFFER) as f:
+            for chunk in chunks:
+                f.write(chunk)
+                size += len(chunk)
+                if same and old.read(len(chunk)) != chunk:
+                    same = False
+        if same and old.read(1):
+            same = False
+    finally:
+        if old is not None:
+            old.close()
+    if same:
+        os.remove(tmp)
+    return not same, size
+
+
+class OutputWriter:
+    """Write generated files, skipping no-op writes and swapping in atomically.
+
+    Each output is compared with the bytes already on disk; identical files
+    are left alone so their mtime survives. Changed files are staged in a
+    temporary directory inside the site and only moved into place with
+    ``os.replace`` by ``commit()``, so a build that crashes halfway leaves
+    the previous site untouched. Use as a context manager: a clean exit
+    commits, an exception discards the staged files.
+    """
+
+    def __init__(self, site_dir):
+        self.site_dir = site_dir
+        self.staging = tempfile.mkdtemp(prefix=".build-", dir=site_dir)
+        self.staged = []
+        self.counter = itertools.count()
+        self.written = []
+        self.skipped = []
+        self.removed = []
+        self.bytes_written = 0
+        self.bytes_skipped = 0
+        self.minified_pages = 0
+        self.bytes_minified = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+    def unchanged(self, path, data):
+        try:
+            if os.path.getsize(path) != len(data):
+                return False
+            with open(path, "rb") as f:
+                return f.read() == data
+        except OSError:
+            return False
+
+    def dest(self, filename):
+        return os.path.join(self.site_dir, filename)
+
+    def stage_path(self):
+        """Reserve a fresh file name in the staging directory."""
+        return os.path.join(self.staging, str(next(self.counter)))
+
+    def record(self, filename, tmp, changed, size):
+        """Account for an output staged at ``tmp`` (or skipped as identical)."""
+        if changed:
+            self.staged.append((tmp, self.dest(filename)))
+            self.written.append(filename)
+            self.bytes_written += size
+        else:
+            self.skipped.append(filename)
+            self.bytes_skipped += size
+        return changed
+
+    def write(self, filename, data):
+        """Stage ``data`` for ``filename``; return False if it is unchanged."""
+        if self.unchanged(self.dest(filename), data):
+            return self.record(filename, None, False, len(data))
+        tmp = self.stage_path()
+        with open(tmp, "wb") as f:
+            f.write(data)
+        return self.record(filename, tmp, True, len(data))
+
+    def write_stream(self, filename, chunks):
+        """Stage an iterable of byte chunks for ``filename`` without joining it."""
+        tmp = self.stage_path()
+        changed, size = stage_stream(self.dest(filename), tmp, chunks)
+        return self.record(filename, tmp, changed, size)
+
+    def minified(self, saved):
+        """Count the bytes minification saved on one output (None: not minified)."""
+        if saved is not None:
+            self.minified_pages += 1
+            self.bytes_minified += saved
+
+    def remove(self, filename):
+        """Delete an output that is no longer generated, on commit."""
+        if os.path.exists(self.dest(filename)):
+            self.removed.append(filename)
+
+    def commit(self):
+        for tmp, dest in self.staged:
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            os.replace(tmp, dest)
+        for filename in self.removed:
+            os.remove(self.dest(filename))
+        self.staged = []
+        os.rmdir(self.staging)
+
+    def abort(self):
+        shutil.rmtree(self.staging, ignore_errors=True)
+        self.staged = []
+
+    def summary(self):
+        summary = (
+            f"{len(self.written)} written ({self.bytes_written / 1024:.1f} KB), "
+            f"{len(self.skipped)} identical skipped ({self.bytes_skipped / 1024:.1f} KB)"
+        )
+        if self.removed:
+            summary += f", {len(self.removed)} stale removed"
+        if self.minified_pages:
+            summary += (
+                f", minify saved {self.bytes_minified / 1024:.1f} KB"
+                f" on {self.minified_pages} pages"
+            )
+        return summary
+
+
+def build(targets, previous, site_dir, jobs=1, stream=False, force=False):
+    """Render every target whose fingerprint differs from ``previous``.
+
+    Outputs listed in ``previous`` that are no longer targets (a dropped
+    matrix cell, say) are removed. ``force`` renders every target.
+    With ``stream``, pages are written chunk by chunk into the staging
+    directory (by the workers themselves when ``jobs`` > 1) instead of being
+    rendered to one bytes object first. Pages are rendered first and their
+    digests recorded in the lastmod history; targets that read the history
+    (the sitemap) are then re-fingerprinted and rendered. Returns the
+    OutputWriter after committing, for its written/skipped counts.
+    """
+    def pending(batch):
+        return [
+            t for t in batch
+            if force
+            or previous.get(t["filename"]) != t["fingerprint"]
+            or not os.path.exists(os.path.join(site_dir, t["filename"]))
+        ]
+
+    pages = [t for t in targets if ("lastmod",) not in t["inputs"]]
+    dated = [t for t in targets if ("lastmod",) in t["inputs"]]
+    stale = previous.keys() - {t["filename"] for t in targets}
+    with OutputWriter(site_dir) as writer:
+        for filename in sorted(stale):
+            writer.remove(filename)
+        todo = pending(pages)
+        for target in pages:
+            # Up to date but missing from the history (a lost lastmod.json).
+            if target not in todo and LASTMOD.lastmod(target["filename"]) is None:
+                LASTMOD.record(target["filename"], file_digest(writer.dest(target["filename"])))
+        render_into(writer, todo, jobs, stream, record=True)
+        if os.path.exists(HOME_PAGE):
+            LASTMOD.record("home.html", file_digest(HOME_PAGE))
+        for target in dated:
+            target["fingerprint"] = fingerprint(*map(input_hash, target["inputs"]))
+        render_into(writer, pending(dated), 1, stream)
+    return writer
+
+
+def render_into(writer, targets, jobs, stream, record=False):
+    """Render ``targets`` into ``writer``; ``record`` notes page digests in LASTMOD."""
+    if stream:
+        targets = [
+            dict(t, dest=writer.dest(t["filename"]), tmp=writer.stage_path())
+            for t in targets
+        ]
+        for target, (changed, size, saved, digest) in render_targets(targets, jobs, stream_target):
+            writer.minified(saved)
+            if record:
+                LASTMOD.record(target["filename"], digest)
+            if writer.record(target["filename"], target["tmp"], changed, size):
+                print(f"Generated: {target['filename']}{minify_note(saved, size)}")
+    else:
+        for target, (content, saved) in render_targets(targets, jobs):
+            writer.minified(saved)
+            if record:
+                LASTMOD.record(target["filename"], output_digest(content))
+            if writer.write(target["filename"], content):
+                print(f"Generated: {target['filename']}{minify_note(saved, len(content))}")
+
+
+def minify_note(saved, size):
+    """`` (minified: -N bytes, P%)`` for a minified output, empty otherwise."""
+    if saved is None:
+        return ""
+    return f" (minified: -{saved} bytes, {saved / (size + saved):.0%})"
+
+
+# ---------------------------------------------------------------------------
+# Watch mode and preview server
+# ---------------------------------------------------------------------------
+WATCH_INTERVAL = 0.25  # seconds between polls of the content directory
+LIVE_RELOAD_PATH = "/__livereload"
+LIVE_RELOAD_SCRIPT = b"""<script>
+(function(){
+  var session=null, page=location.pathname.split('/').pop()||'index.html';
+  var es=new EventSource('/__livereload');
+  es.onmessage=function(e){
+    var m=JSON.parse(e.data);
+    if(session===null){session=m.session;return;}
+    if(m.session!==session||m.files.indexOf(page)>=0){location.reload();}
+  };
+})();
+</script>
 """
-    return xml
-
-
-def main():
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-
-    for page in PAGES:
-        html = generate_page(page)
-        filepath = os.path.join(script_dir, page["filename"])
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(html)
-        print(f"Generated: {page['filename']}")
-
-    for article in BLOG_ARTICLES:
-        html = generate_blog_article(article)
-        filepath = os.path.join(script_dir, article["filename"])
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(html)
-        print(f"Generated: {article['filename']}")
-
-    # Blog index page
-    blog_html = generate_blog_index()
-    blog_filepath = os.path.join(script_dir, "blog.html")
-    with open(blog_filepath, "w", encoding="utf-8") as f:
-        f.write(blog_html)
-    print("Generated: blog.html")
-
-    # Sitemap
-    sitemap_xml = generate_sitemap()
-    sitemap_path = os.path.join(script_dir, "sitemap.xml")
-    with open(sitemap_path, "w", encoding="utf-8") as f:
-        f.write(sitemap_xml)
-    print("Generated: sitemap.xml")
-
-    total = len(PAGES) + len(BLOG_ARTICLES) + 1  # +1 for blog index
-    print(f"\nDone! Generated {len(PAGES)} landing pages + {len(BLOG_ARTICLES)} blog articles + 1 blog index + sitemap.xml = {total} pages + sitemap.")
+
+
+def scan_content(root):
+    """Map each watched content file to its modification time."""
+    mtimes = {("index",): os.stat(os.path.join(root, "index.json")).st_mtime_ns}
+    matrix = os.path.join(root, "matrix.json")
+    if os.path.exists(matrix):
+        mtimes[("matrix",)] = os.stat(matrix).st_mtime_ns
+    for kind in ContentStore.PARSERS:
+        with os.scandir(os.path.join(root, kind)) as entries:
+            for entry in entries:
+                if entry.name.endswith(".md"):
+                    mtimes[(kind, entry.name[:-3])] = entry.stat().st_mtime_ns
+    return mtimes
+
+
+class LiveReload:
+    """Fan rebuild notifications out to open preview tabs (server-sent events)."""
+
+    def __init__(self):
+        # A new session id after a restart makes every tab reload once.
+        self.session = os.urandom(4).hex()
+        self.cond = threading.Condition()
+        self.builds = []
+
+    def publish(self, files):
+        with self.cond:
+            self.builds.append(files)
+            self.cond.notify_all()
+
+    def stream(self, wfile):
+        """Send events to one client until it disconnects."""
+        with self.cond:
+            seen = len(self.builds)
+        self.send(wfile, [])
+        while True:
+            with self.cond:
+                self.cond.wait_for(lambda: len(self.builds) > seen, timeout=15)
+                new, seen = self.builds[seen:], len(self.builds)
+            if not new:
+                wfile.write(b": ping\n\n")
+                wfile.flush()
+            for files in new:
+                self.send(wfile, files)
+
+    def send(self, wfile, files):
+        data = json.dumps({"session": self.session, "files": files})
+        wfile.write(f"data: {data}\n\n".encode("utf-8"))
+        wfile.flush()
+
+
+def make_preview_handler(site_dir, live):
+    """Static file handler that injects the live-reload client into HTML."""
+
+    class PreviewHandler(SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=site_dir, **kwargs)
+
+        def log_message(self, format, *args):
+            pass  # keep the console for build output
+
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            if path == LIVE_RELOAD_PATH:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                try:
+                    live.stream(self.wfile)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                return
+            if path.endswith("/"):
+                path += "index.html"
+            filepath = self.translate_path(path)
+            if not path.endswith(".html") or not os.path.isfile(filepath):
+                return super().do_GET()
+            with open(filepath, "rb") as f:
+                body = f.read()
+            pos = body.rfind(b"</body>")
+            if pos == -1:
+                pos = len(body)
+            body = body[:pos] + LIVE_RELOAD_SCRIPT + body[pos:]
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(body)
+
+    return PreviewHandler
+
+
+def rebuild_changed(changed, outputs, site_dir):
+    """Rebuild after edits to the content keys in ``changed``.
+
+    An edited page moves more than its own output: the term counts behind
+    the related links of its neighbours, the search shards, the topic
+    archives and listings are all built from every entry. So the fragment
+    cache is dropped and every target re-fingerprinted (the per-entry
+    caches keep this cheap), and build() renders those whose fingerprint
+    moved. Returns ``(targets, outputs, writer)``.
+    """
+    if changed & {("index",), ("matrix",)}:
+        # The set of pages may have changed: build() drops what is gone.
+        use_content(STORE.root)
+    else:
+        FRAGMENTS.clear()
+    targets = collect_targets()
+    writer = build(targets, outputs, site_dir)
+    return targets, {t["filename"]: t["fingerprint"] for t in targets}, writer
+
+
+def watch(site_dir, manifest_path, outputs, port):
+    """Rebuild outputs affected by content edits and push reloads to the preview."""
+    live = LiveReload()
+    if port:
+        server = ThreadingHTTPServer(("127.0.0.1", port), make_preview_handler(site_dir, live))
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        print(f"\nPreview: http://127.0.0.1:{port}/blog.html")
+
+    code_path = os.path.abspath(__file__)
+    code_mtime = os.stat(code_path).st_mtime_ns
+    seen = scan_content(STORE.root)
+    print(f"Watching {STORE.root} for changes (Ctrl+C to stop)")
+
+    while True:
+        time.sleep(WATCH_INTERVAL)
+        if os.stat(code_path).st_mtime_ns != code_mtime:
+            # Templates live in this file; restart to pick them up. Open
+            # preview tabs reload when they reconnect to the new session.
+            print("\ngenerate_pages.py changed, restarting...")
+            os.execv(sys.executable, [sys.executable, code_path] + sys.argv[1:])
+
+        current = scan_content(STORE.root)
+        changed = {key for key in current.keys() | seen.keys() if current.get(key) != seen.get(key)}
+        seen = current
+        if not changed:
+            continue
+
+        started = time.perf_counter()
+        try:
+            _, outputs, writer = rebuild_changed(changed, outputs, site_dir)
+        except Exception as e:  # keep watching through content typos
+            print(f"Build failed: {e}")
+            continue
+        save_manifest(manifest_path, outputs)
+        STORE.save()
+        LASTMOD.save()
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"Rebuilt in {elapsed:.0f} ms: {writer.summary()}")
+        live.publish(writer.written)
+
+
+# ---------------------------------------------------------------------------
+# Profiling
+# ---------------------------------------------------------------------------
+PROFILE_SAMPLE_INTERVAL = 0.001  # seconds between stack samples for --stacks
+
+# Phase -> (owner, attribute) pairs wrapped while profiling. The owner is this
+# module (None) or a class; every call site looks the name up at call time.
+PROFILE_PHASES = {
+    "content load": [
+        (None, "load_matrix_page"),
+        ("ContentStore", "load"), ("ContentStore", "load_index"),
+        ("ContentStore", "load_matrix"), ("ContentStore", "source_hash"),
+    ],
+    "html.escape": [(None, "escape")],
+    "json.dumps (JSON-LD)": [(None, "to_json_ld")],
+    "minify": [("MinifiedLayout", "encode")],
+    "interpolation": [
+        (None, "render_landing"), (None, "render_article"), (None, "render_matrix"),
+        (None, "generate_blog_index"), (None, "generate_sitemap_shard"),
+        (None, "generate_sitemap_index"),
+    ],
+    "file I/O": [
+        ("OutputWriter", "write"), ("OutputWriter", "commit"), ("OutputWriter", "remove"),
+        (None, "load_manifest"), (None, "save_manifest"), ("ContentStore", "save"),
+    ],
+    "fingerprinting": [(None, "collect_targets")],
+}
+
+
+class PhaseTimer:
+    """Accumulate exclusive wall time per build phase.
+
+    Wrapped functions push their phase on entry and pop it on exit; time is
+    always charged to the innermost active phase, so an ``escape`` call
+    inside a renderer counts as escaping, not as interpolation.
+    """
+
+    def __init__(self):
+        self.totals = {}
+        self.calls = {}
+        self.stack = []
+        self.mark = time.perf_counter()
+
+    def switch(self):
+        now = time.perf_counter()
+        if self.stack:
+            phase = self.stack[-1]
+            self.totals[phase] = self.totals.get(phase, 0.0) + now - self.mark
+        self.mark = now
+
+    def wrap(self, phase, func):
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            self.switch()
+            self.stack.append(phase)
+            self.calls[phase] = self.calls.get(phase, 0) + 1
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.switch()
+                self.stack.pop()
+        return timed
+
+    def install(self):
+        """Wrap every PROFILE_PHASES entry point; return a function undoing it."""
+        undo = []
+        for phase, points in PROFILE_PHASES.items():
+            for owner, name in points:
+                target = sys.modules[__name__] if owner is None else globals()[owner]
+                original = getattr(target, name)
+                setattr(target, name, self.wrap(phase, original))
+                undo.append((target, name, original))
+
+        def uninstall():
+            for target, name, original in reversed(undo):
+                setattr(target, name, original)
+        return uninstall
+
+    def report(self, total):
+        print(f"\n{'phase':<24}{'seconds':>10}{'share':>8}{'calls':>9}")
+        rows = sorted(self.totals.items(), key=lambda item: -item[1])
+        for phase, seconds in rows:
+            print(f"{phase:<24}{seconds:>10.3f}{seconds / total:>8.1%}{self.calls[phase]:>9}")
+        other = total - sum(self.totals.values())
+        print(f"{'other':<24}{other:>10.3f}{other / total:>8.1%}")
+        print(f"{'total':<24}{total:>10.3f}")
+
+
+class StackSampler(threading.Thread):
+    """Sample the main thread's stack into flamegraph collapsed-stack counts."""
+
+    def __init__(self, interval=PROFILE_SAMPLE_INTERVAL):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.thread_id = threading.get_ident()
+        self.counts = {}
+        self.done = threading.Event()
+
+    def run(self):
+        # Let the sampler preempt the build thread about as often as it wakes.
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(self.interval / 2)
+        try:
+            while not self.done.wait(self.interval):
+                self.sample()
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+    def sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            # Leave out PhaseTimer's wrappers; they would split every stack.
+            if not (code.co_name == "timed" and code.co_filename == __file__):
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        key = ";".join(reversed(stack))
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def stop(self):
+        self.done.set()
+        self.join()
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.counts.items()):
+                f.write(f"{stack} {count}\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate landing pages, blog and sitemap.")
+    parser.add_argument(
+        "--force", action="store_true",
+        help="ignore the build manifest and regenerate every output",
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1,
+        help="render on N worker processes (0 = one per CPU core)",
+    )
+    parser.add_argument(
+        "--content", default=CONTENT_DIR,
+        help="content directory to build from (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--out", default=os.path.dirname(os.path.abspath(__file__)),
+        help="directory to write the site to (default: next to this script)",
+    )
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="write pages chunk by chunk instead of rendering each in memory first",
+    )
+    parser.add_argument(
+        "--minify", action="store_true",
+        help="minify HTML: drop comments and indentation, compact inline CSS, JS and JSON-LD",
+    )
+    parser.add_argument(
+        "--precompress", action="store_true",
+        help="write .br/.gz/.zst siblings of changed text files (see precompress.py)",
+    )
+    parser.add_argument(
+        "--report", action="store_true",
+        help="print the page weight report and fail if a page exceeds budgets.json",
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="report where build time goes, per phase (renders serially, in memory)",
+    )
+    parser.add_argument(
+        "--pstats", metavar="FILE",
+        help="with --profile, also dump cProfile statistics to FILE",
+    )
+    parser.add_argument(
+        "--stacks", metavar="FILE",
+        help="with --profile, also write sampled collapsed stacks to FILE (flamegraph.pl/speedscope)",
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="keep running, rebuild what an edit affects and serve a live preview",
+    )
+    parser.add_argument(
+        "--port", type=int, default=8000,
+        help="preview server port for --watch (0 = do not serve)",
+    )
+    args = parser.parse_args(argv)
+    jobs = args.jobs or os.cpu_count() or 1
+    if args.profile:
+        # Worker processes and streamed writes would hide the phases.
+        jobs, args.stream = 1, False
+    if os.path.abspath(args.content) != STORE.root:
+        use_content(os.path.abspath(args.content))
+    if args.minify:
+        use_minify(True)
+
+    site_dir = os.path.abspath(args.out)
+    manifest_path = os.path.join(site_dir, MANIFEST_FILE)
+    previous = load_manifest(manifest_path)
+    if os.path.join(site_dir, LASTMOD_FILE) != LASTMOD.path:
+        use_lastmod(os.path.join(site_dir, LASTMOD_FILE))
+
+    if args.profile:
+        timer = PhaseTimer()
+        uninstall = timer.install()
+        sampler = StackSampler() if args.stacks else None
+        profiler = cProfile.Profile() if args.pstats else None
+        if sampler:
+            sampler.start()
+        if profiler:
+            profiler.enable()
+        started = time.perf_counter()
+
+    FRAGMENTS.clear()
+    targets = collect_targets()
+    writer = build(targets, previous, site_dir, jobs, args.stream, args.force)
+    outputs = {t["filename"]: t["fingerprint"] for t in targets}
+
+    save_manifest(manifest_path, outputs)
+    STORE.save()
+    LASTMOD.prune(list(outputs) + ["home.html"])
+    LASTMOD.save()
+    import fingerprint_assets
+    fingerprint_assets.write_headers(site_dir)  # cache headers for new pages and stylesheets
+
+    if args.profile:
+        elapsed = time.perf_counter() - started
+        if sampler:
+            sampler.stop()
+            sampler.save(args.stacks)
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.pstats)
+        uninstall()
+
+    rendered = len(writer.written) + len(writer.skipped)
+    print(
+        f"\nDone! {len(ALL_LANDING_PAGES)} landing pages + {len(matrix_cells())} matrix pages "
+        f"+ {len(ALL_BLOG_ARTICLES)} blog articles + {len(blog_listings())} blog listing page(s) + stylesheet + {len(sitemap_shards())} sitemap shard(s) + index "
+        f"+ search index ({len(search_shards())} shards): {rendered} rendered, "
+        f"{len(targets) - rendered} up to date."
+    )
+    print(f"Output: {writer.summary()}.")
+    if jobs <= 1 and rendered:
+        stats = FRAGMENTS.stats()
+        print(f"Fragment cache: {stats['hits']} hits, {stats['misses']} misses.")
+    if args.profile:
+        timer.report(elapsed)
+        if profiler:
+            print(f"cProfile statistics: {args.pstats}")
+        if sampler:
+            print(f"Collapsed stacks: {args.stacks}")
+
+    if args.precompress:
+        import precompress
+        print()
+        precompress.main(["--site", site_dir])
+
+    if args.report:
+        import page_weight
+        print()
+        status = page_weight.main(["--site", site_dir])
+        if status:
+            sys.exit(status)
+
+    if args.watch:
+        try:
+            watch(site_dir, manifest_path, outputs, args.port)
+        except KeyboardInterrupt:
+            print("\nStopped watching.")
 
 
 if __name__ == "__main__":
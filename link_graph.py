@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Internal link graph report: click depth, links per page and orphans.
+
+    python3 link_graph.py [--site DIR] [--root PAGE]... [--max-depth N]
+                          [--max-links N] [--json FILE]
+
+Reads every ``*.html`` in the site, follows the ``<a href>`` links (and
+meta refresh redirects) between them and walks the graph breadth-first
+from the roots (default: index.html and home.html). For each page it
+reports its click depth -- the fewest clicks from a root -- and how many
+distinct pages it links to and is linked from, then a summary: pages per
+depth, the largest link counts and the pages no root reaches.
+
+Crawlers find pages by following links, and the deeper a page sits the
+less often it is crawled. The generator keeps per-page link lists short
+(related and newest articles, a few neighbouring district pages) and puts
+the complete lists on hub pages (the blog listings, the product pages), so
+this report is the check that nothing got cut off: the exit status is 1
+if a page is unreachable, deeper than ``--max-depth`` or links to more
+than ``--max-links`` pages. Pages matching IGNORE (404.html, the Search
+Console verification file) are not meant to be linked and are left out of
+the checks.
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import re
+import sys
+from collections import deque
+from urllib.parse import unquote, urlsplit
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOTS = ("index.html", "home.html")
+IGNORE = ("404.html", "google*.html")  # error page, Search Console verification
+MAX_DEPTH = 3
+
+HREF_RE = re.compile(r"""<a\b[^>]*?\shref=["']([^"']+)["']""", re.I)
+REFRESH_RE = re.compile(r"""<meta\b[^>]*?\scontent=["']\s*\d+\s*;\s*url=([^"']+)["']""", re.I)
+
+
+def page_links(text, name, pages):
+    """Distinct site pages an HTML document links to, in document order."""
+    found = {}
+    for ref in HREF_RE.findall(text) + REFRESH_RE.findall(text):
+        parts = urlsplit(ref.strip())
+        if parts.scheme or parts.netloc or not parts.path:
+            continue  # remote, mailto:, tel: or a fragment of this page
+        path = os.path.normpath(unquote(parts.path).lstrip("/")).replace(os.sep, "/")
+        if path not in pages and f"{path}.html" in pages:
+            path += ".html"  # extensionless URL, as the canonical links use
+        if path in pages and path != name:
+            found[path] = None
+    return list(found)
+
+
+class LinkGraph:
+    """Links between the pages of one site directory."""
+
+    def __init__(self, site_dir):
+        self.site_dir = os.path.abspath(site_dir)
+        self.links = {}
+
+    def scan(self):
+        pages = sorted(
+            entry.name for entry in os.scandir(self.site_dir)
+            if entry.is_file() and entry.name.endswith(".html")
+        )
+        names = set(pages)
+        for name in pages:
+            with open(os.path.join(self.site_dir, name), encoding="utf-8", errors="replace") as f:
+                self.links[name] = page_links(f.read(), name, names)
+        return self
+
+    def depths(self, roots):
+        """Page -> fewest clicks from any of ``roots``; unreachable pages are absent."""
+        depth = {root: 0 for root in roots if root in self.links}
+        queue = deque(depth)
+        while queue:
+            page = queue.popleft()
+            for target in self.links[page]:
+                if target not in depth:
+                    depth[target] = depth[page] + 1
+                    queue.append(target)
+        return depth
+
+    def inbound(self):
+        counts = dict.fromkeys(self.links, 0)
+        for targets in self.links.values():
+            for target in targets:
+                counts[target] += 1
+        return counts
+
+
+def ignored(name, patterns):
+    return any(fnmatch.fnmatch(name, p) for p in patterns)
+
+
+def report_rows(graph, roots):
+    """One row per page: ``depth`` (None if unreachable), ``in`` and ``out``."""
+    depth = graph.depths(roots)
+    inbound = graph.inbound()
+    return {
+        name: {"depth": depth.get(name), "in": inbound[name], "out": len(targets)}
+        for name, targets in graph.links.items()
+    }
+
+
+def check(rows, max_depth, max_links, ignore=IGNORE):
+    """Return ``(page, problem)`` for every page breaking the limits."""
+    problems = []
+    for name, row in rows.items():
+        if ignored(name, ignore):
+            continue
+        if row["depth"] is None:
+            problems.append((name, "not reachable from the roots"))
+        elif row["depth"] > max_depth:
+            problems.append((name, f"depth {row['depth']} > {max_depth}"))
+        if max_links and row["out"] > max_links:
+            problems.append((name, f"{row['out']} links > {max_links}"))
+    return problems
+
+
+def print_report(rows):
+    width = max(len(name) for name in rows)
+    order = sorted(rows, key=lambda n: (rows[n]["depth"] is None, rows[n]["depth"] or 0, n))
+    print(f"{'page':<{width}}{'depth':>7}{'in':>7}{'out':>7}")
+    for name in order:
+        row = rows[name]
+        depth = "-" if row["depth"] is None else row["depth"]
+        print(f"{name:<{width}}{depth:>7}{row['in']:>7}{row['out']:>7}")
+
+    levels = {}
+    for row in rows.values():
+        levels[row["depth"]] = levels.get(row["depth"], 0) + 1
+    print("\nPages by depth: " + ", ".join(
+        f"{'unreachable' if d is None else d}: {n}"
+        for d, n in sorted(levels.items(), key=lambda item: (item[0] is None, item[0] or 0))
+    ))
+    outs = sorted(row["out"] for row in rows.values())
+    print(f"Links per page: median {outs[len(outs) // 2]}, max {outs[-1]} "
+          f"({', '.join(n for n in order if rows[n]['out'] == outs[-1])}).")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report click depth and links of the site's pages.")
+    parser.add_argument("--site", default=SCRIPT_DIR, help="site directory (default: %(default)s)")
+    parser.add_argument("--root", action="append",
+                        help=f"page the crawl starts from; repeatable (default: {', '.join(ROOTS)})")
+    parser.add_argument("--max-depth", type=int, default=MAX_DEPTH,
+                        help="deepest click depth allowed (default: %(default)s)")
+    parser.add_argument("--max-links", type=int, default=0,
+                        help="most pages one page may link to; 0 for no limit (default)")
+    parser.add_argument("--json", metavar="FILE", help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    rows = report_rows(LinkGraph(args.site).scan(), args.root or ROOTS)
+    if not rows:
+        print("No pages found.")
+        return 1
+    print_report(rows)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    problems = check(rows, args.max_depth, args.max_links)
+    for name, problem in problems:
+        print(f"LINKS: {name}: {problem}")
+    if problems:
+        print(f"\n{len(problems)} problem(s) found.")
+        return 1
+    print(f"\nEvery page is within {args.max_depth} clicks of {' or '.join(args.root or ROOTS)}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,55 +1,244 @@
 #!/usr/bin/env python3
-"""Convert PNG/JPG images to WebP format with compression."""
+"""
+Convert the site's PNG/JPG images to WebP.
+
+    python3 optimize_images.py [--site DIR] [-j N] [--force] [--quality Q]
+
+Every ``*.png`` / ``*.jpg`` / ``*.jpeg`` under ``assets/`` (but not in
+``assets/variants/``, see responsive_images.py) is encoded to a WebP of
+the same logical name next to it: ``assets/photo.jpg`` becomes
+``assets/photo.webp``, and a fingerprinted ``assets/flags7.8b0b0ed59e.png``
+becomes ``assets/flags7.webp``, not ``flags7.8b0b0ed59e.webp``. The WebP is
+written under its plain name, so fingerprint_assets.py hashes it and
+points the references at it; run this script first, then
+fingerprint_assets.py, responsive_images.py and precompress.py.
+
+Images are encoded in parallel on all cores. A manifest in the site
+(``.optimize-images-manifest.json``) records for each source the SHA-256
+it was encoded from and the WebP it gave; a source is encoded again when
+its bytes, QUALITY / METHOD or the Pillow version change, or when the
+WebP is gone, so an edited photo never keeps serving the old WebP. A WebP
+whose bytes did not change is not rewritten, and one that is not smaller
+than its source (a flat-colour PNG, say) is not written at all. Sources
+are recorded under their logical names, so fingerprint_assets.py renaming
+one does not make it look new. Progress is printed as images finish, then
+the throughput and the bytes saved.
+
+Needs Pillow (``pip3 install Pillow``).
+"""
+
+import argparse
+import hashlib
+import io
+import json
 import os
+import posixpath
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import PIL
+    from PIL import Image
+except ImportError:
+    Image = None
+
+import fingerprint_assets
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_FILE = ".optimize-images-manifest.json"
+ASSETS_DIR = "assets"
+SKIP_DIRS = ("variants",)  # responsive_images.py output, already WebP/AVIF
+SOURCE_TYPES = (".png", ".jpg", ".jpeg")
 
 QUALITY = 80
+METHOD = 6  # slowest, smallest encoder effort; the pool pays for it
+
+
+def settings(quality):
+    """Everything besides the source bytes that decides the WebP's bytes."""
+    return {"quality": quality, "method": METHOD, "encoder": f"Pillow {PIL.__version__}"}
 
-def get_image_files(directory):
-    """Find all PNG and JPG files recursively."""
-    images = []
-    for root, dirs, files in os.walk(directory):
-        for f in files:
-            if f.lower().endswith(('.png', '.jpg', '.jpeg')) and not f.startswith('.'):
-                images.append(os.path.join(root, f))
-    return images
-
-def convert_to_webp(filepath, quality=QUALITY):
-    """Convert image to WebP using Pillow."""
-    webp_path = os.path.splitext(filepath)[0] + '.webp'
-    if os.path.exists(webp_path):
-        print(f"  SKIP {os.path.basename(filepath)} (WebP already exists)")
-        return 0
 
+def find_sources(site_dir):
+    """Site-relative ``/``-separated paths of the images to convert, sorted."""
+    found = []
+    for root, dirs, files in os.walk(os.path.join(site_dir, ASSETS_DIR)):
+        dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d not in SKIP_DIRS)
+        rel_root = os.path.relpath(root, site_dir).replace(os.sep, "/")
+        for name in sorted(files):
+            if not name.startswith(".") and name.lower().endswith(SOURCE_TYPES):
+                found.append(f"{rel_root}/{name}")
+    return found
+
+
+def logical_name(source, sha256):
+    """``source`` without its fingerprint, if it carries that of ``sha256``."""
+    match = fingerprint_assets.HASHED_RE.match(posixpath.basename(source))
+    if match and sha256.startswith(match["hash"]):
+        return posixpath.join(posixpath.dirname(source), match["stem"] + match["ext"])
+    return source
+
+
+def webp_name(logical):
+    return posixpath.splitext(logical)[0] + ".webp"
+
+
+def webp_exists(site_dir, webp, sha256):
+    """True if the WebP with digest ``sha256`` is on disk, plain or hashed."""
+    root, ext = posixpath.splitext(webp)
+    hashed = f"{root}.{sha256[:fingerprint_assets.HASH_LEN]}{ext}"
+    if os.path.exists(os.path.join(site_dir, hashed)):
+        return True
     try:
-        from PIL import Image
-        img = Image.open(filepath)
-        if img.mode in ('RGBA', 'LA', 'P'):
-            img = img.convert('RGBA')
+        return file_digest(site_dir, webp) == sha256
+    except FileNotFoundError:
+        return False
+
+
+def encode(data, quality):
+    img = Image.open(io.BytesIO(data))
+    img = img.convert("RGBA" if img.mode in ("RGBA", "LA", "P") else "RGB")
+    buf = io.BytesIO()
+    img.save(buf, "WebP", quality=quality, method=METHOD)
+    return buf.getvalue()
+
+
+def convert_file(job):
+    """Encode one image; top-level for worker processes.
+
+    Returns ``(logical, entry, written)``, or ``(logical, error, None)`` if
+    the image could not be read. ``entry["webp"]`` is None if the WebP
+    did not come out smaller.
+    """
+    site_dir, source, logical, quality = job
+    data = fingerprint_assets.read(site_dir, source)
+    try:
+        webp = encode(data, quality)
+    except (OSError, ValueError) as e:
+        return logical, str(e), None
+    entry = {"sha256": hashlib.sha256(data).hexdigest(), "size": len(data),
+             "webp": None, "webp_sha256": None, "webp_size": len(data)}
+    if len(webp) >= len(data):
+        return logical, entry, False  # not worth it; the source stays in use
+    entry.update(webp=webp_name(logical), webp_sha256=hashlib.sha256(webp).hexdigest(),
+                 webp_size=len(webp))
+    written = False
+    if not webp_exists(site_dir, entry["webp"], entry["webp_sha256"]):
+        written = fingerprint_assets.write_if_changed(site_dir, entry["webp"], webp)
+    return logical, entry, written
+
+
+def file_digest(site_dir, rel):
+    h = hashlib.sha256()
+    with open(os.path.join(site_dir, rel), "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def optimize_images(site_dir, jobs=0, force=False, quality=QUALITY, progress=print):
+    """Bring every WebP in ``site_dir`` up to date; returns a stats dict."""
+    config = settings(quality)
+    manifest_path = os.path.join(site_dir, MANIFEST_FILE)
+    manifest = fingerprint_assets.load_manifest(manifest_path)
+    previous = manifest.get("files", {}) if manifest.get("settings") == config else {}
+
+    stats = {"images": 0, "encoded": 0, "up_to_date": 0, "written": 0,
+             "unchanged": 0, "not_worth_it": 0, "errors": 0, "bytes": [0, 0], "seconds": 0.0}
+    files = {}
+    pending = []
+    for source in find_sources(site_dir):
+        stats["images"] += 1
+        sha256 = file_digest(site_dir, source)
+        logical = logical_name(source, sha256)
+        entry = previous.get(logical)
+        if (not force and entry and entry["sha256"] == sha256
+                and (entry["webp"] is None
+                     or webp_exists(site_dir, entry["webp"], entry["webp_sha256"]))):
+            files[logical] = entry
+            stats["up_to_date"] += 1
+            continue
+        pending.append((site_dir, source, logical, quality))
+
+    start = time.perf_counter()
+    workers = min(jobs or os.cpu_count() or 1, len(pending)) or 1
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            done = pool.map(convert_file, pending)
+            results = report(done, len(pending), progress)
+    else:
+        results = report(map(convert_file, pending), len(pending), progress)
+    stats["seconds"] = time.perf_counter() - start
+
+    for logical, entry, written in results:
+        if written is None:
+            stats["errors"] += 1
+            continue
+        stats["encoded"] += 1
+        if entry["webp"] is None:
+            stats["not_worth_it"] += 1
         else:
-            img = img.convert('RGB')
-        img.save(webp_path, 'WebP', quality=quality)
-        original_size = os.path.getsize(filepath)
-        webp_size = os.path.getsize(webp_path)
-        savings = original_size - webp_size
-        pct = (savings / original_size) * 100 if original_size > 0 else 0
-        print(f"  {os.path.basename(filepath)}: {original_size//1024}KB -> {webp_size//1024}KB ({pct:.0f}% saved)")
-        return savings
-    except ImportError:
+            stats["written" if written else "unchanged"] += 1
+        files[logical] = entry
+
+    for entry in files.values():
+        stats["bytes"][0] += entry["size"]
+        stats["bytes"][1] += entry["webp_size"]
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({"settings": config, "files": files}, f, indent=2, sort_keys=True)
+        f.write("\n")
+    return stats
+
+
+def report(done, total, progress):
+    """Print each result of ``done`` as it arrives; returns them as a list."""
+    results = []
+    for logical, entry, written in done:
+        results.append((logical, entry, written))
+        name = posixpath.basename(logical)
+        if written is None:
+            progress(f"  [{len(results)}/{total}] ERROR {name}: {entry}")
+        elif entry["webp"] is None:
+            progress(f"  [{len(results)}/{total}] {name}: WebP not smaller, skipped")
+        else:
+            progress(f"  [{len(results)}/{total}] {name}: {entry['size'] / 1024:.0f} KB -> "
+                     f"{entry['webp_size'] / 1024:.0f} KB{'' if written else ' (unchanged)'}")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert PNG/JPG images to WebP.")
+    parser.add_argument("--site", default=SCRIPT_DIR, help="site directory (default: %(default)s)")
+    parser.add_argument("-j", "--jobs", type=int, default=0,
+                        help="worker processes (default: one per CPU core)")
+    parser.add_argument("--force", action="store_true",
+                        help="encode every image, ignoring the manifest")
+    parser.add_argument("--quality", type=int, default=QUALITY,
+                        help="WebP quality, 0-100 (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    if Image is None:
         print("ERROR: Pillow not installed. Run: pip3 install Pillow")
-        sys.exit(1)
-    except Exception as e:
-        print(f"  ERROR {os.path.basename(filepath)}: {e}")
-        return 0
+        return 1
 
-if __name__ == "__main__":
-    assets_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
-    images = get_image_files(assets_dir)
-    print(f"Found {len(images)} images to convert\n")
+    stats = optimize_images(os.path.abspath(args.site), args.jobs, args.force, args.quality)
+    print(
+        f"Converted {stats['images']} images: {stats['encoded']} encoded, "
+        f"{stats['up_to_date']} up to date, {stats['errors']} failed. WebP: "
+        f"{stats['written']} written, {stats['unchanged']} unchanged, "
+        f"{stats['not_worth_it']} not worth it."
+    )
+    if stats["encoded"]:
+        print(f"  {stats['encoded'] / stats['seconds']:.1f} images/s "
+              f"({stats['seconds']:.1f} s)")
+    raw, webp = stats["bytes"]
+    if raw:
+        print(f"  {raw / 2**20:.2f} MB -> {webp / 2**20:.2f} MB "
+              f"({(raw - webp) / 2**20:.2f} MB, {1 - webp / raw:.0%} saved)")
+    return 1 if stats["errors"] else 0
 
-    total_saved = 0
-    for img in sorted(images):
-        total_saved += convert_to_webp(img)
 
-    print(f"\nTotal saved: {total_saved // 1024}KB ({total_saved // (1024*1024)}MB)")
-    print("WebP versions created alongside originals.")
+if __name__ == "__main__":
+    sys.exit(main())
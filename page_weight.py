@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Per-page weight report and performance budgets for the generated site.
+
+    python3 page_weight.py [--site DIR] [--budgets FILE] [--json FILE]
+
+For every ``*.html``, ``sitemap*.xml`` and gzipped sitemap shard
+(``sitemap-*.xml.gz``) in the site it reports raw, gzip and brotli bytes, the bytes of inline CSS, JSON-LD, JavaScript and SVG, the
+number of requests the page triggers and the weight of the local assets it
+references (followed into local CSS for fonts and backgrounds). Every font
+a stylesheet declares is counted, even if unicode-range would spare the
+browser some of them. Each referenced asset is reported once with its own
+sizes. A shard's raw bytes are its decompressed size, which is what the
+sitemap protocol's 50 MB limit applies to, and its gzip bytes the file
+itself; sitemaps also report their entry count as ``urls`` (50,000 at
+most).
+
+Budgets come from a JSON file (default: budgets.json next to this script):
+
+    {"budgets": [
+        {"match": "*.html", "gzip": 12000, "requests": 12},
+        {"match": "home.html", "gzip": 60000, "requests": 60}
+    ]}
+
+Every rule whose ``match`` glob fits a file applies, later rules overriding
+earlier ones metric by metric. Limits use the metric names of the report
+(bytes, gzip, brotli, css, json_ld, js, svg, requests, assets_bytes,
+total_bytes, transfer_bytes, urls). Any page over budget makes the exit status 1.
+
+brotli sizes need the optional ``brotli`` package; without it the column
+is left empty and brotli budgets are skipped.
+"""
+
+import argparse
+import fnmatch
+import gzip
+import json
+import os
+import re
+import sys
+from urllib.parse import unquote, urlsplit
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BUDGETS_FILE = os.path.join(SCRIPT_DIR, "budgets.json")
+
+# Assets served compressed; everything else (images, fonts) goes as is.
+TEXT_TYPES = (".html", ".css", ".js", ".json", ".svg", ".xml", ".txt")
+
+STYLE_RE = re.compile(r"<style\b[^>]*>(.*?)</style>", re.S | re.I)
+STYLE_ATTR_RE = re.compile(r"""\sstyle=(?:"([^"]*)"|'([^']*)')""", re.I)
+SCRIPT_RE = re.compile(r"<script\b([^>]*)>(.*?)</script>", re.S | re.I)
+SVG_RE = re.compile(r"<svg\b.*?</svg>", re.S | re.I)
+SRC_RE = re.compile(
+    r"""<(?:img|script|source|iframe|video|audio|embed|input)\b[^>]*?\ssrc=["']([^"']+)["']""",
+    re.I,
+)
+LINK_RE = re.compile(r"<link\b[^>]*>", re.I)
+LINK_ATTR_RE = re.compile(r"""\s(rel|href)=["']([^"']*)["']""", re.I)
+URL_RE = re.compile(r"""url\(\s*["']?([^"')]+)["']?\s*\)""", re.I)
+DATA_ORIGINAL_RE = re.compile(r"""\sdata-original=["']([^"']+)["']""", re.I)  # Tilda lazy-load
+SITEMAP_ENTRY_RE = re.compile(rb"<(?:url|sitemap)>")
+
+# Site-root globs of the files reported; the shards are served gzipped.
+PAGE_PATTERNS = ("*.html", "sitemap*.xml", "sitemap-*.xml.gz")
+
+# <link rel> values that make a browser fetch the href on page load.
+FETCHED_RELS = {"stylesheet", "icon", "preload", "modulepreload", "manifest"}
+
+
+def compressed_sizes(data):
+    """Return ``(gzip, brotli)`` sizes of ``data``; brotli is None if unavailable."""
+    gz = len(gzip.compress(data, compresslevel=9, mtime=0))
+    br = len(brotli.compress(data)) if brotli else None
+    return gz, br
+
+
+def utf8_len(parts):
+    return sum(len(p.encode("utf-8")) for p in parts)
+
+
+def inline_sizes(text):
+    """Bytes of inline CSS, JSON-LD, JavaScript and SVG in an HTML document."""
+    json_ld, js = [], []
+    for attrs, body in SCRIPT_RE.findall(text):
+        if "ld+json" in attrs.lower():
+            json_ld.append(body)
+        elif not re.search(r"\ssrc=", attrs, re.I):
+            js.append(body)
+    css = STYLE_RE.findall(text)
+    css.extend(a or b for a, b in STYLE_ATTR_RE.findall(text))
+    return {
+        "css": utf8_len(css),
+        "json_ld": utf8_len(json_ld),
+        "js": utf8_len(js),
+        "svg": utf8_len(SVG_RE.findall(text)),
+    }
+
+
+def html_references(text):
+    """Every URL an HTML document makes the browser fetch, in document order."""
+    refs = SRC_RE.findall(text)
+    refs.extend(DATA_ORIGINAL_RE.findall(text))
+    for tag in LINK_RE.findall(text):
+        attrs = {name.lower(): value for name, value in LINK_ATTR_RE.findall(tag)}
+        if "href" in attrs and set(attrs.get("rel", "").lower().split()) & FETCHED_RELS:
+            refs.append(attrs["href"])
+    for css in STYLE_RE.findall(text):
+        refs.extend(URL_RE.findall(css))
+    for a, b in STYLE_ATTR_RE.findall(text):
+        refs.extend(URL_RE.findall(a or b))
+    return refs
+
+
+def local_path(ref, base_dir, site_dir):
+    """Map a reference to a file under ``site_dir``, or None if it is remote."""
+    parts = urlsplit(ref)
+    if parts.scheme or parts.netloc or ref.startswith(("data:", "#")) or not parts.path:
+        return None
+    path = unquote(parts.path)
+    if path.startswith("/"):
+        full = os.path.join(site_dir, path.lstrip("/"))
+    else:
+        full = os.path.join(base_dir, path)
+    return os.path.normpath(full)
+
+
+class WeightReport:
+    """Collects page and asset weights for one site directory."""
+
+    def __init__(self, site_dir):
+        self.site_dir = os.path.abspath(site_dir)
+        self.pages = {}
+        self.assets = {}
+        self.missing = {}
+
+    def asset(self, path):
+        """Sizes of one local asset, computed once per build."""
+        if path not in self.assets:
+            with open(path, "rb") as f:
+                data = f.read()
+            gz, br = compressed_sizes(data) if path.endswith(TEXT_TYPES) else (None, None)
+            refs = []
+            if path.endswith(".css"):
+                refs = URL_RE.findall(data.decode("utf-8", "replace"))
+            self.assets[path] = {
+                "bytes": len(data), "gzip": gz, "brotli": br, "pages": 0,
+                "refs": [local_path(r, os.path.dirname(path), self.site_dir) or r for r in refs],
+            }
+        return self.assets[path]
+
+    def transfer(self, info):
+        """Bytes on the wire: the best available encoding for text, raw otherwise."""
+        sizes = [s for s in (info["gzip"], info["brotli"]) if s is not None]
+        return min(sizes) if sizes else info["bytes"]
+
+    def add_page(self, name):
+        path = os.path.join(self.site_dir, name)
+        with open(path, "rb") as f:
+            data = f.read()
+        if name.endswith(".gz"):
+            raw = gzip.decompress(data)
+            row = {"bytes": len(raw), "gzip": len(data), "brotli": None}
+        else:
+            raw = data
+            gz, br = compressed_sizes(data)
+            row = {"bytes": len(data), "gzip": gz, "brotli": br}
+        if name.endswith((".xml", ".xml.gz")):
+            row["urls"] = len(SITEMAP_ENTRY_RE.findall(raw))
+            self.pages[name] = row
+            return
+
+        text = data.decode("utf-8", "replace")
+        row.update(inline_sizes(text))
+        urls, local = set(), set()
+        queue = [local_path(r, self.site_dir, self.site_dir) or r for r in html_references(text)]
+        while queue:
+            ref = queue.pop()
+            if ref in urls:
+                continue
+            urls.add(ref)
+            if not os.path.isabs(ref):
+                continue  # remote
+            if not os.path.isfile(ref):
+                self.missing.setdefault(os.path.relpath(ref, self.site_dir), set()).add(name)
+                continue
+            local.add(ref)
+            queue.extend(self.asset(ref)["refs"])
+        for ref in local:
+            self.assets[ref]["pages"] += 1
+
+        row["requests"] = 1 + len(urls)
+        row["assets_bytes"] = sum(self.assets[p]["bytes"] for p in local)
+        row["total_bytes"] = row["bytes"] + row["assets_bytes"]
+        row["transfer_bytes"] = self.transfer(row) + sum(self.transfer(self.assets[p]) for p in local)
+        self.pages[name] = row
+
+    def scan(self):
+        names = sorted(
+            entry.name for entry in os.scandir(self.site_dir)
+            if entry.is_file() and any(fnmatch.fnmatch(entry.name, p) for p in PAGE_PATTERNS)
+        )
+        for name in names:
+            self.add_page(name)
+        return self
+
+
+def load_budgets(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["budgets"]
+
+
+def budget_for(name, rules):
+    """Merge every rule matching ``name``; later rules win per metric."""
+    limits = {}
+    for rule in rules:
+        if fnmatch.fnmatch(name, rule["match"]):
+            limits.update((k, v) for k, v in rule.items() if k != "match")
+    return limits
+
+
+def check_budgets(pages, rules):
+    """Return ``(page, metric, value, limit)`` for every exceeded budget."""
+    violations = []
+    for name, row in pages.items():
+        for metric, limit in budget_for(name, rules).items():
+            value = row.get(metric)
+            if value is not None and value > limit:
+                violations.append((name, metric, value, limit))
+    return violations
+
+
+def kb(value):
+    return "-" if value is None else f"{value / 1024:.1f}"
+
+
+def print_report(report):
+    columns = ("bytes", "gzip", "brotli", "css", "json_ld", "js", "svg", "requests", "transfer_bytes")
+    headers = ("KB", "gzip", "br", "css", "json-ld", "js", "svg", "reqs", "transfer")
+    width = max(len(name) for name in report.pages)
+    print(f"{'page':<{width}}" + "".join(f"{h:>9}" for h in headers))
+    for name, row in report.pages.items():
+        cells = [
+            "" if c not in row else str(row[c]) if c == "requests" else kb(row[c])
+            for c in columns
+        ]
+        print(f"{name:<{width}}" + "".join(f"{c:>9}" for c in cells))
+
+    if report.assets:
+        print(f"\n{'asset':<{width}}{'KB':>9}{'gzip':>9}{'br':>9}{'pages':>9}")
+        for path, info in sorted(report.assets.items()):
+            name = os.path.relpath(path, report.site_dir)
+            print(f"{name:<{width}}{kb(info['bytes']):>9}{kb(info['gzip']):>9}"
+                  f"{kb(info['brotli']):>9}{info['pages']:>9}")
+
+    for name, pages in sorted(report.missing.items()):
+        print(f"WARNING: {name} is referenced by {len(pages)} page(s) but does not exist")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report page weights and enforce budgets.")
+    parser.add_argument("--site", default=SCRIPT_DIR, help="site directory (default: %(default)s)")
+    parser.add_argument("--budgets", default=BUDGETS_FILE, help="budget file (default: %(default)s)")
+    parser.add_argument("--json", metavar="FILE", help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = WeightReport(args.site).scan()
+    print_report(report)
+    if brotli is None:
+        print("\nNOTE: brotli not installed (pip3 install brotli); brotli sizes skipped.")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "pages": report.pages,
+                "assets": {
+                    os.path.relpath(p, report.site_dir): {k: v for k, v in info.items() if k != "refs"}
+                    for p, info in report.assets.items()
+                },
+            }, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    if not os.path.exists(args.budgets):
+        return 0
+    violations = check_budgets(report.pages, load_budgets(args.budgets))
+    for name, metric, value, limit in violations:
+        print(f"BUDGET: {name}: {metric} {value} > {limit}")
+    if violations:
+        print(f"\n{len(violations)} budget(s) exceeded.")
+        return 1
+    print(f"\nAll pages within budget ({os.path.relpath(args.budgets)}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Precompressed .br/.gz/.zst siblings for the site's text files.
+
+    python3 precompress.py [--site DIR] [-j N] [--force] [--min-saving R]
+
+Walks the pages (``*.html``), ``sitemap*.xml``, ``assets/*.css`` /
+``assets/*.js`` and the search index (``search/*.json``) of the site and writes ``NAME.br``, ``NAME.gz`` and
+``NAME.zst`` next to each file, so nginx (``gzip_static``,
+``brotli_static``, ``zstd_static``) and other static servers can send
+them as is instead of compressing on every request. Every encoder runs at
+its maximum level: brotli quality 11, zopfli for gzip, zstd level 22.
+
+Files are compressed in parallel on all cores. A manifest in the site
+(``.precompress-manifest.json``) records the source hash each sibling was
+made from, so unchanged files are not compressed again; a sibling whose
+bytes did not change is not rewritten either. A sibling that saves less
+than ``--min-saving`` of the file (and files under MIN_SIZE bytes) is not
+worth a lookup on every request: it is not written, and an old one is
+removed. Siblings of files that no longer exist are removed too.
+
+brotli, zopfli and zstd come from the optional ``brotli``, ``zopfli`` and
+``zstandard`` packages. Without zopfli, gzip falls back to the standard
+library at level 9; without brotli or zstandard those siblings are skipped.
+"""
+
+import argparse
+import fnmatch
+import gzip
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zopfli.gzip
+except ImportError:
+    zopfli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_FILE = ".precompress-manifest.json"
+
+# Site-relative globs of the files to compress.
+PATTERNS = ("*.html", "sitemap*.xml", "assets/*.css", "assets/*.js", "search/*.json")
+
+MIN_SIZE = 256  # bytes; smaller files fit in one packet either way
+MIN_SAVING = 0.1  # fraction of the file a sibling must save to be kept
+
+
+def compress_br(data):
+    return brotli.compress(data, mode=brotli.MODE_TEXT, quality=11, lgwin=24)
+
+
+def compress_gz(data):
+    if zopfli:
+        return zopfli.gzip.compress(data)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def compress_zst(data):
+    return zstandard.ZstdCompressor(level=22).compress(data)
+
+
+def encoders():
+    """Map suffix -> (compress function, encoder name) for what is installed.
+
+    The name goes into the manifest, so installing zopfli, say, recompresses
+    everything once.
+    """
+    found = {"gz": (compress_gz, "zopfli" if zopfli else "gzip-9")}
+    if brotli:
+        found["br"] = (compress_br, "brotli-11")
+    if zstandard:
+        found["zst"] = (compress_zst, "zstd-22")
+    return found
+
+
+def find_sources(site_dir):
+    """Site-relative paths of every file matching PATTERNS, sorted."""
+    sources = set()
+    for pattern in PATTERNS:
+        folder, name = os.path.split(pattern)
+        try:
+            entries = os.scandir(os.path.join(site_dir, folder))
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_file() and fnmatch.fnmatch(entry.name, name):
+                    sources.add(os.path.join(folder, entry.name))
+    return sorted(sources)
+
+
+def write_if_changed(path, data, mtime):
+    """Atomically write ``data`` to ``path`` unless it already holds it."""
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.utime(tmp, ns=(mtime, mtime))  # match the source for Last-Modified/ETag
+    os.replace(tmp, path)
+    return True
+
+
+def remove(path):
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def compress_file(job):
+    """Compress one file into its siblings; top-level for worker processes.
+
+    Returns ``(source, digest, results)`` where ``results`` maps each
+    suffix to ``(size or None if it did not pay off, written)``.
+    """
+    site_dir, source, suffixes, min_saving = job
+    path = os.path.join(site_dir, source)
+    with open(path, "rb") as f:
+        data = f.read()
+    mtime = os.stat(path).st_mtime_ns
+    digest = hashlib.sha256(data).hexdigest()
+    available = encoders()
+    results = {}
+    for suffix in suffixes:
+        sibling = f"{path}.{suffix}"
+        compressed = available[suffix][0](data) if len(data) >= MIN_SIZE else None
+        if compressed is None or len(compressed) > len(data) * (1 - min_saving):
+            results[suffix] = (None, remove(sibling))
+        else:
+            results[suffix] = (len(compressed), write_if_changed(sibling, compressed, mtime))
+    return source, digest, results
+
+
+def file_digest(site_dir, source):
+    h = hashlib.sha256()
+    with open(os.path.join(site_dir, source), "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def load_manifest(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def precompress(site_dir, jobs=0, force=False, min_saving=MIN_SAVING):
+    """Bring every sibling in ``site_dir`` up to date; returns a stats dict."""
+    available = encoders()
+    config = {suffix: name for suffix, (_, name) in available.items()}
+    manifest_path = os.path.join(site_dir, MANIFEST_FILE)
+    manifest = load_manifest(manifest_path)
+    previous = manifest.get("files", {}) if manifest.get("encoders") == config else {}
+
+    stats = {"files": 0, "compressed": 0, "up_to_date": 0, "written": 0,
+             "unchanged": 0, "not_worth_it": 0, "removed": 0,
+             "bytes": {suffix: [0, 0] for suffix in config}}
+    files = {}
+    pending = []
+    sources = find_sources(site_dir)
+    for source in sources:
+        stats["files"] += 1
+        entry = previous.get(source)
+        if not force and entry and entry["sha256"] == file_digest(site_dir, source) and all(
+            size is None or os.path.exists(os.path.join(site_dir, f"{source}.{suffix}"))
+            for suffix, size in entry["sizes"].items()
+        ):
+            files[source] = entry
+            stats["up_to_date"] += 1
+            continue
+        pending.append((site_dir, source, tuple(config), min_saving))
+
+    workers = jobs or os.cpu_count() or 1
+    if workers > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            done = list(pool.map(compress_file, pending, chunksize=max(1, len(pending) // (workers * 4))))
+    else:
+        done = [compress_file(job) for job in pending]
+    for source, digest, results in done:
+        stats["compressed"] += 1
+        files[source] = {"sha256": digest, "sizes": {s: size for s, (size, _) in results.items()}}
+        for size, written in results.values():
+            if size is None:
+                stats["not_worth_it"] += 1
+                stats["removed"] += written
+            else:
+                stats["written" if written else "unchanged"] += 1
+
+    # Siblings of sources that are gone, or of encoders no longer installed.
+    for source, entry in manifest.get("files", {}).items():
+        for suffix in entry["sizes"]:
+            if source not in files or suffix not in config:
+                stats["removed"] += remove(os.path.join(site_dir, f"{source}.{suffix}"))
+
+    for source, entry in files.items():
+        size = os.path.getsize(os.path.join(site_dir, source))
+        for suffix, compressed in entry["sizes"].items():
+            if compressed is not None:
+                stats["bytes"][suffix][0] += size
+                stats["bytes"][suffix][1] += compressed
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({"encoders": config, "files": files}, f, indent=2, sort_keys=True)
+        f.write("\n")
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write precompressed .br/.gz/.zst siblings.")
+    parser.add_argument("--site", default=SCRIPT_DIR, help="site directory (default: %(default)s)")
+    parser.add_argument("-j", "--jobs", type=int, default=0,
+                        help="worker processes (default: one per CPU core)")
+    parser.add_argument("--force", action="store_true",
+                        help="compress every file, ignoring the manifest")
+    parser.add_argument("--min-saving", type=float, default=MIN_SAVING,
+                        help="keep a sibling only if it saves this fraction (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    stats = precompress(os.path.abspath(args.site), args.jobs, args.force, args.min_saving)
+    print(
+        f"Precompressed {stats['files']} files: {stats['compressed']} compressed, "
+        f"{stats['up_to_date']} up to date. Siblings: {stats['written']} written, "
+        f"{stats['unchanged']} unchanged, {stats['not_worth_it']} not worth it, "
+        f"{stats['removed']} removed."
+    )
+    for suffix, (raw, compressed) in sorted(stats["bytes"].items()):
+        if raw:
+            print(f"  .{suffix:<4}{raw / 1024:>9.1f} KB -> {compressed / 1024:>8.1f} KB "
+                  f"({1 - compressed / raw:.0%} smaller)")
+    missing = [name for name, module in (("brotli", brotli), ("zopfli", zopfli), ("zstandard", zstandard))
+               if module is None]
+    if missing:
+        print(f"NOTE: {', '.join(missing)} not installed (pip3 install {' '.join(missing)}); "
+              "see the module docstring for what is skipped.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
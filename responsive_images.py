@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Responsive image variants and ``srcset`` / ``<picture>`` rewriting.
+
+    python3 responsive_images.py [--site DIR] [-j N] [--force]
+
+Every raster image the site's pages (``*.html``) show gets a ladder of
+narrower copies, one per width in WIDTHS below its own, in AVIF and WebP;
+a copy that is not smaller than the next wider one is dropped.
+Variants are written to ``assets/variants/NAME-WIDTHw.HASH.EXT``, already
+content-hashed like the rest of ``assets/``, so fingerprint_assets.py
+leaves them alone and ``_headers`` marks them immutable. The full-size
+source itself is the widest WebP; the widest AVIF is encoded at full size.
+
+``image-manifest.json`` records the variants of each image under its
+logical name (the key it has in asset-manifest.json):
+
+    {"images": {"assets/img.webp": {
+        "source": "assets/img.1a2b3c4d5e.webp", "width": 1200, "height": 858,
+        "avif": [[320, "assets/variants/img-320w.....avif"], ..., [1200, ...]],
+        "webp": [[320, "assets/variants/img-320w.....webp"], ..., [1200, "assets/img.1a2b3c4d5e.webp"]]}}}
+
+Templates can build a ``srcset`` from it without touching the files;
+generate_pages.py reads it to map variants back to their sources. An entry
+is reused while its source, WIDTHS and QUALITY are unchanged and its files
+exist, so a run after a small change encodes only the changed image.
+Variants no longer in the manifest are removed.
+
+Pages are then rewritten in place:
+
+- an ``<img>`` without a ``srcset`` becomes a ``<picture>`` with an AVIF
+  ``<source>`` and a WebP ``srcset`` on the ``<img>`` itself;
+- a fixed-size background (Tilda's ``t-bgimg`` blocks set it from
+  ``data-original``) cannot choose from a ``srcset``, so it is pointed at
+  the narrowest WebP at least DPR times its displayed width.
+
+``sizes`` and display widths come from the element's ``width`` / inline
+``style`` / ``data-image-width``, or from the ``data-field-width-*``
+values of the Tilda zero-block element it is the atom of; an ``<img>`` without
+any gets ``sizes="100vw"`` and a background without any is left alone.
+Running the script again after fingerprint_assets.py has renamed a source
+rewrites pictures and backgrounds from the new manifest.
+
+Run it after fingerprint_assets.py and before precompress.py. Needs
+Pillow with AVIF support (Pillow 11.3+; ``pip3 install Pillow``).
+"""
+
+import argparse
+import bisect
+import io
+import json
+import os
+import posixpath
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import fingerprint_assets
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_FILE = "image-manifest.json"
+VARIANTS_DIR = "assets/variants"
+
+WIDTHS = (320, 480, 640, 960, 1280, 1680)
+QUALITY = {"avif": 60, "webp": 80}  # webp matches optimize_images.py
+RASTER_TYPES = (".webp", ".png", ".jpg", ".jpeg")
+DPR = 2  # device pixel ratio a fixed-size background is sized for
+
+IMG_RE = re.compile(r"<picture\b.*?</picture>|<img\b[^>]*>", re.S | re.I)
+OUR_PICTURE_RE = re.compile(
+    r'<picture><source type="image/avif" srcset="[^"]*" sizes="[^"]*">(<img\b[^>]*>)</picture>'
+)
+SRCSET_ATTRS_RE = re.compile(r'\s(?:srcset|sizes)="[^"]*"')
+BACKGROUND_RE = re.compile(
+    r"<(?!img\b)[a-z][\w-]*\b[^>]*?(?:\sdata-original=|background-image:\s*url\()[^>]*>", re.I
+)
+SRC_RE = re.compile(r"""\ssrc=["']([^"']+)["']""", re.I)
+SRCSET_RE = re.compile(r"\ssrcset=", re.I)
+WIDTH_HINT_RE = re.compile(
+    r"""\s(?:width|data-image-width)=["']?(\d+)["'\s/>]|[\s;"']width:\s*(\d+)px""", re.I
+)
+ZERO_ELEM_RE = re.compile(r'<div class="t396__elem\b[^>]*>')
+ZERO_WIDTH_RE = re.compile(r'data-field-width(?:-res-\d+)?-value="(\d+)"')
+ZERO_UNITS_RE = re.compile(r'data-field-widthunits-value="([^"]*)"')
+ZERO_ATOM_GAP_RE = re.compile(r"\s*(?:<a\b[^>]*>\s*)?")  # the atom may sit in a link
+
+
+def ladder(width):
+    """Variant widths for an image ``width`` pixels wide; empty if too narrow."""
+    if width <= WIDTHS[0]:
+        return []
+    return [w for w in WIDTHS if w < width] + [width]
+
+
+def open_image(path):
+    image = Image.open(path)
+    image.load()
+    has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+    return image.convert("RGBA" if has_alpha else "RGB")
+
+
+def encode_variants(job):
+    """Encode one image's ladder in one format; top-level for worker processes.
+
+    Returns ``(logical, fmt, [[width, path], ...])``.
+    """
+    site_dir, logical, source, fmt, widths = job
+    image = open_image(os.path.join(site_dir, source))
+    stem = posixpath.splitext(posixpath.basename(logical))[0]
+    variants, smallest = [], None
+    for width in sorted(widths, reverse=True):
+        if width == image.width and fmt == "webp" and source.endswith(".webp"):
+            variants.append([width, source])  # the source is the widest WebP
+            smallest = os.path.getsize(os.path.join(site_dir, source))
+            continue
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        buf = io.BytesIO()
+        resized.save(buf, fmt.upper(), quality=QUALITY[fmt])
+        data = buf.getvalue()
+        if smallest is not None and len(data) >= smallest:
+            continue  # re-encoding a lossy source can cost more than the wider copy
+        path = fingerprint_assets.hashed_name(f"{VARIANTS_DIR}/{stem}-{width}w.{fmt}", data)
+        fingerprint_assets.write_if_changed(site_dir, path, data)
+        variants.append([width, path])
+        smallest = len(data)
+    return logical, fmt, variants[::-1]
+
+
+def load_manifest(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def settings():
+    return {"widths": list(WIDTHS), "quality": QUALITY}
+
+
+def logical_names(assets, *manifests):
+    """Map every served name of an image (hashed source, variant) to its logical name."""
+    names = {hashed: logical for logical, hashed in assets.items()}
+    names.update((logical, logical) for logical in assets)
+    for manifest in manifests:
+        for logical, entry in manifest.get("images", {}).items():
+            for _, path in entry["avif"] + entry["webp"]:
+                names[path] = logical
+    return names
+
+
+def page_images(site_dir, pages, assets, names):
+    """Logical names of the raster images the pages show, in first-seen order.
+
+    Only ``<img>`` tags and backgrounds count: an image that is just an
+    og:image or in JSON-LD needs no variants.
+    """
+    found = {}
+    for name in pages:
+        text = fingerprint_assets.read(site_dir, name).decode("utf-8")
+        for tag in IMG_RE.findall(text) + BACKGROUND_RE.findall(text):
+            for ref in fingerprint_assets.ASSET_REF_RE.findall(tag):
+                logical = names.get(ref)
+                if logical in assets and logical.lower().endswith(RASTER_TYPES):
+                    found[logical] = None
+    return list(found)
+
+
+def plan_images(site_dir, logicals, assets, previous, force):
+    """Split images into reusable manifest entries and encoding jobs."""
+    entries, jobs = {}, []
+    reuse = previous.get("images", {}) if previous.get("settings") == settings() and not force else {}
+    for logical in logicals:
+        source = assets[logical]
+        old = reuse.get(logical)
+        if old and old["source"] == source and all(
+            os.path.exists(os.path.join(site_dir, path)) for _, path in old["avif"] + old["webp"]
+        ):
+            entries[logical] = old
+            continue
+        with Image.open(os.path.join(site_dir, source)) as image:
+            width, height = image.size
+        widths = ladder(width)
+        if not widths:
+            continue
+        entries[logical] = {"source": source, "width": width, "height": height, "avif": [], "webp": []}
+        jobs += [(site_dir, logical, source, fmt, widths) for fmt in QUALITY]
+    return entries, jobs
+
+
+def srcset(variants):
+    return ", ".join(f"{path} {width}w" for width, path in variants)
+
+
+def width_hint(text, start, end, zero_elems):
+    """Displayed width in CSS pixels of the element at ``text[start:end]``, or None."""
+    hints = [int(a or b) for a, b in WIDTH_HINT_RE.findall(text, start, end)]
+    if hints:
+        return max(hints)
+    i = bisect.bisect_right(zero_elems, (start,)) - 1
+    if i < 0 or not ZERO_ATOM_GAP_RE.fullmatch(text, zero_elems[i][1], start):
+        return None  # not the atom of a zero-block element
+    tag = text[slice(*zero_elems[i])]
+    units = ZERO_UNITS_RE.search(tag)
+    widths = [int(w) for w in ZERO_WIDTH_RE.findall(tag)]
+    if not widths or (units and units.group(1) not in ("", "px")):
+        return None
+    return max(widths)
+
+
+def picture(img, entry, sizes):
+    """Wrap a bare ``<img>`` in a ``<picture>`` built from its manifest entry."""
+    img = SRC_RE.sub(lambda m: f' src="{entry["source"]}"', img, count=1)
+    img = img[:4] + f' srcset="{srcset(entry["webp"])}" sizes="{sizes}"' + img[4:]
+    return (f'<picture><source type="image/avif" srcset="{srcset(entry["avif"])}" sizes="{sizes}">'
+            f"{img}</picture>")
+
+
+def background(tag, entry, logical, names, width):
+    """Point a fixed-size background's image refs at the best-fitting WebP."""
+    fit = next((path for w, path in entry["webp"] if w >= width * DPR), entry["webp"][-1][1])
+    return fingerprint_assets.ASSET_REF_RE.sub(
+        lambda m: fit if names.get(m.group()) == logical else m.group(), tag
+    )
+
+
+def rewrite_backgrounds(text, images, names):
+    zero_elems = [(m.start(), m.end()) for m in ZERO_ELEM_RE.finditer(text)]
+
+    def replace(match):
+        tag = match.group()
+        refs = [names.get(ref) for ref in fingerprint_assets.ASSET_REF_RE.findall(tag)]
+        logical = next((ref for ref in refs if ref in images), None)
+        width = logical and width_hint(text, match.start(), match.end(), zero_elems)
+        if not width:
+            return tag
+        return background(tag, images[logical], logical, names, width)
+
+    return BACKGROUND_RE.sub(replace, text)
+
+
+def rewrite_imgs(text, images, names):
+    zero_elems = [(m.start(), m.end()) for m in ZERO_ELEM_RE.finditer(text)]
+
+    def replace(match):
+        img = match.group()
+        if not img.lower().startswith("<img") or SRCSET_RE.search(img):
+            return img  # someone else's <picture>, or already responsive
+        src = SRC_RE.search(img)
+        logical = names.get(src.group(1)) if src else None
+        if logical not in images:
+            return img
+        width = width_hint(text, match.start(), match.end(), zero_elems)
+        return picture(img, images[logical], f"{width}px" if width else "100vw")
+
+    return IMG_RE.sub(replace, text)
+
+
+def rewrite_page(text, images, names):
+    """Rewrite the images of one page; returns the new text.
+
+    Pictures written by an earlier run are unwrapped first, so they follow
+    the current manifest.
+    """
+    text = OUR_PICTURE_RE.sub(lambda m: SRCSET_ATTRS_RE.sub("", m.group(1)), text)
+    return rewrite_imgs(rewrite_backgrounds(text, images, names), images, names)
+
+
+def remove_stale(site_dir, entries):
+    """Delete variant files the manifest no longer lists; returns how many."""
+    keep = {path for entry in entries.values() for _, path in entry["avif"] + entry["webp"]}
+    removed = 0
+    for rel in fingerprint_assets.find_assets(site_dir):
+        if rel.startswith(VARIANTS_DIR + "/") and rel not in keep:
+            os.remove(os.path.join(site_dir, rel))
+            removed += 1
+    return removed
+
+
+def responsive_images(site_dir, jobs=0, force=False):
+    """Bring variants, manifest and pages up to date; returns a stats dict."""
+    assets = fingerprint_assets.load_manifest(os.path.join(site_dir, fingerprint_assets.MANIFEST_FILE))
+    manifest_path = os.path.join(site_dir, MANIFEST_FILE)
+    previous = load_manifest(manifest_path)
+    pages = fingerprint_assets.find_pages(site_dir, (".html",))
+    names = logical_names(assets, previous)
+
+    entries, pending = plan_images(site_dir, page_images(site_dir, pages, assets, names), assets,
+                                   previous, force)
+    os.makedirs(os.path.join(site_dir, VARIANTS_DIR), exist_ok=True)
+    workers = jobs or os.cpu_count() or 1
+    if workers > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            done = list(pool.map(encode_variants, pending))
+    else:
+        done = [encode_variants(job) for job in pending]
+    for logical, fmt, variants in done:
+        entries[logical][fmt] = variants
+
+    manifest = {"settings": settings(), "images": entries}
+    stats = {"images": len(entries), "encoded": len(pending) // len(QUALITY),
+             "variants": sum(len(e["avif"]) + len(e["webp"]) for e in entries.values()),
+             "removed": remove_stale(site_dir, entries), "pages": 0}
+    fingerprint_assets.write_if_changed(
+        site_dir, MANIFEST_FILE, (json.dumps(manifest, indent=2, sort_keys=True) + "\n").encode("utf-8")
+    )
+
+    names = logical_names(assets, previous, manifest)
+    for name in pages:
+        text = fingerprint_assets.read(site_dir, name).decode("utf-8")
+        new = rewrite_page(text, entries, names)
+        if new != text:
+            stats["pages"] += fingerprint_assets.write_if_changed(site_dir, name, new.encode("utf-8"))
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write responsive image variants and rewrite <img> tags.")
+    parser.add_argument("--site", default=SCRIPT_DIR, help="site directory (default: %(default)s)")
+    parser.add_argument("-j", "--jobs", type=int, default=0,
+                        help="worker processes (default: one per CPU core)")
+    parser.add_argument("--force", action="store_true",
+                        help="encode every image, ignoring the manifest")
+    args = parser.parse_args(argv)
+
+    if Image is None:
+        print("ERROR: Pillow not installed. Run: pip3 install Pillow")
+        return 1
+    site_dir = os.path.abspath(args.site)
+    stats = responsive_images(site_dir, args.jobs, args.force)
+    print(
+        f"Responsive images: {stats['images']} images, {stats['encoded']} encoded, "
+        f"{stats['variants']} variants, {stats['removed']} old variants removed, "
+        f"{stats['pages']} pages rewritten."
+    )
+    changed = fingerprint_assets.write_headers(site_dir)
+    print(f"{fingerprint_assets.HEADERS_FILE}: {'written' if changed else 'unchanged'}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
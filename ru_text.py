@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Russian-aware tokenization for the related-content index.
+
+    python3 ru_text.py "Шторы для панорамных окон"
+
+``terms(text)`` lowercases the text, folds ё into е, splits it into words
+(Cyrillic, Latin and digits; hyphenated words stay whole), drops stop words
+and reduces every Cyrillic word to its stem with the Snowball Russian
+stemmer, so "шторы", "штор" and "шторами" all count as one term. Latin
+words are kept as they are; the site mixes in English search terms such
+as "curtains dubai".
+"""
+
+import functools
+import re
+import sys
+
+WORD_RE = re.compile(r"[0-9a-zа-я]+(?:-[0-9a-zа-я]+)*")
+
+STOP_WORDS = frozenset("""
+    а без более бы был была были было быть в вам вас весь во вот все всего
+    всех вы где да даже для до его ее если есть еще же за здесь и из или им
+    их к как когда кто ли либо между меня мы на над не него нее нет ни них
+    но ну о об однако он она они оно от очень по под при с со так также такой
+    там те тем то того тоже той только том ты у уже хотя чего чей чем что
+    чтобы чье чья эта эти это этого этой этом этот я
+    a an and for in of on or the to with
+""".split())
+
+VOWELS = "аеиоуыэюя"
+
+# Ending classes of the Snowball Russian stemmer
+# (https://snowballstem.org/algorithms/russian/stemmer.html). Endings of a
+# "group 1" must follow а or я, which stays part of the stem.
+PERFECTIVE_GERUND_1 = ("в", "вши", "вшись")
+PERFECTIVE_GERUND_2 = ("ив", "ивши", "ившись", "ыв", "ывши", "ывшись")
+ADJECTIVE = (
+    "ее", "ие", "ые", "ое", "ими", "ыми", "ей", "ий", "ый", "ой", "ем", "им", "ым",
+    "ом", "его", "ого", "ему", "ому", "их", "ых", "ую", "юю", "ая", "яя", "ою", "ею",
+)
+PARTICIPLE_1 = ("ем", "нн", "вш", "ющ", "щ")
+PARTICIPLE_2 = ("ивш", "ывш", "ующ")
+REFLEXIVE = ("ся", "сь")
+VERB_1 = (
+    "ла", "на", "ете", "йте", "ли", "й", "л", "ем", "н", "ло", "но", "ет", "ют",
+    "ны", "ть", "ешь", "нно",
+)
+VERB_2 = (
+    "ила", "ыла", "ена", "ейте", "уйте", "ите", "или", "ыли", "ей", "уй", "ил",
+    "ыл", "им", "ым", "ен", "ило", "ыло", "ено", "ят", "ует", "уют", "ит", "ыт",
+    "ены", "ить", "ыть", "ишь", "ую", "ю",
+)
+NOUN = (
+    "а", "ев", "ов", "ие", "ье", "е", "иями", "ями", "ами", "еи", "ии", "и", "ией",
+    "ей", "ой", "ий", "й", "иям", "ям", "ием", "ем", "ам", "ом", "о", "у", "ах",
+    "иях", "ях", "ы", "ь", "ию", "ью", "ю", "ия", "ья", "я",
+)
+SUPERLATIVE = ("ейше", "ейш")
+DERIVATIONAL = ("ость", "ост")
+
+
+@functools.lru_cache(maxsize=None)
+def _by_length(endings):
+    return tuple(sorted(set(endings), key=len, reverse=True))
+
+
+def strip_ending(word, start, endings, after=None):
+    """Remove the longest of ``endings`` lying in ``word[start:]``.
+
+    With ``after`` the ending must also follow one of those letters.
+    Returns the shortened word, or None if no ending matches.
+    """
+    for ending in _by_length(endings):
+        if word.endswith(ending) and len(word) - len(ending) >= start:
+            head = word[: -len(ending)]
+            if after is None or (head[-1:] and head[-1] in after and len(head) - 1 >= start):
+                return head
+    return None
+
+
+def strip_class(word, start, group1, group2):
+    """Strip the longest ending of a two-group class, group 1 after а/я."""
+    best = None
+    for endings, after in ((group1, "ая"), (group2, None)):
+        head = strip_ending(word, start, endings, after)
+        if head is not None and (best is None or len(head) < len(best)):
+            best = head
+    return best
+
+
+def regions(word):
+    """Start offsets of the RV and R2 regions of ``word``."""
+    rv = next((i + 1 for i, c in enumerate(word) if c in VOWELS), len(word))
+
+    def after_vc(start):
+        for i in range(start + 1, len(word)):
+            if word[i] not in VOWELS and word[i - 1] in VOWELS:
+                return i + 1
+        return len(word)
+
+    r1 = after_vc(0)
+    return rv, after_vc(r1) if r1 < len(word) else len(word)
+
+
+@functools.lru_cache(maxsize=65536)
+def stem(word):
+    """Snowball Russian stem of a lowercase word with ё folded into е."""
+    rv, r2 = regions(word)
+
+    # Step 1: perfective gerund, else reflexive + adjectival / verb / noun.
+    head = strip_class(word, rv, PERFECTIVE_GERUND_1, PERFECTIVE_GERUND_2)
+    if head is None:
+        word = strip_ending(word, rv, REFLEXIVE) or word
+        head = strip_ending(word, rv, ADJECTIVE)
+        if head is not None:
+            word = strip_class(head, rv, PARTICIPLE_1, PARTICIPLE_2) or head
+        else:
+            word = (
+                strip_class(word, rv, VERB_1, VERB_2)
+                or strip_ending(word, rv, NOUN)
+                or word
+            )
+    else:
+        word = head
+
+    # Step 2: a trailing и.
+    word = strip_ending(word, rv, ("и",)) or word
+    # Step 3: derivational ending in R2.
+    word = strip_ending(word, r2, DERIVATIONAL) or word
+    # Step 4: superlative, double н, soft sign.
+    word = strip_ending(word, rv, SUPERLATIVE) or word
+    if word.endswith("нн") and len(word) - 2 >= rv:
+        return word[:-1]
+    return strip_ending(word, rv, ("ь",)) or word
+
+
+def words(text):
+    """Lowercase words of ``text``, ё folded into е."""
+    return WORD_RE.findall(text.lower().replace("ё", "е"))
+
+
+def terms(text):
+    """Index terms of ``text``: stemmed words without stop words."""
+    out = []
+    for word in words(text):
+        if word in STOP_WORDS or len(word) < 2:
+            continue
+        out.append(stem(word) if "а" <= word[0] <= "я" else word)
+    return out
+
+
+if __name__ == "__main__":
+    print(" ".join(terms(" ".join(sys.argv[1:]) or sys.stdin.read())))